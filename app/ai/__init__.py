@@ -1,5 +1,17 @@
 """AI orchestration helpers for natural language parsing."""
 
+from app.dsl.llm_provider import REGISTRY
+
+from .cassette import RecordingProvider, ReplayProvider, register_cassette_providers
 from .providers import LangChainProvider, register_langchain_providers
 
-__all__ = ["LangChainProvider", "register_langchain_providers"]
+register_langchain_providers(REGISTRY)
+register_cassette_providers(REGISTRY)
+
+__all__ = [
+    "LangChainProvider",
+    "RecordingProvider",
+    "ReplayProvider",
+    "register_cassette_providers",
+    "register_langchain_providers",
+]
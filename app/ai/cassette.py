@@ -0,0 +1,156 @@
+"""Record/replay providers for offline, reproducible LLM runs.
+
+A cassette is a JSON-lines file with one provider interaction per line::
+
+    {"key": "<sha256 of prompt>", "response": "...", "latency": 0.42}
+
+Responses are stored verbatim (including malformed ones) so replays exercise
+the same retry path as the original run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.dsl.errors import E_CASSETTE_MISS, E_PROVIDER_MISSING, raise_error
+from app.dsl.llm_provider import BaseLLMProvider
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.dsl.commands import CommandType
+    from app.dsl.llm_provider import ProviderRegistry
+
+
+def prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf8")).hexdigest()
+
+
+def _cassette_path(config: dict[str, Any]) -> Path:
+    path = config.pop("cassette", None) or os.getenv("AI_CASSETTE")
+    if not path:
+        raise_error(E_PROVIDER_MISSING, detail="No cassette path configured (AI_CASSETTE).")
+    return Path(path)
+
+
+def _flag(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
+
+
+class ReplayProvider(BaseLLMProvider):
+    """Serve recorded responses keyed by prompt hash.
+
+    Repeated prompts receive their recordings in the original order; once a
+    key is exhausted its final recording is served again.
+    """
+
+    name = "replay"
+
+    def __init__(self, cassette: str | Path, *, replay_latency: bool = False, **config: Any):
+        super().__init__(cassette=str(cassette), replay_latency=replay_latency, **config)
+        self.cassette = Path(cassette)
+        self.replay_latency = replay_latency
+        self._lock = threading.Lock()
+        self._recordings: dict[str, list[tuple[Any, float]]] = defaultdict(list)
+        self._cursor: dict[str, int] = defaultdict(int)
+        with self.cassette.open("r", encoding="utf8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._recordings[entry["key"]].append(
+                    (entry["response"], float(entry.get("latency", 0.0)))
+                )
+
+    def parse(
+        self,
+        text: str,
+        schema: dict[str, Any],
+        *,
+        context: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | str:
+        del schema, context
+        key = prompt_key(text)
+        with self._lock:
+            recordings = self._recordings.get(key)
+            if not recordings:
+                raise_error(E_CASSETTE_MISS, detail=f"Prompt hash {key[:12]}.")
+            index = min(self._cursor[key], len(recordings) - 1)
+            self._cursor[key] += 1
+        response, latency = recordings[index]
+        if self.replay_latency and latency > 0:
+            time.sleep(latency)
+        return response
+
+    def rewind(self) -> None:
+        """Restart every key from its first recording."""
+
+        with self._lock:
+            self._cursor.clear()
+
+    @classmethod
+    def from_settings(cls, config: dict[str, Any]) -> ReplayProvider:
+        cfg = dict(config)
+        cassette = _cassette_path(cfg)
+        replay_latency = _flag(cfg.pop("replay_latency", os.getenv("AI_REPLAY_LATENCY", "")))
+        return cls(cassette, replay_latency=replay_latency, **cfg)
+
+
+class RecordingProvider(BaseLLMProvider):
+    """Wrap any provider and append its traffic to a cassette file."""
+
+    name = "record"
+
+    def __init__(self, inner: BaseLLMProvider, cassette: str | Path, **config: Any) -> None:
+        super().__init__(cassette=str(cassette), **config)
+        self.inner = inner
+        self.cassette = Path(cassette)
+        self.cassette.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def parse(
+        self,
+        text: str,
+        schema: dict[str, Any],
+        *,
+        context: dict[str, Any] | None = None,
+    ) -> dict[str, Any] | str:
+        started = time.perf_counter()
+        response = self.inner.parse(text, schema, context=context)
+        latency = time.perf_counter() - started
+        entry = json.dumps({"key": prompt_key(text), "response": response, "latency": latency})
+        with self._lock, self.cassette.open("a", encoding="utf8") as fh:
+            fh.write(entry + "\n")
+        return response
+
+    def record_result(self, utterance: str, commands: list[CommandType]) -> None:
+        self.inner.record_result(utterance, commands)
+
+    @classmethod
+    def from_settings(cls, registry: ProviderRegistry, config: dict[str, Any]) -> RecordingProvider:
+        cfg = dict(config)
+        cassette = _cassette_path(cfg)
+        target = cfg.pop("record_provider", None) or os.getenv("AI_RECORD_PROVIDER") or "mock"
+        return cls(registry.get(target, cfg), cassette)
+
+
+def register_cassette_providers(registry: ProviderRegistry) -> None:
+    """Register the ``replay`` and ``record`` providers with the shared registry."""
+
+    registry.register("replay", ReplayProvider.from_settings)
+    registry.register("record", lambda cfg: RecordingProvider.from_settings(registry, cfg))
+
+
+__all__ = [
+    "RecordingProvider",
+    "ReplayProvider",
+    "prompt_key",
+    "register_cassette_providers",
+]
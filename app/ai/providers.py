@@ -10,17 +10,31 @@ from typing import TYPE_CHECKING, Any
 from pydantic import SecretStr
 
 from app.dsl.errors import E_PROVIDER_MISSING, raise_error
-from app.dsl.llm_provider import BaseLLMProvider
+from app.dsl.llm_provider import BaseLLMProvider, PromptUsage
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
+    from app.dsl.commands import CommandType
     from app.dsl.llm_provider import ProviderRegistry
 
+DEFAULT_HISTORY_TOKENS = 1024
+
 
 @dataclass(slots=True)
 class _HistoryEntry:
+    """Compacted dialogue turn: the raw utterance and its validated commands."""
+
     user: str
     response: str
 
+    def render(self) -> str:
+        return f"User: {self.user}\nCommands: {self.response}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used for history budgeting."""
+
+    return (len(text) + 3) // 4
+
 
 def _resolve_api_key(provider_name: str, explicit: str | SecretStr | None) -> str:
     """Resolve an API key for the given provider."""
@@ -40,7 +54,9 @@ def _resolve_api_key(provider_name: str, explicit: str | SecretStr | None) -> st
     raise_error(E_PROVIDER_MISSING, detail=f"Missing API key for provider '{provider_name}'.")
 
 
-def _load_openai(model: str | None, api_key: SecretStr, temperature: float) -> Any:
+def _load_openai(
+    model: str | None, api_key: SecretStr, temperature: float, base_url: str | None = None
+) -> Any:
     try:
         from langchain_openai import ChatOpenAI
     except ImportError as exc:  # pragma: no cover - handled in unit tests
@@ -50,7 +66,9 @@ def _load_openai(model: str | None, api_key: SecretStr, temperature: float) -> A
             cause=exc,
         )
 
-    return ChatOpenAI(model=model or "gpt-4o-mini", api_key=api_key, temperature=temperature)
+    return ChatOpenAI(
+        model=model or "gpt-4o-mini", api_key=api_key, temperature=temperature, base_url=base_url
+    )
 
 
 def _load_groq(
@@ -78,12 +96,17 @@ def _build_llm(
     model: str | None,
     api_key: str | SecretStr | None,
     temperature: float,
+    base_url: str | None = None,
 ) -> Any:
-    """Instantiate a LangChain chat model based on configuration."""
+    """Instantiate a LangChain chat model based on configuration.
+
+    ``base_url`` points the OpenAI client at a compatible endpoint such as the
+    local stub in :mod:`app.ai.stub_server`.
+    """
 
     key = SecretStr(_resolve_api_key(provider, api_key))
     if provider == "openai":
-        return _load_openai(model, key, temperature)
+        return _load_openai(model, key, temperature, base_url)
     if provider in {"groq", "llama3"}:
         return _load_groq(model, key, temperature, provider)
     raise_error(E_PROVIDER_MISSING, detail=f"Unsupported provider '{provider}'.")
@@ -100,9 +123,15 @@ class LangChainProvider(BaseLLMProvider):
         *,
         provider_name: str,
         history_limit: int = 6,
+        history_tokens: int = DEFAULT_HISTORY_TOKENS,
         **config: Any,
     ) -> None:
-        super().__init__(provider_name=provider_name, history_limit=history_limit, **config)
+        super().__init__(
+            provider_name=provider_name,
+            history_limit=history_limit,
+            history_tokens=history_tokens,
+            **config,
+        )
         try:
             from langchain_core.output_parsers import StrOutputParser
             from langchain_core.prompts import ChatPromptTemplate
@@ -115,6 +144,7 @@ class LangChainProvider(BaseLLMProvider):
 
         self.llm = llm
         self.history_limit = history_limit
+        self.history_tokens = max(0, history_tokens)
         self.history: list[_HistoryEntry] = []
         self.prompt = ChatPromptTemplate.from_messages(
             [
@@ -130,14 +160,27 @@ class LangChainProvider(BaseLLMProvider):
         )
         self._parser = StrOutputParser()
 
+    def _history_blob(self) -> tuple[str, int]:
+        """Newest-first selection of compacted turns that fits ``history_tokens``."""
+
+        budget = self.history_tokens
+        selected: list[str] = []
+        for entry in reversed(self.history):
+            rendered = entry.render()
+            cost = estimate_tokens(rendered) + 1
+            if cost > budget:
+                break
+            budget -= cost
+            selected.append(rendered)
+        selected.reverse()
+        return "\n".join(selected), len(selected)
+
     def _format_prompt(self, prompt: str) -> dict[str, str]:
-        if not self.history:
-            return {"prompt": prompt}
-        history_blob = "\n".join(
-            f"User: {entry.user}\nAssistant: {entry.response}"
-            for entry in self.history[-self.history_limit :]
+        history_blob, turns = self._history_blob() if self.history else ("", 0)
+        stitched = f"Previous dialogue:\n{history_blob}\n---\n{prompt}" if turns else prompt
+        self.last_usage = PromptUsage(
+            chars=len(stitched), tokens=estimate_tokens(stitched), history_turns=turns
         )
-        stitched = f"Previous dialogue:\n{history_blob}\n---\n{prompt}"
         return {"prompt": stitched}
 
     def parse(
@@ -148,15 +191,22 @@ class LangChainProvider(BaseLLMProvider):
         context: dict[str, Any] | None = None,
     ) -> str:
         del schema  # schema already embedded in prompt text
-        del context
-        rendered = self.prompt | self.llm | self._parser
+        timeout = (context or {}).get("timeout")
+        llm = self.llm.bind(timeout=timeout) if timeout else self.llm
+        rendered = self.prompt | llm | self._parser
         message = self._format_prompt(text)
         response = rendered.invoke(message)
-        response_text = response if isinstance(response, str) else json.dumps(response)
-        self.history.append(_HistoryEntry(user=text, response=response_text))
+        return response if isinstance(response, str) else json.dumps(response)
+
+    def record_result(self, utterance: str, commands: list[CommandType]) -> None:
+        # Only the utterance and the validated commands are kept, never the schema prompt.
+        payload = json.dumps(
+            [command.model_dump(mode="json", exclude_none=True) for command in commands],
+            separators=(",", ":"),
+        )
+        self.history.append(_HistoryEntry(user=utterance, response=payload))
         if len(self.history) > self.history_limit:
             self.history = self.history[-self.history_limit :]
-        return response_text
 
     @classmethod
     def from_settings(cls, provider: str, config: dict[str, Any]) -> LangChainProvider:
@@ -164,8 +214,22 @@ class LangChainProvider(BaseLLMProvider):
         model = cfg.pop("model", None) or cfg.pop("model_name", None)
         temperature = float(cfg.pop("temperature", 0.0) or 0.0)
         history_limit = int(cfg.pop("history_limit", 6) or 6)
-        llm = _build_llm(provider, model=model, api_key=cfg.get("api_key"), temperature=temperature)
-        return cls(llm, provider_name=provider, history_limit=history_limit, **cfg)
+        history_tokens = int(cfg.pop("history_tokens", DEFAULT_HISTORY_TOKENS))
+        base_url = cfg.pop("base_url", None) or os.getenv("AI_BASE_URL") or None
+        llm = _build_llm(
+            provider,
+            model=model,
+            api_key=cfg.get("api_key"),
+            temperature=temperature,
+            base_url=base_url,
+        )
+        return cls(
+            llm,
+            provider_name=provider,
+            history_limit=history_limit,
+            history_tokens=history_tokens,
+            **cfg,
+        )
 
 
 def register_langchain_providers(registry: ProviderRegistry) -> None:
@@ -0,0 +1,237 @@
+"""Local stand-in for an OpenAI-compatible chat-completions endpoint.
+
+The server speaks just enough of ``POST /v1/chat/completions`` for
+``langchain_openai.ChatOpenAI`` to work against it, which makes it possible to
+load-test the LangChain provider path offline::
+
+    python -m app.ai.stub_server --port 8808 --latency lognormal:-3,0.5 --error-rate 0.02
+    AI_PROVIDER=openai AI_BASE_URL=http://127.0.0.1:8808/v1 AI_API_KEY=stub python -m app.main ...
+
+Responses are either derived from the utterance with the deterministic rule
+parser (``rules``) or cycled from a file of canned JSON bodies (``canned``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Literal
+
+from app.dsl.commands import CommandList
+from app.dsl.errors import ParseError
+from app.dsl.parse_rule import parse_rule
+
+_UTTERANCE_RE = re.compile(r"^User utterance: (?P<utterance>.*)$", re.MULTILINE)
+
+LatencySampler = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> LatencySampler:
+    """Build a latency sampler (seconds) from ``kind:args``.
+
+    Supported kinds: ``fixed:S``, ``uniform:LO,HI``, ``normal:MEAN,STD`` and
+    ``lognormal:MU,SIGMA`` (parameters of the underlying normal distribution).
+    """
+
+    kind, _, raw = spec.partition(":")
+    args = [float(part) for part in raw.split(",") if part.strip()] if raw else []
+    kind = kind.strip().lower()
+    if kind == "fixed" and len(args) == 1:
+        return lambda rng: args[0]
+    if kind == "uniform" and len(args) == 2:
+        return lambda rng: rng.uniform(args[0], args[1])
+    if kind == "normal" and len(args) == 2:
+        return lambda rng: max(0.0, rng.gauss(args[0], args[1]))
+    if kind == "lognormal" and len(args) == 2:
+        return lambda rng: rng.lognormvariate(args[0], args[1])
+    raise ValueError(f"Unsupported latency spec '{spec}'")
+
+
+@dataclass(slots=True)
+class StubConfig:
+    latency: str = "fixed:0"
+    error_rate: float = 0.0
+    error_status: int = 500
+    mode: Literal["rules", "canned"] = "rules"
+    canned: list[str] = field(default_factory=list)
+    seed: int | None = None
+
+
+class _StubState:
+    def __init__(self, config: StubConfig) -> None:
+        self.config = config
+        self.sample_latency = parse_latency(config.latency)
+        self._rng = random.Random(config.seed)
+        self._lock = threading.Lock()
+        self._canned: Iterator[str] | None = (
+            itertools.cycle(config.canned) if config.canned else None
+        )
+        self.requests = 0
+        self.failures = 0
+
+    def draw(self) -> tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            latency = self.sample_latency(self._rng)
+            fail = self._rng.random() < self.config.error_rate
+            if fail:
+                self.failures += 1
+            return latency, fail
+
+    def respond(self, prompt: str) -> str:
+        if self.config.mode == "canned" and self._canned is not None:
+            with self._lock:
+                return next(self._canned)
+        match = _UTTERANCE_RE.search(prompt)
+        utterance = match.group("utterance") if match else prompt
+        try:
+            commands = parse_rule(utterance)
+        except ParseError:
+            commands = []
+        return CommandList(commands=commands).model_dump_json(exclude_none=True)
+
+
+def _completion(model: str, content: str, prompt: str) -> dict[str, Any]:
+    prompt_tokens = (len(prompt) + 3) // 4
+    completion_tokens = (len(content) + 3) // 4
+    return {
+        "id": f"chatcmpl-stub-{time.time_ns()}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _make_handler(state: _StubState) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass  # keep load tests quiet
+
+        def _send_json(self, status: int, body: dict[str, Any]) -> None:
+            payload = json.dumps(body).encode("utf8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            if self.path.rstrip("/").endswith("/models"):
+                self._send_json(
+                    200, {"object": "list", "data": [{"id": "stub", "object": "model"}]}
+                )
+            else:
+                self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request"}})
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request"}})
+                return
+
+            latency, fail = state.draw()
+            if latency > 0:
+                time.sleep(latency)
+            if fail:
+                self._send_json(
+                    state.config.error_status,
+                    {"error": {"message": "Injected failure", "type": "server_error"}},
+                )
+                return
+
+            messages = body.get("messages") or []
+            user_messages = [m.get("content", "") for m in messages if m.get("role") == "user"]
+            prompt = user_messages[-1] if user_messages else ""
+            content = state.respond(prompt if isinstance(prompt, str) else json.dumps(prompt))
+            self._send_json(200, _completion(body.get("model", "stub"), content, str(prompt)))
+
+    return Handler
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], config: StubConfig) -> None:
+        self.state = _StubState(config)
+        super().__init__(address, _make_handler(self.state))
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host!s}:{port}/v1"
+
+
+def start_server(
+    config: StubConfig | None = None, *, host: str = "127.0.0.1", port: int = 0
+) -> StubServer:
+    """Start a stub server on a background thread; call ``shutdown()`` when done."""
+
+    server = StubServer((host, port), config or StubConfig())
+    threading.Thread(target=server.serve_forever, name="stub-openai", daemon=True).start()
+    return server
+
+
+def _load_canned(path: Path) -> list[str]:
+    lines = [line.strip() for line in path.read_text(encoding="utf8").splitlines()]
+    return [line for line in lines if line]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--latency", default="fixed:0", help="e.g. fixed:0.2, lognormal:-3,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--canned", type=Path, help="File with one JSON response per line")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        mode="canned" if args.canned else "rules",
+        canned=_load_canned(args.canned) if args.canned else [],
+        seed=args.seed,
+    )
+    server = StubServer((args.host, args.port), config)
+    print(f"Stub OpenAI endpoint listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover - interactive shutdown
+        pass
+    finally:
+        server.server_close()
+
+
+__all__ = ["StubConfig", "StubServer", "parse_latency", "start_server"]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,18 @@
 """CAD authoring utilities."""
 
+from .columnar import ColumnarBundle
 from .models import Circle, Line, Point, Rect
+from .r12 import R12Writer
+from .streaming import StreamingDxfWriter
 from .writer import DxfWriter
 
-__all__ = ["Circle", "Line", "Point", "Rect", "DxfWriter"]
+__all__ = [
+    "Circle",
+    "ColumnarBundle",
+    "Line",
+    "Point",
+    "Rect",
+    "DxfWriter",
+    "R12Writer",
+    "StreamingDxfWriter",
+]
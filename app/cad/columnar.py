@@ -0,0 +1,732 @@
+"""Columnar, array-backed staging area for drawing geometry.
+
+:class:`ColumnarBundle` stores every entity type as a contiguous ``float64``
+table (one row per entity) plus an ``int32`` column of interned layer ids.
+Polylines use an offsets array into a shared vertex table. Rows cost a few
+dozen bytes instead of several pydantic objects with nested ``Decimal`` points,
+and the tables can be viewed as NumPy arrays for vectorised passes.
+
+The pydantic models from :mod:`app.cad.models` remain the public entity types:
+``bundle.circles`` and friends are read-only sequences that build models on
+access, so code written against :class:`DrawingBundle` keeps working.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import compress
+from typing import Any, TypeVar, overload
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+from pydantic import BaseModel
+
+from .models import (
+    DEFAULT_LAYER,
+    Arc,
+    Circle,
+    DrawingBundle,
+    Ellipse,
+    Line,
+    Point,
+    Polyline,
+    Rect,
+    Text,
+)
+
+_M = TypeVar("_M", bound=BaseModel)
+
+FloatArray = NDArray[np.float64]
+IntArray = NDArray[np.integer[Any]]
+# One layer name for every entity, or one name per entity.
+LayerArg = str | Sequence[str]
+# Values converted to Python numbers at a time when iterating a column.
+_ITER_CHUNK = 1 << 16
+
+
+def require_positive_array(values: FloatArray, field: str) -> FloatArray:
+    """Vectorised :func:`app.cad.models.require_positive`."""
+
+    bad = values <= 0
+    if bad.any():
+        raise ValueError(f"{field} must be greater than 0, got {values[bad][0]}")
+    return values
+
+
+def as_points(values: ArrayLike) -> FloatArray:
+    """``(n, 2)`` float64 array from point-like input (sequence of pairs or array)."""
+
+    return np.asarray(values, dtype=np.float64).reshape(-1, 2)
+
+
+def as_column(values: ArrayLike, count: int) -> FloatArray:
+    """``(count,)`` float64 column; a scalar is repeated ``count`` times."""
+
+    column = np.asarray(values, dtype=np.float64)
+    if column.ndim == 0:
+        return np.full(count, float(column))
+    column = column.reshape(-1)
+    if column.shape[0] != count:
+        raise ValueError(f"Expected {count} values, got {column.shape[0]}.")
+    return column
+
+
+class LayerTable:
+    """Interned layer names; entities store the integer id."""
+
+    def __init__(self, names: Iterable[str] = (DEFAULT_LAYER,)) -> None:
+        self.names: list[str] = []
+        self._ids: dict[str, int] = {}
+        for name in names:
+            self.intern(name)
+
+    def intern(self, name: str) -> int:
+        layer_id = self._ids.get(name)
+        if layer_id is None:
+            layer_id = self._ids[name] = len(self.names)
+            self.names.append(name)
+        return layer_id
+
+    def name(self, layer_id: int) -> str:
+        return self.names[layer_id]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+
+class Column:
+    """Growable typed column with zero-copy NumPy views.
+
+    Scalar appends go to a small ``array`` tail that is moved into a NumPy
+    buffer, grown by doubling, whenever a view is taken. Views are slices of
+    that buffer and never pin it: growing allocates a new buffer, so earlier
+    views keep their snapshot and appends never fail while a view is alive.
+    """
+
+    __slots__ = ("typecode", "dtype", "_buffer", "_size", "_tail", "append", "extend")
+
+    def __init__(self, typecode: str, values: Iterable[Any] = ()) -> None:
+        self.typecode = typecode
+        self.dtype = np.dtype(typecode)
+        self._buffer: NDArray[Any] = np.empty(0, dtype=self.dtype)
+        self._size = 0
+        self._tail = array(typecode, values)
+        # Scalar appends are the hot path; bind them straight to the tail.
+        self.append: Callable[[Any], None] = self._tail.append
+        self.extend: Callable[[Iterable[Any]], None] = self._tail.extend
+
+    def __len__(self) -> int:
+        return self._size + len(self._tail)
+
+    @property
+    def itemsize(self) -> int:
+        return self.dtype.itemsize
+
+    def extend_array(self, values: ArrayLike) -> None:
+        """Append ``values`` (flattened) in one copy."""
+
+        self._flush()
+        self._write(np.asarray(values, dtype=self.dtype).reshape(-1))
+
+    def view(self) -> NDArray[Any]:
+        """Zero-copy 1-D view of the current values; later appends do not change it."""
+
+        self._flush()
+        return self._buffer[: self._size]
+
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if index < self._size:
+            return self._buffer[index].item()
+        return self._tail[index - self._size]
+
+    def slice(self, start: int, stop: int) -> list[Any]:
+        """Values ``start:stop`` as native Python numbers."""
+
+        return self.view()[start:stop].tolist()
+
+    def __iter__(self) -> Iterator[Any]:
+        view = self.view()
+        for start in range(0, len(view), _ITER_CHUNK):
+            yield from view[start : start + _ITER_CHUNK].tolist()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle only the used values, not the spare capacity.
+        return (_column_from_array, (self.typecode, self.view()))
+
+    def _write(self, values: NDArray[Any]) -> None:
+        size = self._size
+        needed = size + len(values)
+        if needed > len(self._buffer):
+            grown = np.empty(max(needed, 2 * len(self._buffer), 16), dtype=self.dtype)
+            grown[:size] = self._buffer[:size]
+            self._buffer = grown
+        self._buffer[size:needed] = values
+        self._size = needed
+
+    def _flush(self) -> None:
+        if self._tail:
+            self._write(np.frombuffer(self._tail, dtype=self.dtype))
+            del self._tail[:]
+
+
+def _column_from_array(typecode: str, values: NDArray[Any]) -> Column:
+    column = Column(typecode)
+    column.extend_array(values)
+    return column
+
+
+class RowTable:
+    """Fixed-width float64 rows with a parallel layer id column."""
+
+    __slots__ = ("width", "data", "layer_ids")
+
+    def __init__(self, width: int) -> None:
+        self.width = width
+        self.data = Column("d")
+        self.layer_ids = Column("i")
+
+    def __len__(self) -> int:
+        return len(self.layer_ids)
+
+    def append(self, values: Sequence[float], layer_id: int) -> None:
+        self.data.extend(values)
+        self.layer_ids.append(layer_id)
+
+    def extend(self, rows: FloatArray, layer_ids: IntArray | int) -> None:
+        """Append ``rows`` (shape ``(n, width)``) in one copy."""
+
+        rows = np.asarray(rows, dtype=np.float64).reshape(-1, self.width)
+        self.data.extend_array(rows)
+        self.layer_ids.extend_array(np.broadcast_to(layer_ids, (rows.shape[0],)))
+
+    @property
+    def rows(self) -> FloatArray:
+        """Zero-copy ``(n, width)`` view; later appends do not change it."""
+
+        return self.data.view().reshape(-1, self.width)
+
+    @property
+    def layers(self) -> NDArray[np.int32]:
+        return self.layer_ids.view()
+
+    def iter_rows(self) -> Iterator[tuple[list[float], int]]:
+        """Yield ``(values, layer_id)`` using native floats."""
+
+        return zip(self.rows.tolist(), self.layer_ids, strict=True)
+
+    def row(self, index: int) -> tuple[float, ...]:
+        start = index * self.width
+        return tuple(self.data.slice(start, start + self.width))
+
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data) + self.layer_ids.itemsize * len(self.layer_ids)
+
+
+class PolylineTable:
+    """Ragged polylines: ``offsets[i]:offsets[i + 1]`` indexes the vertex table."""
+
+    __slots__ = ("offsets", "vertices", "closed", "layer_ids")
+
+    def __init__(self) -> None:
+        self.offsets = Column("q", [0])
+        self.vertices = Column("d")
+        self.closed = Column("b")
+        self.layer_ids = Column("i")
+
+    def __len__(self) -> int:
+        return len(self.layer_ids)
+
+    def append(self, points: Iterable[tuple[float, float]], closed: bool, layer_id: int) -> None:
+        for x, y in points:
+            self.vertices.append(x)
+            self.vertices.append(y)
+        self.offsets.append(len(self.vertices) // 2)
+        self.closed.append(closed)
+        self.layer_ids.append(layer_id)
+
+    def extend(
+        self,
+        offsets: IntArray,
+        vertices: FloatArray,
+        closed: NDArray[np.bool_] | bool,
+        layer_ids: IntArray | int,
+    ) -> None:
+        """Append polylines given CSR style ``offsets`` (length ``n + 1``) and ``vertices``."""
+
+        offsets = np.asarray(offsets, dtype=np.int64)
+        count = offsets.shape[0] - 1
+        if count <= 0:
+            return
+        base = len(self.vertices) // 2 - int(offsets[0])
+        self.vertices.extend_array(vertices)
+        self.offsets.extend_array(offsets[1:] + base)
+        self.closed.extend_array(np.broadcast_to(closed, (count,)))
+        self.layer_ids.extend_array(np.broadcast_to(layer_ids, (count,)))
+
+    @property
+    def offsets_array(self) -> IntArray:
+        return self.offsets.view()
+
+    @property
+    def vertex_array(self) -> FloatArray:
+        return self.vertices.view().reshape(-1, 2)
+
+    @property
+    def closed_array(self) -> NDArray[np.bool_]:
+        return self.closed.view().astype(bool)
+
+    @property
+    def layers(self) -> NDArray[np.int32]:
+        return self.layer_ids.view()
+
+    def points(self, index: int) -> list[tuple[float, float]]:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        flat = self.vertices.slice(2 * start, 2 * end)
+        return list(zip(flat[0::2], flat[1::2], strict=True))
+
+    def nbytes(self) -> int:
+        return sum(col.itemsize * len(col) for col in (self.offsets, self.vertices, self.closed))
+
+
+class TextTable(RowTable):
+    """Text rows ``(x, y, height)`` plus the label strings."""
+
+    __slots__ = ("strings",)
+
+    def __init__(self) -> None:
+        super().__init__(3)
+        self.strings: list[str] = []
+
+    def append_text(self, text: str, values: Sequence[float], layer_id: int) -> None:
+        self.strings.append(text)
+        self.append(values, layer_id)
+
+
+class ModelView(Sequence[_M]):
+    """Read-only sequence that materialises pydantic models from table rows."""
+
+    def __init__(self, size: Callable[[], int], build: Callable[[int], _M]) -> None:
+        self._size = size
+        self._build = build
+
+    def __len__(self) -> int:
+        return self._size()
+
+    @overload
+    def __getitem__(self, index: int) -> _M: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[_M]: ...
+
+    def __getitem__(self, index: int | slice) -> _M | list[_M]:
+        size = self._size()
+        if isinstance(index, slice):
+            return [self._build(i) for i in range(*index.indices(size))]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(index)
+        return self._build(index)
+
+    def __iter__(self) -> Iterator[_M]:
+        build = self._build
+        for index in range(self._size()):
+            yield build(index)
+
+
+def _dec(value: float) -> Decimal:
+    return Decimal(repr(value))
+
+
+def _point(x: float, y: float) -> Point:
+    return Point.trusted(_dec(x), _dec(y))
+
+
+@dataclass(slots=True)
+class GeometryColumns:
+    circles: RowTable = field(default_factory=lambda: RowTable(3))  # cx, cy, r
+    lines: RowTable = field(default_factory=lambda: RowTable(4))  # x1, y1, x2, y2
+    rects: RowTable = field(default_factory=lambda: RowTable(4))  # ox, oy, w, h
+    arcs: RowTable = field(default_factory=lambda: RowTable(5))  # cx, cy, r, a1, a2
+    ellipses: RowTable = field(default_factory=lambda: RowTable(5))  # cx, cy, rx, ry, rot
+    texts: TextTable = field(default_factory=TextTable)  # x, y, height
+    polylines: PolylineTable = field(default_factory=PolylineTable)
+
+
+class ColumnarBundle:
+    """Array-backed drop-in for :class:`DrawingBundle` (values in millimetres)."""
+
+    KINDS = ("circles", "lines", "rects", "polylines", "arcs", "ellipses", "texts")
+
+    def __init__(self) -> None:
+        self.layers = LayerTable()
+        self.columns = GeometryColumns()
+
+    # -- appends -----------------------------------------------------------------
+    def add_circle(self, cx: float, cy: float, r: float, layer: str = DEFAULT_LAYER) -> None:
+        self.columns.circles.append((cx, cy, r), self.layers.intern(layer))
+
+    def add_line(
+        self, x1: float, y1: float, x2: float, y2: float, layer: str = DEFAULT_LAYER
+    ) -> None:
+        self.columns.lines.append((x1, y1, x2, y2), self.layers.intern(layer))
+
+    def add_rect(
+        self, ox: float, oy: float, width: float, height: float, layer: str = DEFAULT_LAYER
+    ) -> None:
+        self.columns.rects.append((ox, oy, width, height), self.layers.intern(layer))
+
+    def add_arc(
+        self,
+        cx: float,
+        cy: float,
+        r: float,
+        start_angle: float,
+        end_angle: float,
+        layer: str = DEFAULT_LAYER,
+    ) -> None:
+        self.columns.arcs.append((cx, cy, r, start_angle, end_angle), self.layers.intern(layer))
+
+    def add_ellipse(
+        self,
+        cx: float,
+        cy: float,
+        rx: float,
+        ry: float,
+        rotation: float = 0.0,
+        layer: str = DEFAULT_LAYER,
+    ) -> None:
+        self.columns.ellipses.append((cx, cy, rx, ry, rotation), self.layers.intern(layer))
+
+    def add_text(
+        self, text: str, x: float, y: float, height: float, layer: str = DEFAULT_LAYER
+    ) -> None:
+        self.columns.texts.append_text(text, (x, y, height), self.layers.intern(layer))
+
+    def add_polyline(
+        self,
+        points: Iterable[tuple[float, float]],
+        closed: bool = False,
+        layer: str = DEFAULT_LAYER,
+    ) -> None:
+        self.columns.polylines.append(points, closed, self.layers.intern(layer))
+
+    # -- bulk appends (array-likes; scalars broadcast) -----------------------------
+    def layer_ids(self, layer: LayerArg, count: int) -> int | NDArray[np.int32]:
+        """Intern one layer name, or ``count`` names, returning their ids."""
+
+        if isinstance(layer, str):
+            return self.layers.intern(layer)
+        if len(layer) != count:
+            raise ValueError(f"Expected one layer name or {count}, got {len(layer)}.")
+        intern = self.layers.intern
+        return np.fromiter((intern(name) for name in layer), dtype=np.int32, count=count)
+
+    def add_lines(
+        self, starts: ArrayLike, ends: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> None:
+        first, second = as_points(starts), as_points(ends)
+        rows = np.hstack([first, second])
+        self.columns.lines.extend(rows, self.layer_ids(layer, len(rows)))
+
+    def add_circles(
+        self, centers: ArrayLike, radii: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> None:
+        xy = as_points(centers)
+        rows = np.column_stack([xy, as_column(radii, len(xy))])
+        self.columns.circles.extend(rows, self.layer_ids(layer, len(rows)))
+
+    def add_rects(
+        self, origins: ArrayLike, sizes: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> None:
+        rows = np.hstack([as_points(origins), as_points(sizes)])
+        self.columns.rects.extend(rows, self.layer_ids(layer, len(rows)))
+
+    def add_arcs(
+        self,
+        centers: ArrayLike,
+        radii: ArrayLike,
+        start_angles: ArrayLike,
+        end_angles: ArrayLike,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> None:
+        xy = as_points(centers)
+        n = len(xy)
+        rows = np.column_stack(
+            [xy, as_column(radii, n), as_column(start_angles, n), as_column(end_angles, n)]
+        )
+        self.columns.arcs.extend(rows, self.layer_ids(layer, n))
+
+    def add_ellipses(
+        self,
+        centers: ArrayLike,
+        rx: ArrayLike,
+        ry: ArrayLike,
+        rotations: ArrayLike = 0.0,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> None:
+        xy = as_points(centers)
+        n = len(xy)
+        rows = np.column_stack([xy, as_column(rx, n), as_column(ry, n), as_column(rotations, n)])
+        self.columns.ellipses.extend(rows, self.layer_ids(layer, n))
+
+    def add_texts(
+        self,
+        strings: Sequence[str],
+        positions: ArrayLike,
+        heights: ArrayLike,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> None:
+        xy = as_points(positions)
+        n = len(xy)
+        if len(strings) != n:
+            raise ValueError(f"Expected {n} strings, got {len(strings)}.")
+        texts = self.columns.texts
+        texts.strings.extend(strings)
+        texts.extend(np.column_stack([xy, as_column(heights, n)]), self.layer_ids(layer, n))
+
+    def add_polylines(
+        self,
+        offsets: ArrayLike,
+        vertices: ArrayLike,
+        closed: ArrayLike = False,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> None:
+        """Append polylines given CSR ``offsets`` (length ``n + 1``) into ``vertices``."""
+
+        index = np.asarray(offsets, dtype=np.int64)
+        count = max(0, index.shape[0] - 1)
+        flags = np.asarray(closed, dtype=bool)
+        self.columns.polylines.extend(
+            index, as_points(vertices), flags, self.layer_ids(layer, count)
+        )
+
+    def add_model(self, entity: BaseModel) -> None:
+        """Append a single pydantic entity."""
+
+        if isinstance(entity, Circle):
+            self.add_circle(*entity.center.as_tuple(), float(entity.radius), entity.layer)
+        elif isinstance(entity, Line):
+            self.add_line(*entity.start.as_tuple(), *entity.end.as_tuple(), entity.layer)
+        elif isinstance(entity, Rect):
+            ox, oy = entity.origin.as_tuple()
+            self.add_rect(ox, oy, float(entity.width), float(entity.height), entity.layer)
+        elif isinstance(entity, Polyline):
+            points, closed, layer = entity.as_dxf()
+            self.add_polyline(points, closed, layer)
+        elif isinstance(entity, Arc):
+            (cx, cy), r, start, end, layer = entity.as_dxf()
+            self.add_arc(cx, cy, r, start, end, layer)
+        elif isinstance(entity, Ellipse):
+            (cx, cy), rx, ry, rotation, layer = entity.as_dxf()
+            self.add_ellipse(cx, cy, rx, ry, rotation, layer)
+        elif isinstance(entity, Text):
+            content, (x, y), height, layer = entity.as_dxf()
+            self.add_text(content, x, y, height, layer)
+        else:  # pragma: no cover - defensive
+            raise TypeError(f"Unsupported entity type {type(entity).__name__}")
+
+    def extend(self, other: DrawingBundle | ColumnarBundle) -> None:
+        if isinstance(other, DrawingBundle):
+            for entity in other.iter_all():
+                self.add_model(entity)
+            return
+        remap = np.array([self.layers.intern(name) for name in other.layers], dtype=np.int32)
+        for kind in ("circles", "lines", "rects", "arcs", "ellipses"):
+            source: RowTable = getattr(other.columns, kind)
+            if len(source):
+                getattr(self.columns, kind).extend(source.rows, remap[source.layers])
+        texts = other.columns.texts
+        if len(texts):
+            self.columns.texts.strings.extend(texts.strings)
+            self.columns.texts.extend(texts.rows, remap[texts.layers])
+        polys = other.columns.polylines
+        if len(polys):
+            self.columns.polylines.extend(
+                polys.offsets_array,
+                polys.vertex_array,
+                polys.closed_array,
+                remap[polys.layers],
+            )
+
+    def slice_kind(self, kind: str, start: int, stop: int) -> ColumnarBundle:
+        """New bundle holding rows ``start:stop`` of one table, with the same layer ids."""
+
+        part = ColumnarBundle()
+        part.layers = LayerTable(self.layers)
+        if kind == "polylines":
+            polys = self.columns.polylines
+            offsets = polys.offsets_array[start : stop + 1]
+            part.columns.polylines.extend(
+                offsets,
+                polys.vertex_array[offsets[0] : offsets[-1]],
+                polys.closed_array[start:stop],
+                polys.layers[start:stop],
+            )
+            return part
+        source: RowTable = getattr(self.columns, kind)
+        getattr(part.columns, kind).extend(source.rows[start:stop], source.layers[start:stop])
+        if kind == "texts":
+            part.columns.texts.strings = self.columns.texts.strings[start:stop]
+        return part
+
+    def subset(self, keep: Mapping[str, NDArray[np.bool_]]) -> ColumnarBundle:
+        """New bundle holding the rows selected by a boolean mask per table.
+
+        Tables missing from ``keep`` are copied whole; layer ids are unchanged.
+        """
+
+        part = ColumnarBundle()
+        part.layers = LayerTable(self.layers)
+        for kind in self.KINDS:
+            mask = keep.get(kind)
+            if kind == "polylines":
+                polys = self.columns.polylines
+                offsets, vertices = polys.offsets_array, polys.vertex_array
+                counts = np.diff(offsets)
+                if mask is not None:
+                    vertices = vertices[np.repeat(mask, counts)]
+                    counts = counts[mask]
+                part.columns.polylines.extend(
+                    np.concatenate([[0], np.cumsum(counts)]),
+                    vertices,
+                    polys.closed_array if mask is None else polys.closed_array[mask],
+                    polys.layers if mask is None else polys.layers[mask],
+                )
+                continue
+            source: RowTable = getattr(self.columns, kind)
+            rows, ids = source.rows, source.layers
+            if mask is not None:
+                rows, ids = rows[mask], ids[mask]
+            getattr(part.columns, kind).extend(rows, ids)
+            if kind == "texts":
+                strings = self.columns.texts.strings
+                part.columns.texts.strings = (
+                    list(strings) if mask is None else list(compress(strings, mask))
+                )
+        return part
+
+    @classmethod
+    def from_bundle(cls, bundle: DrawingBundle) -> ColumnarBundle:
+        columnar = cls()
+        columnar.extend(bundle)
+        return columnar
+
+    # -- model views ---------------------------------------------------------------
+    def _view(self, table: RowTable | PolylineTable, build: Callable[[int], _M]) -> ModelView[_M]:
+        return ModelView(table.__len__, build)
+
+    def _circle(self, i: int) -> Circle:
+        cx, cy, r = self.columns.circles.row(i)
+        layer = self.layers.name(self.columns.circles.layer_ids[i])
+        return Circle.trusted(_point(cx, cy), _dec(r), layer)
+
+    def _line(self, i: int) -> Line:
+        x1, y1, x2, y2 = self.columns.lines.row(i)
+        layer = self.layers.name(self.columns.lines.layer_ids[i])
+        return Line.trusted(_point(x1, y1), _point(x2, y2), layer)
+
+    def _rect(self, i: int) -> Rect:
+        ox, oy, w, h = self.columns.rects.row(i)
+        layer = self.layers.name(self.columns.rects.layer_ids[i])
+        return Rect.trusted(_point(ox, oy), _dec(w), _dec(h), layer)
+
+    def _polyline(self, i: int) -> Polyline:
+        table = self.columns.polylines
+        points = [_point(x, y) for x, y in table.points(i)]
+        return Polyline.trusted(points, bool(table.closed[i]), self.layers.name(table.layer_ids[i]))
+
+    def _arc(self, i: int) -> Arc:
+        cx, cy, r, a1, a2 = self.columns.arcs.row(i)
+        layer = self.layers.name(self.columns.arcs.layer_ids[i])
+        return Arc.trusted(_point(cx, cy), _dec(r), a1, a2, layer)
+
+    def _ellipse(self, i: int) -> Ellipse:
+        cx, cy, rx, ry, rot = self.columns.ellipses.row(i)
+        layer = self.layers.name(self.columns.ellipses.layer_ids[i])
+        return Ellipse.trusted(_point(cx, cy), _dec(rx), _dec(ry), rot, layer)
+
+    def _text(self, i: int) -> Text:
+        table = self.columns.texts
+        x, y, height = table.row(i)
+        layer = self.layers.name(table.layer_ids[i])
+        return Text.trusted(table.strings[i], _point(x, y), _dec(height), layer)
+
+    @property
+    def circles(self) -> ModelView[Circle]:
+        return self._view(self.columns.circles, self._circle)
+
+    @property
+    def lines(self) -> ModelView[Line]:
+        return self._view(self.columns.lines, self._line)
+
+    @property
+    def rects(self) -> ModelView[Rect]:
+        return self._view(self.columns.rects, self._rect)
+
+    @property
+    def polylines(self) -> ModelView[Polyline]:
+        return self._view(self.columns.polylines, self._polyline)
+
+    @property
+    def arcs(self) -> ModelView[Arc]:
+        return self._view(self.columns.arcs, self._arc)
+
+    @property
+    def ellipses(self) -> ModelView[Ellipse]:
+        return self._view(self.columns.ellipses, self._ellipse)
+
+    @property
+    def texts(self) -> ModelView[Text]:
+        return self._view(self.columns.texts, self._text)
+
+    def iter_all(self) -> Iterator[BaseModel]:
+        for kind in self.KINDS:
+            yield from getattr(self, kind)
+
+    def to_bundle(self) -> DrawingBundle:
+        bundle = DrawingBundle()
+        for kind in self.KINDS:
+            getattr(bundle, kind).extend(getattr(self, kind))
+        return bundle
+
+    # -- stats -----------------------------------------------------------------------
+    def counts(self) -> dict[str, int]:
+        return {kind: len(getattr(self.columns, kind)) for kind in self.KINDS}
+
+    def __len__(self) -> int:
+        return sum(self.counts().values())
+
+    def nbytes(self) -> int:
+        """Bytes held by the column buffers (text strings excluded)."""
+
+        return sum(getattr(self.columns, kind).nbytes() for kind in self.KINDS)
+
+    def __repr__(self) -> str:  # pragma: no cover - debugging aid
+        parts = ", ".join(f"{kind}={count}" for kind, count in self.counts().items() if count)
+        return f"ColumnarBundle({parts})"
+
+
+def as_columnar(bundle: DrawingBundle | ColumnarBundle) -> ColumnarBundle:
+    return bundle if isinstance(bundle, ColumnarBundle) else ColumnarBundle.from_bundle(bundle)
+
+
+__all__ = [
+    "ColumnarBundle",
+    "GeometryColumns",
+    "LayerTable",
+    "ModelView",
+    "PolylineTable",
+    "RowTable",
+    "TextTable",
+    "as_columnar",
+    "require_positive_array",
+]
@@ -0,0 +1,409 @@
+"""Direct ASCII DXF encoding of model-space entities.
+
+Writers that bypass an ``ezdxf`` document (see :mod:`app.cad.streaming`) format
+entities here. Every entity carries its handle, the model-space owner, its
+layer and the R2000+ subclass markers, matching what ``ezdxf`` itself writes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from math import cos, hypot, inf, pi, radians, sin
+
+import numpy as np
+
+from .columnar import ColumnarBundle, GeometryColumns, RowTable
+
+TWO_PI = 2 * pi
+
+# Rows per vectorised pass in :func:`columns_extents`.
+EXTENTS_CHUNK = 1 << 18
+
+# Order in which the writers emit staged tables (matches ``DxfWriter.add_bundle``).
+WRITE_ORDER = ("lines", "circles", "rects", "polylines", "arcs", "ellipses", "texts")
+
+_OWNER = "<OWNER>"
+_HEAD = "  0\n%s\n  5\n%%X\n330\n" + _OWNER + "\n100\nAcDbEntity\n  8\n%%s\n"
+_LINE = (_HEAD % "LINE") + (
+    "100\nAcDbLine\n 10\n%r\n 20\n%r\n 30\n0.0\n 11\n%r\n 21\n%r\n 31\n0.0\n"
+)
+_CIRCLE = (_HEAD % "CIRCLE") + "100\nAcDbCircle\n 10\n%r\n 20\n%r\n 30\n0.0\n 40\n%r\n"
+_ARC = (_HEAD % "ARC") + (
+    "100\nAcDbCircle\n 10\n%r\n 20\n%r\n 30\n0.0\n 40\n%r\n100\nAcDbArc\n 50\n%r\n 51\n%r\n"
+)
+_ELLIPSE = (_HEAD % "ELLIPSE") + (
+    "100\nAcDbEllipse\n 10\n%r\n 20\n%r\n 30\n0.0\n 11\n%r\n 21\n%r\n 31\n0.0\n"
+    " 40\n%r\n 41\n0.0\n 42\n" + repr(TWO_PI) + "\n"
+)
+_TEXT = (_HEAD % "TEXT") + (
+    "100\nAcDbText\n 10\n%r\n 20\n%r\n 30\n0.0\n 40\n%r\n  1\n%s\n100\nAcDbText\n"
+)
+_LWPOLYLINE = (_HEAD % "LWPOLYLINE") + "100\nAcDbPolyline\n 90\n%d\n 70\n%d\n"
+_VERTEX = " 10\n%r\n 20\n%r\n"
+
+
+def ellipse_axes(rx: float, ry: float, rotation: float) -> tuple[float, float, float]:
+    """Return the major axis vector and an axis ratio <= 1 for radii ``rx``/``ry``.
+
+    DXF ellipses store the major axis explicitly, so when ``ry`` is the larger
+    radius the axis is turned by 90 degrees and the ratio inverted.
+    """
+
+    angle = radians(rotation)
+    if ry > rx:
+        rx, ry = ry, rx
+        angle += pi / 2
+    return rx * cos(angle), rx * sin(angle), ry / rx
+
+
+def rounder(precision: int | None) -> Callable[[float], float]:
+    """Round to ``precision`` decimal places; ``None`` keeps full float precision.
+
+    Rounded floats print with their shortest ``repr``, so fewer places mean
+    shorter ASCII group values.
+    """
+
+    if precision is None:
+        return float
+    if precision < 0:
+        raise ValueError(f"Precision must be >= 0, got {precision}.")
+
+    def round_to(value: float) -> float:
+        return round(value, precision)
+
+    return round_to
+
+
+def _clean_text(value: str) -> str:
+    # A group value must stay on one line.
+    return value.replace("\r\n", " ").replace("\n", " ").replace("\r", " ")
+
+
+@dataclass(slots=True)
+class Extents:
+    """Axis-aligned drawing bounds accumulated while entities are written."""
+
+    xmin: float = inf
+    ymin: float = inf
+    xmax: float = -inf
+    ymax: float = -inf
+
+    @property
+    def empty(self) -> bool:
+        return self.xmin > self.xmax
+
+    def add(self, xmin: float, ymin: float, xmax: float, ymax: float) -> None:
+        if xmin < self.xmin:
+            self.xmin = xmin
+        if ymin < self.ymin:
+            self.ymin = ymin
+        if xmax > self.xmax:
+            self.xmax = xmax
+        if ymax > self.ymax:
+            self.ymax = ymax
+
+    def add_arrays(
+        self, xmin: np.ndarray, ymin: np.ndarray, xmax: np.ndarray, ymax: np.ndarray
+    ) -> None:
+        if len(xmin):
+            self.add(float(xmin.min()), float(ymin.min()), float(xmax.max()), float(ymax.max()))
+
+    def merge(self, other: Extents) -> None:
+        if not other.empty:
+            self.add(other.xmin, other.ymin, other.xmax, other.ymax)
+
+
+def arc_bounds(
+    cx: np.ndarray, cy: np.ndarray, r: np.ndarray, start: np.ndarray, end: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Exact bounds of counter-clockwise arcs from ``start`` to ``end`` degrees.
+
+    Each box spans the arc's end points, widened to the circle on every side
+    whose direction (0, 90, 180 or 270 degrees) lies inside the sweep. Equal
+    angles, such as 0 to 360, describe a full circle.
+    """
+
+    start = np.mod(start, 360.0)
+    sweep = np.mod(end - start, 360.0)
+    sweep[sweep == 0] = 360.0
+    first, last = np.radians(start), np.radians(start + sweep)
+    x1, y1 = cx + r * np.cos(first), cy + r * np.sin(first)
+    x2, y2 = cx + r * np.cos(last), cy + r * np.sin(last)
+
+    def reaches(direction: float) -> np.ndarray:
+        return np.mod(direction - start, 360.0) <= sweep
+
+    return (
+        np.where(reaches(180.0), cx - r, np.minimum(x1, x2)),
+        np.where(reaches(270.0), cy - r, np.minimum(y1, y2)),
+        np.where(reaches(0.0), cx + r, np.maximum(x1, x2)),
+        np.where(reaches(90.0), cy + r, np.maximum(y1, y2)),
+    )
+
+
+def arc_box(
+    cx: float, cy: float, r: float, start: float, end: float
+) -> tuple[float, float, float, float]:
+    """Scalar :func:`arc_bounds`, for single entities."""
+
+    start %= 360.0
+    sweep = (end - start) % 360.0 or 360.0
+    first, last = radians(start), radians(start + sweep)
+    x1, y1 = cx + r * cos(first), cy + r * sin(first)
+    x2, y2 = cx + r * cos(last), cy + r * sin(last)
+
+    def reaches(direction: float) -> bool:
+        return (direction - start) % 360.0 <= sweep
+
+    return (
+        cx - r if reaches(180.0) else min(x1, x2),
+        cy - r if reaches(270.0) else min(y1, y2),
+        cx + r if reaches(0.0) else max(x1, x2),
+        cy + r if reaches(90.0) else max(y1, y2),
+    )
+
+
+def ellipse_bounds(
+    cx: np.ndarray, cy: np.ndarray, rx: np.ndarray, ry: np.ndarray, rotation: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Exact bounds of full ellipses with radii ``rx``/``ry`` turned by ``rotation`` degrees."""
+
+    angle = np.radians(rotation)
+    c, s = np.cos(angle), np.sin(angle)
+    hx = np.hypot(rx * c, ry * s)
+    hy = np.hypot(rx * s, ry * c)
+    return cx - hx, cy - hy, cx + hx, cy + hy
+
+
+def ellipse_box(
+    cx: float, cy: float, rx: float, ry: float, rotation: float
+) -> tuple[float, float, float, float]:
+    """Scalar :func:`ellipse_bounds`, for single entities."""
+
+    angle = radians(rotation)
+    c, s = cos(angle), sin(angle)
+    hx = hypot(rx * c, ry * s)
+    hy = hypot(rx * s, ry * c)
+    return cx - hx, cy - hy, cx + hx, cy + hy
+
+
+def _chunks(rows: np.ndarray) -> Iterator[np.ndarray]:
+    for start in range(0, len(rows), EXTENTS_CHUNK):
+        yield rows[start : start + EXTENTS_CHUNK]
+
+
+def columns_extents(columns: GeometryColumns) -> Extents:
+    """Vectorised, exact bounds of every row in ``columns``.
+
+    Tables are processed in chunks of :data:`EXTENTS_CHUNK` rows, so the
+    temporaries stay small however large the drawing. Text is bounded by its
+    insertion point and height, since glyph widths depend on the viewer's font.
+    """
+
+    extents = Extents()
+    for lines in _chunks(columns.lines.rows):
+        xs, ys = lines[:, [0, 2]], lines[:, [1, 3]]
+        extents.add_arrays(xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1))
+    for circles in _chunks(columns.circles.rows):
+        cx, cy, r = circles[:, 0], circles[:, 1], circles[:, 2]
+        extents.add_arrays(cx - r, cy - r, cx + r, cy + r)
+    for arcs in _chunks(columns.arcs.rows):
+        extents.add_arrays(*arc_bounds(*arcs.T))
+    for rects in _chunks(columns.rects.rows):
+        ox, oy = rects[:, 0], rects[:, 1]
+        extents.add_arrays(ox, oy, ox + rects[:, 2], oy + rects[:, 3])
+    for ellipses in _chunks(columns.ellipses.rows):
+        # Zero-radius ellipses are never written, so they do not count.
+        extents.add_arrays(*ellipse_bounds(*ellipses[ellipses[:, 2] != 0].T))
+    for texts in _chunks(columns.texts.rows):
+        x, y = texts[:, 0], texts[:, 1]
+        extents.add_arrays(x, y, x, y + texts[:, 2])
+    for vertices in _chunks(columns.polylines.vertex_array):
+        xs, ys = vertices[:, 0], vertices[:, 1]
+        extents.add_arrays(xs, ys, xs, ys)
+    return extents
+
+
+def emitted_count(bundle: ColumnarBundle) -> int:
+    """Number of entities :meth:`EntityEncoder.encode_columns` writes for ``bundle``.
+
+    Zero-radius ellipses and empty polylines are skipped, so the count can be
+    lower than ``len(bundle)``; parallel writers use it to reserve handles.
+    """
+
+    cols = bundle.columns
+    skipped = int(np.count_nonzero(cols.ellipses.rows[:, 2] == 0))
+    skipped += int(np.count_nonzero(np.diff(cols.polylines.offsets_array) == 0))
+    return len(bundle) - skipped
+
+
+class EntityEncoder:
+    """Format entities as ASCII DXF tags with consecutive handles.
+
+    The single-entity methods also grow :attr:`extents`; :meth:`encode_columns`
+    leaves bounds to :func:`columns_extents`, which is vectorised. With
+    ``precision`` every real value is rounded to that many decimal places.
+    """
+
+    def __init__(self, owner: str, first_handle: int, precision: int | None = None) -> None:
+        self.owner = owner
+        self.next_handle = first_handle
+        self.precision = precision
+        self.extents = Extents()
+        self._round = rounder(precision)
+        self._line = _LINE.replace(_OWNER, owner)
+        self._circle = _CIRCLE.replace(_OWNER, owner)
+        self._arc = _ARC.replace(_OWNER, owner)
+        self._ellipse = _ELLIPSE.replace(_OWNER, owner)
+        self._text = _TEXT.replace(_OWNER, owner)
+        self._lwpolyline = _LWPOLYLINE.replace(_OWNER, owner)
+
+    def _handle(self) -> int:
+        handle = self.next_handle
+        self.next_handle = handle + 1
+        return handle
+
+    def _rows(self, table: RowTable) -> list[list[float]]:
+        rows = table.rows
+        if self.precision is not None:
+            rows = np.round(rows, self.precision)
+        return rows.tolist()
+
+    def line(self, x1: float, y1: float, x2: float, y2: float, layer: str) -> str:
+        r = self._round
+        x1, y1, x2, y2 = r(x1), r(y1), r(x2), r(y2)
+        self.extents.add(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        return self._line % (self._handle(), layer, x1, y1, x2, y2)
+
+    def circle(self, cx: float, cy: float, r: float, layer: str) -> str:
+        rnd = self._round
+        cx, cy, r = rnd(cx), rnd(cy), rnd(r)
+        self.extents.add(cx - r, cy - r, cx + r, cy + r)
+        return self._circle % (self._handle(), layer, cx, cy, r)
+
+    def arc(self, cx: float, cy: float, r: float, start: float, end: float, layer: str) -> str:
+        rnd = self._round
+        cx, cy, r, start, end = rnd(cx), rnd(cy), rnd(r), rnd(start), rnd(end)
+        self.extents.add(*arc_box(cx, cy, r, start, end))
+        return self._arc % (self._handle(), layer, cx, cy, r, start, end)
+
+    def ellipse(
+        self, cx: float, cy: float, rx: float, ry: float, rotation: float, layer: str
+    ) -> str:
+        if rx == 0:
+            return ""
+        r = self._round
+        mx, my, ratio = ellipse_axes(rx, ry, rotation)
+        self.extents.add(*ellipse_box(cx, cy, rx, ry, rotation))
+        return self._ellipse % (self._handle(), layer, r(cx), r(cy), r(mx), r(my), r(ratio))
+
+    def text(self, content: str, x: float, y: float, height: float, layer: str) -> str:
+        r = self._round
+        x, y, height = r(x), r(y), r(height)
+        self.extents.add(x, y, x, y + height)
+        return self._text % (self._handle(), layer, x, y, height, _clean_text(content))
+
+    def lwpolyline(self, points: Sequence[tuple[float, float]], closed: bool, layer: str) -> str:
+        if not points:
+            return ""
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.extents.add(min(xs), min(ys), max(xs), max(ys))
+        return self._polyline_tags(points, closed, layer)
+
+    def _polyline_tags(self, points: Iterable[Sequence[float]], closed: bool, layer: str) -> str:
+        if self.precision is None:
+            vertices = [_VERTEX % (x, y) for x, y in points]
+        else:
+            r = self._round
+            vertices = [_VERTEX % (r(x), r(y)) for x, y in points]
+        head = self._lwpolyline % (self._handle(), layer, len(vertices), 1 if closed else 0)
+        return head + "".join(vertices)
+
+    def encode_columns(self, bundle: ColumnarBundle, *, chunk: int = 4096) -> Iterator[str]:
+        """Yield the tags of every staged entity, ``chunk`` entities per string."""
+
+        layers = [_clean_text(name) for name in bundle.layers]
+        cols = bundle.columns
+        parts: list[str] = []
+
+        def flush() -> Iterator[str]:
+            if parts:
+                yield "".join(parts)
+                parts.clear()
+
+        rows = self._rows
+        template = self._line
+        for (x1, y1, x2, y2), lid in zip(rows(cols.lines), cols.lines.layer_ids, strict=True):
+            parts.append(template % (self._handle(), layers[lid], x1, y1, x2, y2))
+            if len(parts) >= chunk:
+                yield from flush()
+        template = self._circle
+        for (cx, cy, r), lid in zip(rows(cols.circles), cols.circles.layer_ids, strict=True):
+            parts.append(template % (self._handle(), layers[lid], cx, cy, r))
+            if len(parts) >= chunk:
+                yield from flush()
+        for (ox, oy, w, h), lid in cols.rects.iter_rows():
+            corners = ((ox, oy), (ox + w, oy), (ox + w, oy + h), (ox, oy + h), (ox, oy))
+            parts.append(self._polyline_tags(corners, True, layers[lid]))
+            if len(parts) >= chunk:
+                yield from flush()
+        polys = cols.polylines
+        offsets = polys.offsets_array.tolist()
+        vertices = polys.vertex_array.tolist()
+        for index, lid in enumerate(polys.layer_ids):
+            start, stop = offsets[index], offsets[index + 1]
+            if start == stop:
+                continue
+            closed = bool(polys.closed[index])
+            parts.append(self._polyline_tags(vertices[start:stop], closed, layers[lid]))
+            if len(parts) >= chunk:
+                yield from flush()
+        template = self._arc
+        for (cx, cy, r, start_angle, end_angle), lid in zip(
+            rows(cols.arcs), cols.arcs.layer_ids, strict=True
+        ):
+            parts.append(
+                template % (self._handle(), layers[lid], cx, cy, r, start_angle, end_angle)
+            )
+            if len(parts) >= chunk:
+                yield from flush()
+        template = self._ellipse
+        rnd = self._round
+        # Unrounded rows: the zero-radius skip must agree with ``emitted_count``.
+        for (cx, cy, rx, ry, rotation), lid in cols.ellipses.iter_rows():
+            if rx == 0:
+                continue
+            mx, my, ratio = ellipse_axes(rx, ry, rotation)
+            values = (rnd(cx), rnd(cy), rnd(mx), rnd(my), rnd(ratio))
+            parts.append(template % (self._handle(), layers[lid], *values))
+            if len(parts) >= chunk:
+                yield from flush()
+        template = self._text
+        texts = cols.texts
+        for content, (x, y, height), lid in zip(
+            texts.strings, rows(texts), texts.layer_ids, strict=True
+        ):
+            parts.append(
+                template % (self._handle(), layers[lid], x, y, height, _clean_text(content))
+            )
+            if len(parts) >= chunk:
+                yield from flush()
+        yield from flush()
+
+
+__all__ = [
+    "EXTENTS_CHUNK",
+    "WRITE_ORDER",
+    "EntityEncoder",
+    "Extents",
+    "arc_bounds",
+    "arc_box",
+    "columns_extents",
+    "ellipse_axes",
+    "ellipse_bounds",
+    "ellipse_box",
+    "emitted_count",
+    "rounder",
+]
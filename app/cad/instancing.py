@@ -0,0 +1,394 @@
+"""Find repeated geometry in a staged bundle and plan BLOCK/INSERT output.
+
+Entities are grouped by containment: each entity joins the smallest closed
+outline (a rectangle or closed polyline) whose bounding box holds it. A panel
+and its bolt holes therefore form one group, and entities outside any outline
+stand alone. A uniform grid over the outlines keeps this lookup close to
+linear.
+
+Each group is moved into a local frame at its anchor: an outline's first
+vertex, or an entity's reference point. The result is then quantised and
+hashed, so finding repeats costs one dictionary lookup per group. With
+``rotation`` the frame also turns, following an outline's first edge, a
+line's direction, an arc's start angle or an ellipse's axis. Rotated copies
+then share one block. Groups holding text are matched by translation only,
+because ``Text`` carries no rotation.
+
+A group that repeats often enough to pay for its block definition is
+replaced by INSERTs. A group that does not repeat is dissolved, and the
+contents of its outline are tried again on their own. A sheet border around a
+panel layout therefore does not hide the panels.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import chain
+from math import atan2, cos, degrees, floor, radians, sin
+
+import numpy as np
+
+from .columnar import ColumnarBundle
+from .dxf_encode import WRITE_ORDER
+
+# Geometry closer than this (drawing units, or degrees for angles) is treated as equal.
+DEFAULT_TOLERANCE = 1e-6
+
+# Rough output cost in tag values. Every entity carries a handle, an owner, a
+# layer and subclass markers. An INSERT adds a block name, a position and a
+# rotation, and a block definition adds its BLOCK_RECORD, BLOCK and ENDBLK.
+_ENTITY_COST = 4
+_INSERT_COST = _ENTITY_COST + 4
+_BLOCK_COST = 20
+
+# Outlines covering more grid cells than this are checked against every entity instead.
+_MAX_CELLS = 64
+
+# Normalised entity: output table, layer id, values and a string (label or polyline flag).
+_Shape = tuple[str, int, tuple[float, ...], str]
+_Key = tuple[tuple[str, int, tuple[int, ...], str], ...]
+
+
+@dataclass(slots=True)
+class BlockInstances:
+    """One block definition and where it is inserted.
+
+    ``geometry`` is relative to the block base point ``(0, 0)``. Insert ``i``
+    places it at ``positions[i]``, turned by ``rotations[i]`` degrees.
+    """
+
+    geometry: ColumnarBundle
+    layer: str
+    positions: list[tuple[float, float]] = field(default_factory=list)
+    rotations: list[float] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class InstancePlan:
+    """Blocks to define, plus the entities that are written unchanged."""
+
+    blocks: list[BlockInstances]
+    remainder: ColumnarBundle
+    replaced: int = 0
+
+    @property
+    def insert_count(self) -> int:
+        return sum(len(block.positions) for block in self.blocks)
+
+
+@dataclass(slots=True, eq=False)
+class _Entity:
+    kind: str
+    index: int
+    layer: int
+    row: list[float]  # table row; polylines hold their vertices flattened
+    bbox: tuple[float, float, float, float]
+    order: int
+    text: str = ""
+    closed: bool = False
+    nested: bool = False
+    children: list[_Entity] = field(default_factory=list)
+
+    @property
+    def is_outline(self) -> bool:
+        return self.kind == "rects" or (
+            self.kind == "polylines" and self.closed and len(self.row) >= 6
+        )
+
+    @property
+    def area(self) -> float:
+        xmin, ymin, xmax, ymax = self.bbox
+        return (xmax - xmin) * (ymax - ymin)
+
+
+@dataclass(slots=True)
+class _Group:
+    root: _Entity
+    members: list[_Entity]
+    x: float
+    y: float
+    theta: float
+    key: _Key
+    shapes: list[_Shape]
+    weight: int
+
+
+def _entities(bundle: ColumnarBundle) -> list[_Entity]:
+    cols = bundle.columns
+    entities: list[_Entity] = []
+
+    def add(kind: str, rows: np.ndarray, ids: np.ndarray, boxes: list[np.ndarray]) -> None:
+        bounds = np.column_stack(boxes).tolist() if len(rows) else []
+        for index, (row, layer, bbox) in enumerate(
+            zip(rows.tolist(), ids.tolist(), bounds, strict=True)
+        ):
+            entities.append(_Entity(kind, index, layer, row, tuple(bbox), len(entities)))
+
+    for kind in WRITE_ORDER:
+        if kind == "polylines":
+            polys = cols.polylines
+            offsets = polys.offsets_array.tolist()
+            vertices = polys.vertex_array
+            closed = polys.closed_array.tolist()
+            for index, layer in enumerate(polys.layers.tolist()):
+                points = vertices[offsets[index] : offsets[index + 1]]
+                if not len(points):
+                    continue
+                low, high = points.min(axis=0).tolist(), points.max(axis=0).tolist()
+                entity = _Entity(
+                    kind, index, layer, points.ravel().tolist(), (*low, *high), len(entities)
+                )
+                entity.closed = closed[index]
+                entities.append(entity)
+            continue
+        table = getattr(cols, kind)
+        rows = table.rows
+        c = rows.T
+        if kind == "lines":
+            boxes = [
+                np.minimum(c[0], c[2]),
+                np.minimum(c[1], c[3]),
+                np.maximum(c[0], c[2]),
+                np.maximum(c[1], c[3]),
+            ]
+        elif kind in ("circles", "arcs"):
+            boxes = [c[0] - c[2], c[1] - c[2], c[0] + c[2], c[1] + c[2]]
+        elif kind == "rects":
+            boxes = [c[0], c[1], c[0] + c[2], c[1] + c[3]]
+        elif kind == "ellipses":
+            angle = np.radians(c[4])
+            hx = np.hypot(c[2] * np.cos(angle), c[3] * np.sin(angle))
+            hy = np.hypot(c[2] * np.sin(angle), c[3] * np.cos(angle))
+            boxes = [c[0] - hx, c[1] - hy, c[0] + hx, c[1] + hy]
+        else:
+            boxes = [c[0], c[1], c[0], c[1] + c[2]]
+        start = len(entities)
+        add(kind, rows, table.layers, boxes)
+        if kind == "texts":
+            for entity, text in zip(entities[start:], table.strings, strict=True):
+                entity.text = text
+    return entities
+
+
+def _nest(entities: list[_Entity]) -> None:
+    """Attach every entity to the smallest outline whose bounding box holds it."""
+
+    outlines = [e for e in entities if e.is_outline]
+    if not outlines:
+        return
+    sizes = sorted(max(e.bbox[2] - e.bbox[0], e.bbox[3] - e.bbox[1]) for e in outlines)
+    cell = sizes[len(sizes) // 2] or 1.0
+    grid: dict[tuple[int, int], list[_Entity]] = {}
+    large: list[_Entity] = []
+    for outline in outlines:
+        xmin, ymin, xmax, ymax = outline.bbox
+        x0, y0 = floor(xmin / cell), floor(ymin / cell)
+        x1, y1 = floor(xmax / cell), floor(ymax / cell)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > _MAX_CELLS:
+            large.append(outline)
+            continue
+        for gx in range(x0, x1 + 1):
+            for gy in range(y0, y1 + 1):
+                grid.setdefault((gx, gy), []).append(outline)
+
+    for entity in entities:
+        xmin, ymin, xmax, ymax = entity.bbox
+        rank = (entity.area, entity.order) if entity.is_outline else None
+        best: _Entity | None = None
+        best_rank: tuple[float, int] | None = None
+        for outline in chain(grid.get((floor(xmin / cell), floor(ymin / cell)), ()), large):
+            oxmin, oymin, oxmax, oymax = outline.bbox
+            if outline is entity or not (
+                oxmin <= xmin and oymin <= ymin and xmax <= oxmax and ymax <= oymax
+            ):
+                continue
+            # Outlines only nest in larger ones; the order breaks ties between duplicates.
+            outline_rank = (outline.area, outline.order)
+            if rank is not None and outline_rank <= rank:
+                continue
+            if best_rank is None or outline_rank < best_rank:
+                best, best_rank = outline, outline_rank
+        if best is not None:
+            best.children.append(entity)
+            entity.nested = True
+
+
+def _anchor(entity: _Entity, rotation: bool) -> tuple[float, float, float]:
+    row = entity.row
+    x, y = row[0], row[1]
+    if not rotation:
+        return x, y, 0.0
+    if entity.kind == "lines":
+        return x, y, degrees(atan2(row[3] - y, row[2] - x))
+    if entity.kind == "arcs":
+        return x, y, row[3]
+    if entity.kind == "ellipses":
+        return x, y, row[4]
+    if entity.kind == "polylines":
+        for i in range(2, len(row), 2):
+            if row[i] != x or row[i + 1] != y:
+                return x, y, degrees(atan2(row[i + 1] - y, row[i] - x))
+    return x, y, 0.0
+
+
+def _normalise(entity: _Entity, ax: float, ay: float, theta: float) -> _Shape:
+    """``entity`` in the frame at ``(ax, ay)`` turned by ``theta`` degrees."""
+
+    c, s = cos(radians(theta)), sin(radians(theta))
+
+    def local(x: float, y: float) -> tuple[float, float]:
+        dx, dy = x - ax, y - ay
+        return dx * c + dy * s, dy * c - dx * s
+
+    kind, layer, row = entity.kind, entity.layer, entity.row
+    if kind == "lines":
+        return kind, layer, (*local(row[0], row[1]), *local(row[2], row[3])), ""
+    if kind == "circles":
+        return kind, layer, (*local(row[0], row[1]), row[2]), ""
+    if kind == "arcs":
+        start, end = (row[3] - theta) % 360.0, (row[4] - theta) % 360.0
+        return kind, layer, (*local(row[0], row[1]), row[2], start, end), ""
+    if kind == "ellipses":
+        turn = (row[4] - theta) % 360.0
+        return kind, layer, (*local(row[0], row[1]), row[2], row[3], turn), ""
+    if kind == "texts":
+        return kind, layer, (*local(row[0], row[1]), row[2]), entity.text
+    if kind == "rects":
+        ox, oy, w, h = row
+        corners = ((ox, oy), (ox + w, oy), (ox + w, oy + h), (ox, oy + h))
+        values = tuple(v for x, y in corners for v in local(x, y))
+        return "polylines", layer, values, "closed"
+    end = len(row)
+    if entity.closed and end > 2 and row[-2:] == row[:2]:
+        # A closing vertex repeating the first adds nothing, so rectangles and
+        # closed polylines with the same corners match.
+        end -= 2
+    values = tuple(v for i in range(0, end, 2) for v in local(row[i], row[i + 1]))
+    return "polylines", layer, values, "closed" if entity.closed else "open"
+
+
+def _subtree(root: _Entity) -> list[_Entity]:
+    members = [root]
+    for member in members:
+        members.extend(member.children)
+    return members
+
+
+def _outline_key(root: _Entity, members: list[_Entity]) -> tuple[int, int]:
+    """Cheap key that congruent groups share, whatever their position or rotation."""
+
+    return len(members), root.layer
+
+
+def _group(root: _Entity, members: list[_Entity], rotation: bool, scale: float) -> _Group:
+    turn = rotation and not any(m.kind == "texts" for m in members)
+    x, y, theta = _anchor(root, turn)
+    keyed = sorted(
+        (
+            (kind, layer, tuple(round(v * scale) for v in values), extra),
+            (kind, layer, values, extra),
+        )
+        for kind, layer, values, extra in (_normalise(m, x, y, theta) for m in members)
+    )
+    weight = sum(len(shape[2]) + _ENTITY_COST + (shape[0] == "texts") for _, shape in keyed)
+    return _Group(
+        root,
+        members,
+        x,
+        y,
+        theta,
+        tuple(key for key, _ in keyed),
+        [shape for _, shape in keyed],
+        weight,
+    )
+
+
+def _pays(weight: int, count: int, min_count: int) -> bool:
+    return count >= min_count and count * weight > weight + _BLOCK_COST + count * _INSERT_COST
+
+
+def _geometry(shapes: list[_Shape], names: list[str]) -> ColumnarBundle:
+    geometry = ColumnarBundle()
+    for kind, layer, v, extra in shapes:
+        name = names[layer]
+        if kind == "lines":
+            geometry.add_line(v[0], v[1], v[2], v[3], name)
+        elif kind == "circles":
+            geometry.add_circle(v[0], v[1], v[2], name)
+        elif kind == "arcs":
+            geometry.add_arc(v[0], v[1], v[2], v[3], v[4], name)
+        elif kind == "ellipses":
+            geometry.add_ellipse(v[0], v[1], v[2], v[3], v[4], name)
+        elif kind == "texts":
+            geometry.add_text(extra, v[0], v[1], v[2], name)
+        else:
+            points = list(zip(v[0::2], v[1::2], strict=True))
+            geometry.add_polyline(points, extra == "closed", name)
+    return geometry
+
+
+def plan_instances(
+    bundle: ColumnarBundle,
+    *,
+    rotation: bool = False,
+    min_count: int = 2,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> InstancePlan:
+    """Split ``bundle`` into repeated groups (as blocks) and everything else.
+
+    A group becomes a block when it occurs at least ``min_count`` times and the
+    INSERTs are smaller than the copies they replace. Inserts are listed in
+    drawing order; the remainder keeps the bundle's order and layer ids.
+    """
+
+    if min_count < 2:
+        raise ValueError("min_count must be at least 2.")
+    if tolerance <= 0:
+        raise ValueError("tolerance must be greater than 0.")
+    entities = _entities(bundle)
+    _nest(entities)
+    names = list(bundle.layers)
+    scale = 1.0 / tolerance
+    blocks: dict[_Key, BlockInstances] = {}
+    keep = {kind: np.ones(len(getattr(bundle.columns, kind)), dtype=bool) for kind in WRITE_ORDER}
+    replaced = 0
+
+    block_outlines: set[tuple[int, int]] = set()
+
+    candidates = [entity for entity in entities if not entity.nested]
+    while candidates:
+        # Only groups whose cheap key repeats (or matches a block) are hashed in
+        # full; a sheet border holding the whole drawing is dissolved at once.
+        subtrees = [_subtree(entity) for entity in candidates]
+        outlines = [
+            _outline_key(root, members) for root, members in zip(candidates, subtrees, strict=True)
+        ]
+        outline_counts = Counter(outlines)
+        groups = []
+        following: list[_Entity] = []
+        for root, members, outline in zip(candidates, subtrees, outlines, strict=True):
+            if outline_counts[outline] >= min_count or outline in block_outlines:
+                groups.append(_group(root, members, rotation, scale))
+            else:
+                following.extend(root.children)
+        counts = Counter(group.key for group in groups)
+        candidates = following
+        for group in groups:
+            block = blocks.get(group.key)
+            if block is None and _pays(group.weight, counts[group.key], min_count):
+                block = BlockInstances(_geometry(group.shapes, names), names[group.root.layer])
+                blocks[group.key] = block
+                block_outlines.add(_outline_key(group.root, group.members))
+            if block is None:
+                candidates.extend(group.root.children)
+                continue
+            block.positions.append((group.x, group.y))
+            block.rotations.append(group.theta)
+            for member in group.members:
+                keep[member.kind][member.index] = False
+            replaced += len(group.members)
+    return InstancePlan(list(blocks.values()), bundle.subset(keep), replaced)
+
+
+__all__ = ["DEFAULT_TOLERANCE", "BlockInstances", "InstancePlan", "plan_instances"]
@@ -0,0 +1,109 @@
+"""Join chains of lines that share endpoints into polylines.
+
+Parsed commands often describe an outline one segment at a time, and each
+segment would become its own LINE. :func:`join_lines` hashes every endpoint,
+snapped to a grid of ``tolerance``, together with its layer. Each line is then
+visited once, so the pass is linear in the number of lines.
+
+A chain grows through endpoints where exactly two lines meet. Three or more
+lines meeting at a point is a junction, and chains stop there because the
+continuation would be ambiguous. A chain that returns to its first point
+becomes a closed polyline. Lines are never joined across layers.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from .columnar import ColumnarBundle
+
+# Endpoints closer than this (drawing units) are treated as coincident.
+JOIN_TOLERANCE = 1e-6
+
+_Node = tuple[int, int, int]  # layer id and snapped x, y
+
+
+def join_lines(bundle: ColumnarBundle, *, tolerance: float = JOIN_TOLERANCE) -> ColumnarBundle:
+    """Return a bundle in which chains of two or more lines are polylines.
+
+    The joined polylines are appended after the existing ones; every other
+    table is copied unchanged. Vertices keep the coordinates of the first line
+    that reaches them. When nothing joins, ``bundle`` itself is returned.
+    """
+
+    if tolerance <= 0:
+        raise ValueError("tolerance must be greater than 0.")
+    table = bundle.columns.lines
+    count = len(table)
+    coords = table.rows.tolist()
+    snapped = np.round(table.rows / tolerance).astype(np.int64).tolist()
+    layer_ids = table.layers.tolist()
+    # Line ``i`` has endpoint items ``2 * i`` (start) and ``2 * i + 1`` (end).
+    nodes: list[_Node] = []
+    for layer, (x1, y1, x2, y2) in zip(layer_ids, snapped, strict=True):
+        nodes.append((layer, x1, y1))
+        nodes.append((layer, x2, y2))
+    incident: dict[_Node, list[int]] = {}
+    for item, node in enumerate(nodes):
+        if nodes[item ^ 1] != node:  # zero-length lines join nothing
+            incident.setdefault(node, []).append(item)
+
+    def point(item: int) -> tuple[float, float]:
+        row = coords[item >> 1]
+        return (row[2], row[3]) if item & 1 else (row[0], row[1])
+
+    def walk(item: int) -> tuple[list[int], bool]:
+        """Follow the chain leaving through endpoint ``item``; returns items and closure."""
+
+        path: list[int] = []
+        while True:
+            ends = incident[nodes[item]]
+            if len(ends) != 2:
+                return path, False
+            other = ends[0] if ends[1] == item else ends[1]
+            if used[other >> 1]:
+                return path, other == first
+            used[other >> 1] = 1
+            item = other ^ 1
+            path.append(item)
+
+    used = bytearray(count)
+    keep = np.ones(count, dtype=bool)
+    offsets = [0]
+    vertices: list[tuple[float, float]] = []
+    closed_flags: list[bool] = []
+    chain_layers: list[int] = []
+    for line in range(count):
+        first = 2 * line
+        if used[line] or nodes[first] == nodes[first + 1]:
+            continue
+        used[line] = 1
+        ahead, closed = walk(first + 1)
+        behind: list[int] = []
+        if not closed:
+            behind, _ = walk(first)
+        if not ahead and not behind:
+            continue
+        items = [*reversed(behind), first, first + 1, *ahead]
+        for item in items:
+            keep[item >> 1] = False
+        if closed:
+            items.pop()  # the last vertex repeats the first
+        vertices.extend(point(item) for item in items)
+        offsets.append(len(vertices))
+        closed_flags.append(closed)
+        chain_layers.append(layer_ids[line])
+
+    if keep.all():
+        return bundle
+    result = bundle.subset({"lines": keep})
+    result.columns.polylines.extend(
+        np.asarray(offsets, dtype=np.int64),
+        np.asarray(vertices, dtype=np.float64),
+        np.asarray(closed_flags, dtype=bool),
+        np.asarray(chain_layers, dtype=np.int32),
+    )
+    return result
+
+
+__all__ = ["JOIN_TOLERANCE", "join_lines"]
@@ -0,0 +1,45 @@
+"""Layer definitions shared by the DXF writers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from .models import DEFAULT_LAYER
+
+
+@dataclass(frozen=True, slots=True)
+class LayerSpec:
+    name: str
+    color: int | None = None
+
+
+DEFAULT_LAYERS: tuple[LayerSpec, ...] = (LayerSpec(DEFAULT_LAYER),)
+
+# One colour-coded layer per entity kind, as produced by the legacy ``render`` path.
+LEGACY_LAYERS: dict[str, LayerSpec] = {
+    "circles": LayerSpec("CIRCLES", 1),
+    "lines": LayerSpec("LINES", 3),
+    "rects": LayerSpec("RECTS", 5),
+    "arcs": LayerSpec("ARCS", 2),
+    "polylines": LayerSpec("PLINES", 4),
+    "ellipses": LayerSpec("ELLIPSES", 6),
+    "texts": LayerSpec("TEXTS", 7),
+}
+
+
+def ensure_layers(doc: Any, layers: Iterable[LayerSpec | str]) -> None:
+    """Create any missing layers in ``doc``; existing layers are left untouched."""
+
+    for layer in layers:
+        spec = LayerSpec(layer) if isinstance(layer, str) else layer
+        if spec.name in doc.layers:
+            continue
+        if spec.color is None:
+            doc.layers.add(spec.name)
+        else:
+            doc.layers.add(spec.name, color=spec.color)
+
+
+__all__ = ["DEFAULT_LAYERS", "LEGACY_LAYERS", "LayerSpec", "ensure_layers"]
@@ -4,11 +4,39 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from decimal import Decimal
+from typing import Any
 
 from pydantic import BaseModel, ConfigDict, Field
 
 DEFAULT_LAYER = "A-GEOM"
 
+_new = object.__new__
+_setattr = object.__setattr__
+
+
+def _trusted(cls: type[BaseModel], values: dict[str, Any]) -> Any:
+    """Instantiate ``cls`` from already validated ``values`` without running validation.
+
+    Mirrors :meth:`BaseModel.model_construct` minus its default/alias handling,
+    so ``values`` must name every field. Only internal producers whose inputs
+    were validated upstream (the legacy parser, the command compiler) use it.
+    """
+
+    instance = _new(cls)
+    _setattr(instance, "__dict__", values)
+    _setattr(instance, "__pydantic_fields_set__", set(values))
+    _setattr(instance, "__pydantic_extra__", None)
+    _setattr(instance, "__pydantic_private__", None)
+    return instance
+
+
+def require_positive(value: Decimal, field: str) -> Decimal:
+    """Enforce the ``gt=0`` constraint that trusted construction skips."""
+
+    if value <= 0:
+        raise ValueError(f"{field} must be greater than 0, got {value}")
+    return value
+
 
 class Point(BaseModel):
     """2D coordinate expressed in millimetres."""
@@ -18,6 +46,10 @@ class Point(BaseModel):
     x: Decimal = Field(default=Decimal("0"))
     y: Decimal = Field(default=Decimal("0"))
 
+    @classmethod
+    def trusted(cls, x: Decimal, y: Decimal) -> Point:
+        return _trusted(cls, {"x": x, "y": y})
+
     def as_tuple(self) -> tuple[float, float]:
         return float(self.x), float(self.y)
 
@@ -27,6 +59,10 @@ class Line(BaseModel):
     end: Point
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(cls, start: Point, end: Point, layer: str = DEFAULT_LAYER) -> Line:
+        return _trusted(cls, {"start": start, "end": end, "layer": layer})
+
     def as_dxf(self) -> tuple[tuple[float, float], tuple[float, float], str]:
         return self.start.as_tuple(), self.end.as_tuple(), self.layer
 
@@ -36,6 +72,10 @@ class Circle(BaseModel):
     radius: Decimal = Field(gt=Decimal("0"))
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(cls, center: Point, radius: Decimal, layer: str = DEFAULT_LAYER) -> Circle:
+        return _trusted(cls, {"center": center, "radius": radius, "layer": layer})
+
     def as_dxf(self) -> tuple[tuple[float, float], float, str]:
         return self.center.as_tuple(), float(self.radius), self.layer
 
@@ -46,6 +86,12 @@ class Rect(BaseModel):
     height: Decimal = Field(gt=Decimal("0"))
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(
+        cls, origin: Point, width: Decimal, height: Decimal, layer: str = DEFAULT_LAYER
+    ) -> Rect:
+        return _trusted(cls, {"origin": origin, "width": width, "height": height, "layer": layer})
+
     def as_polyline(self) -> tuple[list[tuple[float, float]], str]:
         ox, oy = self.origin.as_tuple()
         width = float(self.width)
@@ -65,6 +111,12 @@ class Polyline(BaseModel):
     closed: bool = Field(default=False)
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(
+        cls, points: list[Point], closed: bool = False, layer: str = DEFAULT_LAYER
+    ) -> Polyline:
+        return _trusted(cls, {"points": points, "closed": closed, "layer": layer})
+
     def as_dxf(self) -> tuple[list[tuple[float, float]], bool, str]:
         return [p.as_tuple() for p in self.points], self.closed, self.layer
 
@@ -76,6 +128,26 @@ class Arc(BaseModel):
     end_angle: float = Field(default=360.0)
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(
+        cls,
+        center: Point,
+        radius: Decimal,
+        start_angle: float = 0.0,
+        end_angle: float = 360.0,
+        layer: str = DEFAULT_LAYER,
+    ) -> Arc:
+        return _trusted(
+            cls,
+            {
+                "center": center,
+                "radius": radius,
+                "start_angle": start_angle,
+                "end_angle": end_angle,
+                "layer": layer,
+            },
+        )
+
     def as_dxf(self) -> tuple[tuple[float, float], float, float, float, str]:
         return (
             self.center.as_tuple(),
@@ -93,6 +165,19 @@ class Ellipse(BaseModel):
     rotation: float = Field(default=0.0)
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(
+        cls,
+        center: Point,
+        rx: Decimal,
+        ry: Decimal,
+        rotation: float = 0.0,
+        layer: str = DEFAULT_LAYER,
+    ) -> Ellipse:
+        return _trusted(
+            cls, {"center": center, "rx": rx, "ry": ry, "rotation": rotation, "layer": layer}
+        )
+
     def as_dxf(self) -> tuple[tuple[float, float], float, float, float, str]:
         return (
             self.center.as_tuple(),
@@ -109,6 +194,12 @@ class Text(BaseModel):
     height: Decimal = Field(gt=Decimal("0"))
     layer: str = Field(default=DEFAULT_LAYER)
 
+    @classmethod
+    def trusted(
+        cls, text: str, position: Point, height: Decimal, layer: str = DEFAULT_LAYER
+    ) -> Text:
+        return _trusted(cls, {"text": text, "position": position, "height": height, "layer": layer})
+
     def as_dxf(self) -> tuple[str, tuple[float, float], float, str]:
         return self.text, self.position.as_tuple(), float(self.height), self.layer
 
@@ -0,0 +1,44 @@
+"""Output profiles selectable with ``--format``."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Literal
+
+
+@dataclass(frozen=True, slots=True)
+class OutputProfile:
+    """How a drawing is serialised.
+
+    ``fmt`` is passed to ``ezdxf`` (``"asc"`` or ``"bin"``). ``minimal``
+    profiles are written by :class:`~app.cad.r12.R12Writer`: ENTITIES only, no
+    header, tables or handles.
+    """
+
+    name: str
+    version: str
+    fmt: Literal["asc", "bin"] = "asc"
+    minimal: bool = False
+
+    @property
+    def binary(self) -> bool:
+        return self.fmt == "bin"
+
+
+OUTPUT_PROFILES: dict[str, OutputProfile] = {
+    "ascii": OutputProfile("ascii", "R2018"),
+    "binary": OutputProfile("binary", "R2018", fmt="bin"),
+    "r12": OutputProfile("r12", "R12", minimal=True),
+}
+DEFAULT_PROFILE = OUTPUT_PROFILES["ascii"]
+
+
+def get_profile(name: str) -> OutputProfile:
+    try:
+        return OUTPUT_PROFILES[name]
+    except KeyError:
+        choices = ", ".join(OUTPUT_PROFILES)
+        raise ValueError(f"Unknown output format {name!r}; expected one of: {choices}.") from None
+
+
+__all__ = ["DEFAULT_PROFILE", "OUTPUT_PROFILES", "OutputProfile", "get_profile"]
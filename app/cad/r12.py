@@ -0,0 +1,226 @@
+"""Minimal DXF R12 output for simple geometry.
+
+Files hold only an ENTITIES section (no header, tables or handles), written
+with ``ezdxf``'s ``R12FastStreamWriter``. They are the smallest ASCII DXF this
+project produces and are read by every DXF consumer. The format has limits:
+- layers carry no colours;
+- values are rounded to at most six decimal places;
+- rectangles and polylines become POLYLINE entities;
+- ellipses, which R12 lacks, are flattened into closed polylines.
+
+Nothing is patched after the fact, so output goes to a path, a ``.gz`` path
+or a caller's binary stream alike.
+"""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from ezdxf.addons.r12writer import R12FastStreamWriter
+from ezdxf.math import ConstructionEllipse
+
+from .columnar import ColumnarBundle
+from .dxf_encode import TWO_PI, WRITE_ORDER, ellipse_axes, rounder
+from .models import Arc, Circle, DrawingBundle, Ellipse, Line, Polyline, Rect, Text
+from .sinks import Target, is_gzip_path, open_binary, text_writer
+
+# Ellipses are written as closed polylines with this many vertices.
+ELLIPSE_SEGMENTS = 64
+_ELLIPSE_PARAMS = [TWO_PI * i / ELLIPSE_SEGMENTS for i in range(ELLIPSE_SEGMENTS)]
+
+
+class R12Writer:
+    """Write a minimal R12 file with the :class:`~app.cad.writer.DxfWriter` ``add_*`` surface.
+
+    A stream passed as ``target`` is flushed on close but left open.
+    """
+
+    def __init__(
+        self, target: Target, *, precision: int | None = None, buffer_size: int = 1 << 20
+    ) -> None:
+        self.precision = precision
+        self.entity_count = 0
+        self._round = rounder(precision)
+        self.path: Path | None
+        self._owns_stream = isinstance(target, str | Path)
+        if isinstance(target, str | Path):
+            self.path = Path(target)
+            if is_gzip_path(self.path):
+                self._fh: io.TextIOWrapper | None = text_writer(open_binary(self.path), "cp1252")
+            else:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fh = open(  # noqa: SIM115 - closed by close()
+                    self.path, "w", encoding="cp1252", errors="dxfreplace", buffering=buffer_size
+                )
+        else:
+            self.path = None
+            self._fh = text_writer(target, "cp1252")
+        self._writer = R12FastStreamWriter(self._fh)
+
+    def _out(self) -> R12FastStreamWriter:
+        if self._fh is None:
+            raise RuntimeError("R12Writer is closed.")
+        self.entity_count += 1
+        return self._writer
+
+    def _line(self, x1: float, y1: float, x2: float, y2: float, layer: str) -> None:
+        r = self._round
+        self._out().add_line((r(x1), r(y1)), (r(x2), r(y2)), layer=layer)
+
+    def _circle(self, cx: float, cy: float, radius: float, layer: str) -> None:
+        r = self._round
+        self._out().add_circle((r(cx), r(cy)), r(radius), layer=layer)
+
+    def _arc(
+        self, cx: float, cy: float, radius: float, start: float, end: float, layer: str
+    ) -> None:
+        r = self._round
+        self._out().add_arc((r(cx), r(cy)), r(radius), r(start), r(end), layer=layer)
+
+    def _ellipse(
+        self, cx: float, cy: float, rx: float, ry: float, rotation: float, layer: str
+    ) -> None:
+        if rx == 0:
+            return
+        mx, my, ratio = ellipse_axes(rx, ry, rotation)
+        curve = ConstructionEllipse(center=(cx, cy), major_axis=(mx, my), ratio=ratio)
+        points = [(p.x, p.y) for p in curve.vertices(_ELLIPSE_PARAMS)]
+        self._polyline(points, True, layer)
+
+    def _text(self, content: str, x: float, y: float, height: float, layer: str) -> None:
+        r = self._round
+        self._out().add_text(content, (r(x), r(y)), height=r(height), layer=layer)
+
+    def _polyline(self, points: Sequence[Sequence[float]], closed: bool, layer: str) -> None:
+        if not points:
+            return
+        r = self._round
+        rounded = [(r(x), r(y)) for x, y in points]
+        self._out().add_polyline_2d(rounded, closed=closed, layer=layer)
+
+    def add_line(self, line: Line) -> None:
+        (x1, y1), (x2, y2), layer = line.as_dxf()
+        self._line(x1, y1, x2, y2, layer)
+
+    def add_circle(self, circle: Circle) -> None:
+        (cx, cy), radius, layer = circle.as_dxf()
+        self._circle(cx, cy, radius, layer)
+
+    def add_rect(self, rect: Rect) -> None:
+        points, layer = rect.as_polyline()
+        self._polyline(points, True, layer)
+
+    def add_polyline(self, polyline: Polyline) -> None:
+        points, closed, layer = polyline.as_dxf()
+        self._polyline(points, closed, layer)
+
+    def add_arc(self, arc: Arc) -> None:
+        (cx, cy), radius, start, end, layer = arc.as_dxf()
+        self._arc(cx, cy, radius, start, end, layer)
+
+    def add_ellipse(self, ellipse: Ellipse) -> None:
+        (cx, cy), rx, ry, rotation, layer = ellipse.as_dxf()
+        self._ellipse(cx, cy, rx, ry, rotation, layer)
+
+    def add_text(self, text: Text) -> None:
+        content, (x, y), height, layer = text.as_dxf()
+        self._text(content, x, y, height, layer)
+
+    def add_bundle(self, bundle: DrawingBundle | ColumnarBundle) -> None:
+        """Write every staged entity; columnar bundles are written from their rows."""
+
+        if not isinstance(bundle, ColumnarBundle):
+            adders: dict[str, Callable[[Any], None]] = {
+                "lines": self.add_line,
+                "circles": self.add_circle,
+                "rects": self.add_rect,
+                "polylines": self.add_polyline,
+                "arcs": self.add_arc,
+                "ellipses": self.add_ellipse,
+                "texts": self.add_text,
+            }
+            for kind in WRITE_ORDER:
+                for entity in getattr(bundle, kind):
+                    adders[kind](entity)
+            return
+        layers = list(bundle.layers)
+        cols = bundle.columns
+        for (x1, y1, x2, y2), lid in cols.lines.iter_rows():
+            self._line(x1, y1, x2, y2, layers[lid])
+        for (cx, cy, radius), lid in cols.circles.iter_rows():
+            self._circle(cx, cy, radius, layers[lid])
+        for (ox, oy, w, h), lid in cols.rects.iter_rows():
+            corners = ((ox, oy), (ox + w, oy), (ox + w, oy + h), (ox, oy + h), (ox, oy))
+            self._polyline(corners, True, layers[lid])
+        polys = cols.polylines
+        offsets = polys.offsets_array.tolist()
+        vertices = polys.vertex_array.tolist()
+        for index, lid in enumerate(polys.layer_ids):
+            points = vertices[offsets[index] : offsets[index + 1]]
+            self._polyline(points, bool(polys.closed[index]), layers[lid])
+        for (cx, cy, radius, start, end), lid in cols.arcs.iter_rows():
+            self._arc(cx, cy, radius, start, end, layers[lid])
+        for (cx, cy, rx, ry, rotation), lid in cols.ellipses.iter_rows():
+            self._ellipse(cx, cy, rx, ry, rotation, layers[lid])
+        texts = cols.texts
+        for content, (x, y, height), lid in zip(
+            texts.strings, texts.rows.tolist(), texts.layer_ids, strict=True
+        ):
+            self._text(content, x, y, height, layers[lid])
+
+    @property
+    def closed(self) -> bool:
+        return self._fh is None
+
+    def close(self) -> Path | None:
+        """Write the ENDSEC/EOF tail; returns the resolved path, or ``None`` for a stream."""
+
+        if self._fh is not None:
+            self._writer.close()
+            self._release()
+        return None if self.path is None else self.path.resolve()
+
+    def _release(self) -> None:
+        assert self._fh is not None
+        if self._owns_stream:
+            self._fh.close()
+        else:
+            self._fh.flush()
+            self._fh.detach()
+        self._fh = None
+
+    def save(self, path: str | Path | None = None) -> Path | None:
+        """Alias of :meth:`close` for callers written against ``DxfWriter``."""
+
+        if path is not None and (self.path is None or Path(path).resolve() != self.path.resolve()):
+            raise ValueError("R12Writer writes to the target given at construction.")
+        return self.close()
+
+    def abort(self) -> None:
+        """Stop writing and delete a partially written file."""
+
+        if self._fh is not None:
+            self._release()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> R12Writer:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+__all__ = ["ELLIPSE_SEGMENTS", "R12Writer"]
@@ -0,0 +1,136 @@
+"""Tolerance-based polyline simplification (Douglas-Peucker).
+
+Dense polylines from point imports or generated geometry often carry long
+runs of nearly collinear vertices. :func:`simplify_polylines` drops every
+vertex whose removal moves the outline by at most ``tolerance`` millimetres.
+The algorithm is Douglas-Peucker with an explicit stack instead of recursion,
+so inputs with millions of vertices cannot hit the recursion limit. The
+distances for each span are computed in one NumPy pass.
+
+Closed polylines are split at their first vertex and at the vertex farthest
+from it, and both halves are simplified. This keeps the ring's extent
+regardless of where it was started.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .columnar import ColumnarBundle, FloatArray
+
+
+@dataclass(frozen=True, slots=True)
+class SimplifyReport:
+    """Vertex counts before and after one simplification run."""
+
+    polylines: int
+    vertices_before: int
+    vertices_after: int
+
+    @property
+    def removed(self) -> int:
+        return self.vertices_before - self.vertices_after
+
+    @property
+    def reduction(self) -> float:
+        return self.removed / self.vertices_before if self.vertices_before else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.vertices_before} -> {self.vertices_after} vertices in {self.polylines} "
+            f"polyline(s) ({self.reduction:.1%} fewer)"
+        )
+
+
+def _segment_distances(points: FloatArray, a: FloatArray, b: FloatArray) -> FloatArray:
+    """Distance of each point to the segment ``a``-``b``."""
+
+    d = b - a
+    length2 = float(d @ d)
+    rel = points - a
+    if length2 == 0.0:
+        return np.hypot(rel[:, 0], rel[:, 1])
+    t = np.clip(rel @ d / length2, 0.0, 1.0)
+    off = rel - t[:, None] * d
+    return np.hypot(off[:, 0], off[:, 1])
+
+
+def douglas_peucker(points: FloatArray, tolerance: float) -> NDArray[np.bool_]:
+    """Mask of the vertices of an open path kept at ``tolerance``; the ends always stay."""
+
+    count = len(points)
+    keep = np.zeros(count, dtype=bool)
+    if count == 0:
+        return keep
+    keep[0] = keep[-1] = True
+    spans = [(0, count - 1)]
+    while spans:
+        start, end = spans.pop()
+        if end - start < 2:
+            continue
+        distances = _segment_distances(points[start + 1 : end], points[start], points[end])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            spans.append((start, split))
+            spans.append((split, end))
+    return keep
+
+
+def _ring_mask(points: FloatArray, tolerance: float) -> NDArray[np.bool_]:
+    count = len(points)
+    far = int(np.argmax(np.hypot(*(points - points[0]).T)))
+    if far == 0:
+        return np.ones(count, dtype=bool)
+    keep = np.zeros(count, dtype=bool)
+    keep[: far + 1] = douglas_peucker(points[: far + 1], tolerance)
+    back = np.concatenate([points[far:], points[:1]])
+    keep[far:] |= douglas_peucker(back, tolerance)[:-1]
+    return keep
+
+
+def simplify_polylines(
+    bundle: ColumnarBundle, tolerance: float
+) -> tuple[ColumnarBundle, SimplifyReport]:
+    """Simplify every polyline in ``bundle`` to within ``tolerance`` (drawing units).
+
+    Returns a new bundle, with every other table copied unchanged, and a
+    report of the vertex reduction.
+    """
+
+    if tolerance <= 0:
+        raise ValueError("tolerance must be greater than 0.")
+    polys = bundle.columns.polylines
+    offsets = polys.offsets_array
+    vertices = polys.vertex_array
+    closed = polys.closed_array.tolist()
+    keep = np.ones(len(vertices), dtype=bool)
+    bounds = offsets.tolist()
+    for index, is_closed in enumerate(closed):
+        start, end = bounds[index], bounds[index + 1]
+        if end - start < (4 if is_closed else 3):
+            continue
+        points = vertices[start:end]
+        if is_closed:
+            # A closing vertex repeating the first is dropped like any other.
+            keep[start:end] = _ring_mask(points, tolerance)
+        else:
+            keep[start:end] = douglas_peucker(points, tolerance)
+
+    report = SimplifyReport(len(closed), len(vertices), int(keep.sum()))
+    if not report.removed:
+        return bundle, report
+    # Kept vertices per polyline, from the running count at each offset.
+    kept_before = np.concatenate([[0], np.cumsum(keep)])
+    result = bundle.subset({"polylines": np.zeros(len(closed), dtype=bool)})
+    result.columns.polylines.extend(
+        kept_before[offsets], vertices[keep], polys.closed_array, polys.layers
+    )
+    return result, report
+
+
+__all__ = ["SimplifyReport", "douglas_peucker", "simplify_polylines"]
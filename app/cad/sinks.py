@@ -0,0 +1,37 @@
+"""Output targets for the DXF writers: files, gzip files and caller-owned streams."""
+
+from __future__ import annotations
+
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, cast
+
+# zlib's default level: level 9 (gzip's default) is several times slower for a
+# few percent smaller DXF output.
+GZIP_LEVEL = 6
+
+Target = str | Path | BinaryIO
+
+
+def is_gzip_path(path: str | Path) -> bool:
+    return Path(path).suffix.lower() == ".gz"
+
+
+def open_binary(path: str | Path) -> BinaryIO:
+    """Open ``path`` for writing, compressing on the fly when it ends in ``.gz``."""
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if is_gzip_path(target):
+        return cast(BinaryIO, gzip.open(target, "wb", compresslevel=GZIP_LEVEL))
+    return target.open("wb")
+
+
+def text_writer(stream: BinaryIO, encoding: str) -> io.TextIOWrapper:
+    """DXF text layer over ``stream``; ``detach()`` it to leave ``stream`` open."""
+
+    return io.TextIOWrapper(stream, encoding=encoding, errors="dxfreplace", newline="\n")
+
+
+__all__ = ["GZIP_LEVEL", "Target", "is_gzip_path", "open_binary", "text_writer"]
@@ -0,0 +1,567 @@
+"""Streaming DXF writer that never holds the entities in an ``ezdxf`` document.
+
+The header, tables, blocks and an empty ENTITIES section are rendered from an
+``ezdxf`` template document once per ``(version, layers)`` and cached; each file
+only refreshes the GUIDs and dates. The header, tables and blocks go to disk
+first. Entities are then encoded straight into a buffered file as they arrive.
+Closing the writer appends the OBJECTS section and patches ``$HANDSEED``,
+``$EXTMIN`` and ``$EXTMAX`` in place; fixed-width placeholders reserve room for
+them. Streams and ``.gz`` files cannot be patched. A bundle added on its own
+(the executor's case) is held until closing, which derives the header values
+from its columns and encodes it straight after the final header. Incremental
+adds fall back to spooling the encoded entities to an anonymous temporary file
+that is copied after the header on close.
+
+With ``workers > 1`` large columnar bundles are split into per-table chunks
+whose handle ranges are reserved up front. The chunks are encoded in a process
+pool and written back in order.
+"""
+
+from __future__ import annotations
+
+import io
+import re
+import shutil
+import tempfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, cast
+
+from ezdxf.tools import guid, juliandate
+from numpy.typing import ArrayLike
+from pydantic import BaseModel
+
+from .columnar import ColumnarBundle, LayerArg
+from .dxf_encode import WRITE_ORDER, EntityEncoder, Extents, columns_extents, emitted_count
+from .layers import DEFAULT_LAYERS, LayerSpec
+from .models import DEFAULT_LAYER, Arc, Circle, DrawingBundle, Ellipse, Line, Polyline, Rect, Text
+from .sinks import Target, is_gzip_path, open_binary, text_writer
+from .template import LayerKey, layer_key, new_document, register_derived_cache
+
+DXF_VERSION = "R2018"
+
+_ENTITIES_OPEN = "  0\nSECTION\n  2\nENTITIES\n"
+_SECTION_CLOSE = "  0\nENDSEC\n"
+_HANDSEED_RE = re.compile(r"(  9\n\$HANDSEED\n  5\n)[0-9A-Fa-f]+\n")
+_EXT_RE = re.compile(r"(  9\n\$(EXTMIN|EXTMAX)\n 10\n)[^\n]*\n 20\n[^\n]*\n 30\n[^\n]*\n")
+
+_STAMP_VARS = ("TDCREATE", "TDUPDATE", "FINGERPRINTGUID", "VERSIONGUID")
+_STAMP_RE = re.compile(r"(  9\n\$(" + "|".join(_STAMP_VARS) + r")\n *\d+\n)[^\n]*\n")
+
+_HANDLE_WIDTH = 16
+_FLOAT_LIMIT = 1e99
+
+
+def _fixed_float(value: float) -> str:
+    """Format ``value`` in a constant 22 characters so it can be patched in place."""
+
+    return f"{max(-_FLOAT_LIMIT, min(_FLOAT_LIMIT, value)):+.15e}"
+
+
+_HANDSEED_SLOT = "\x00H" * (_HANDLE_WIDTH // 2)
+_EXT_SLOTS = {
+    name: tuple(f"\x00{name}{axis}".ljust(len(_fixed_float(0.0)), "\x00") for axis in "XYZ")
+    for name in ("EXTMIN", "EXTMAX")
+}
+_SLOTS = {"HANDSEED": _HANDSEED_SLOT} | {
+    f"{name}{axis}": value
+    for name, values in _EXT_SLOTS.items()
+    for axis, value in zip("XYZ", values, strict=True)
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Template:
+    prefix: str
+    suffix: str
+    first_handle: int
+    owner: str
+    encoding: str
+
+
+@lru_cache(maxsize=32)
+def _template(version: str, layers: LayerKey) -> _Template:
+    """Render the file around the ENTITIES section once per ``(version, layers)``."""
+
+    doc = new_document(version, layers)
+    if doc.dxfversion < "AC1015":
+        raise ValueError(f"Streaming DXF output requires R2000 or later, got {version}.")
+    stream = io.StringIO()
+    doc.write(stream)
+    text = stream.getvalue()
+    first_handle = int(str(doc.entitydb.handles), 16)
+    text = _HANDSEED_RE.sub(lambda m: m.group(1) + _HANDSEED_SLOT + "\n", text, count=1)
+
+    def ext_slots(match: re.Match[str]) -> str:
+        x, y, z = _EXT_SLOTS[match.group(2)]
+        return f"{match.group(1)}{x}\n 20\n{y}\n 30\n{z}\n"
+
+    text = _EXT_RE.sub(ext_slots, text, count=2)
+    start = text.index(_ENTITIES_OPEN) + len(_ENTITIES_OPEN)
+    end = text.index(_SECTION_CLOSE, start)
+    if text[start:end].strip():  # pragma: no cover - template modelspace is empty
+        raise RuntimeError("DXF template unexpectedly contains entities.")
+    owner = doc.modelspace().layout_key
+    return _Template(text[:start], text[end:], first_handle, owner, doc.output_encoding)
+
+
+register_derived_cache(_template.cache_clear)
+
+
+def _fresh_stamp(match: re.Match[str]) -> str:
+    # Files rendered from one cached template must not share GUIDs or dates.
+    name = match.group(2)
+    value = guid() if name.endswith("GUID") else repr(juliandate(datetime.now()))
+    return f"{match.group(1)}{value}\n"
+
+
+_Job = tuple[ColumnarBundle, str, int, str, int | None]
+
+
+def _encode_part(job: _Job) -> bytes:
+    """Process-pool worker: encode one chunk starting at its reserved handle."""
+
+    part, owner, first_handle, encoding, precision = job
+    encoder = EntityEncoder(owner, first_handle, precision)
+    return "".join(encoder.encode_columns(part)).encode(encoding, errors="dxfreplace")
+
+
+class StreamingDxfWriter:
+    """Write a DXF file incrementally with the :class:`~app.cad.writer.DxfWriter` surface.
+
+    Layers must be declared up front because the LAYER table is written before
+    any entity. Entities on undeclared layers are still written and readers
+    create those layers on load. R12 is not supported: it has no LWPOLYLINE
+    entity and no subclass markers (see :class:`~app.cad.r12.R12Writer`).
+    ``precision`` rounds every real value to that many decimal places.
+
+    ``target`` is a path or a binary stream. Header values cannot be patched
+    in place in a stream (stdout, a pipe, a socket) or in a ``.gz`` file. If
+    the only thing added is one bundle, it is held by reference (not copied,
+    so it must not change before :meth:`close`), and closing writes the
+    complete header followed by the encoded entities, chunk by chunk, with no
+    temporary file. Any other use spools the encoded entities to a temporary
+    file as they arrive, so memory stays bounded, and :meth:`close` copies it
+    after the header. A stream passed in is flushed but left open.
+    """
+
+    def __init__(
+        self,
+        target: Target,
+        *,
+        version: str = DXF_VERSION,
+        layers: Iterable[LayerSpec | str] = DEFAULT_LAYERS,
+        buffer_size: int = 1 << 20,
+        workers: int = 1,
+        chunk_size: int = 50_000,
+        precision: int | None = None,
+    ) -> None:
+        template = _template(version, layer_key(layers))
+        self.encoding = template.encoding
+        self.entity_count = 0
+        self.extents = Extents()
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self._pool: ProcessPoolExecutor | None = None
+
+        self._suffix = template.suffix
+        self._prefix = prefix = _STAMP_RE.sub(_fresh_stamp, template.prefix, count=len(_STAMP_VARS))
+        encoded = prefix.encode(self.encoding)
+        self._slots: dict[str, int] = {}
+        for key, slot in _SLOTS.items():
+            offset = encoded.find(slot.encode(self.encoding))
+            if offset < 0:  # pragma: no cover - template always carries these variables
+                raise RuntimeError(f"DXF template is missing the ${key} header variable.")
+            self._slots[key] = offset
+        self._encoder = EntityEncoder(template.owner, template.first_handle, precision)
+
+        # Final target when the header cannot be patched in place. A bundle
+        # added first is held until :meth:`close`, which writes the final
+        # header and then the entities straight to the sink; incremental
+        # adds fall back to spooling the entities to a temporary file.
+        self._sink: BinaryIO | None = None
+        self._held: ColumnarBundle | None = None
+        self._spool: BinaryIO | None = None
+        self._buffer_size = buffer_size
+        self._owns_stream = True
+        self._fh: io.TextIOWrapper | None = None
+        self.path: Path | None
+        if isinstance(target, str | Path):
+            self.path = Path(target)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if not is_gzip_path(self.path):
+                self._fh = open(  # noqa: SIM115 - closed by close()
+                    self.path,
+                    "w",
+                    encoding=self.encoding,
+                    errors="dxfreplace",
+                    newline="\n",
+                    buffering=buffer_size,
+                )
+                self._fh.write(prefix)
+                return
+            self._sink = open_binary(self.path)
+        else:
+            self.path = None
+            self._sink = target
+            self._owns_stream = False
+
+    def _stream(self) -> io.TextIOWrapper:
+        """Text layer the next entities are encoded into.
+
+        For a stream or ``.gz`` target this starts the spool: the header values
+        are only known on :meth:`close`, so a held bundle and everything after
+        it go to a temporary file first.
+        """
+
+        if self._fh is not None:
+            return self._fh
+        if self._sink is None:
+            raise RuntimeError("StreamingDxfWriter is closed.")
+        spool = tempfile.TemporaryFile(buffering=self._buffer_size)  # noqa: SIM115 - see close()
+        self._spool = cast(BinaryIO, spool)
+        self._fh = text_writer(self._spool, self.encoding)
+        held, self._held = self._held, None
+        if held is not None:
+            self._encode_bundle(held)
+            self.extents.merge(columns_extents(held.columns))
+        return self._fh
+
+    def _write(self, tags: str) -> None:
+        if self._fh is None:
+            raise RuntimeError("StreamingDxfWriter is closed.")
+        if tags:
+            self._fh.write(tags)
+            self.entity_count += 1
+
+    def add_line(self, line: Line) -> None:
+        self._stream()
+        (x1, y1), (x2, y2), layer = line.as_dxf()
+        self._write(self._encoder.line(x1, y1, x2, y2, layer))
+
+    def add_circle(self, circle: Circle) -> None:
+        self._stream()
+        (cx, cy), radius, layer = circle.as_dxf()
+        self._write(self._encoder.circle(cx, cy, radius, layer))
+
+    def add_rect(self, rect: Rect) -> None:
+        self._stream()
+        points, layer = rect.as_polyline()
+        self._write(self._encoder.lwpolyline(points, True, layer))
+
+    def add_polyline(self, polyline: Polyline) -> None:
+        self._stream()
+        points, closed, layer = polyline.as_dxf()
+        self._write(self._encoder.lwpolyline(points, closed, layer))
+
+    def add_arc(self, arc: Arc) -> None:
+        self._stream()
+        (cx, cy), radius, start, end, layer = arc.as_dxf()
+        self._write(self._encoder.arc(cx, cy, radius, start, end, layer))
+
+    def add_ellipse(self, ellipse: Ellipse) -> None:
+        self._stream()
+        (cx, cy), rx, ry, rotation, layer = ellipse.as_dxf()
+        self._write(self._encoder.ellipse(cx, cy, rx, ry, rotation, layer))
+
+    def add_text(self, text: Text) -> None:
+        self._stream()
+        content, (x, y), height, layer = text.as_dxf()
+        self._write(self._encoder.text(content, x, y, height, layer))
+
+    def add_many(self, entities: Iterable[BaseModel]) -> int:
+        """Add pydantic entities of any type; returns how many were passed."""
+
+        dispatch: dict[type[BaseModel], Callable[[Any], None]] = {
+            Line: self.add_line,
+            Circle: self.add_circle,
+            Rect: self.add_rect,
+            Polyline: self.add_polyline,
+            Arc: self.add_arc,
+            Ellipse: self.add_ellipse,
+            Text: self.add_text,
+        }
+        count = 0
+        for entity in entities:
+            add = dispatch.get(type(entity))
+            if add is None:
+                raise TypeError(f"Unsupported entity type: {type(entity).__name__}")
+            add(entity)
+            count += 1
+        return count
+
+    # Bulk methods stage into a ColumnarBundle and encode it in one pass.
+    def add_lines(self, starts: ArrayLike, ends: ArrayLike, layer: LayerArg = DEFAULT_LAYER) -> int:
+        staged = ColumnarBundle()
+        staged.add_lines(starts, ends, layer)
+        return self._add_staged(staged)
+
+    def add_circles(
+        self, centers: ArrayLike, radii: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> int:
+        staged = ColumnarBundle()
+        staged.add_circles(centers, radii, layer)
+        return self._add_staged(staged)
+
+    def add_rects(
+        self, origins: ArrayLike, sizes: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> int:
+        staged = ColumnarBundle()
+        staged.add_rects(origins, sizes, layer)
+        return self._add_staged(staged)
+
+    def add_polylines(
+        self,
+        offsets: ArrayLike,
+        vertices: ArrayLike,
+        closed: ArrayLike = False,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        staged = ColumnarBundle()
+        staged.add_polylines(offsets, vertices, closed, layer)
+        return self._add_staged(staged)
+
+    def add_arcs(
+        self,
+        centers: ArrayLike,
+        radii: ArrayLike,
+        start_angles: ArrayLike,
+        end_angles: ArrayLike,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        staged = ColumnarBundle()
+        staged.add_arcs(centers, radii, start_angles, end_angles, layer)
+        return self._add_staged(staged)
+
+    def add_ellipses(
+        self,
+        centers: ArrayLike,
+        rx: ArrayLike,
+        ry: ArrayLike,
+        rotations: ArrayLike = 0.0,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        staged = ColumnarBundle()
+        staged.add_ellipses(centers, rx, ry, rotations, layer)
+        return self._add_staged(staged)
+
+    def add_texts(
+        self,
+        strings: Sequence[str],
+        positions: ArrayLike,
+        heights: ArrayLike,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        staged = ColumnarBundle()
+        staged.add_texts(strings, positions, heights, layer)
+        return self._add_staged(staged)
+
+    def _add_staged(self, staged: ColumnarBundle) -> int:
+        self.add_bundle(staged)
+        return len(staged)
+
+    def add_bundle(self, bundle: DrawingBundle | ColumnarBundle) -> None:
+        """Write every staged entity; columnar bundles are encoded from their rows."""
+
+        if self._fh is None and self._sink is not None and self._held is None:
+            # Header values can be derived from the bundle on close: no spool.
+            if not isinstance(bundle, ColumnarBundle):
+                bundle = ColumnarBundle.from_bundle(bundle)
+            self._held = bundle
+            return
+        self._stream()
+        if not isinstance(bundle, ColumnarBundle):
+            for kind in WRITE_ORDER:
+                self.add_many(getattr(bundle, kind))
+            return
+        self._encode_bundle(bundle)
+        self.extents.merge(columns_extents(bundle.columns))
+
+    def _encode_bundle(self, bundle: ColumnarBundle) -> None:
+        assert self._fh is not None
+        encoder = self._encoder
+        first = encoder.next_handle
+        if self.workers > 1 and len(bundle) > self.chunk_size:
+            self._write_parallel(bundle)
+        else:
+            for chunk in encoder.encode_columns(bundle):
+                self._fh.write(chunk)
+        self.entity_count += encoder.next_handle - first
+
+    def _parts(self, bundle: ColumnarBundle) -> Iterator[_Job]:
+        """Split ``bundle`` into encoding jobs, reserving each chunk's handle range."""
+
+        encoder = self._encoder
+        owner = encoder.owner
+        for kind in WRITE_ORDER:
+            total = len(getattr(bundle.columns, kind))
+            for start in range(0, total, self.chunk_size):
+                part = bundle.slice_kind(kind, start, min(start + self.chunk_size, total))
+                first = encoder.next_handle
+                encoder.next_handle += emitted_count(part)
+                yield part, owner, first, self.encoding, encoder.precision
+
+    def _write_parallel(self, bundle: ColumnarBundle) -> None:
+        assert self._fh is not None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._fh.flush()
+        raw = self._fh.buffer
+        # Bound the chunks in flight so memory stays proportional to the worker count.
+        pending: deque[Future[bytes]] = deque()
+        for job in self._parts(bundle):
+            pending.append(self._pool.submit(_encode_part, job))
+            if len(pending) >= 2 * self.workers:
+                raw.write(pending.popleft().result())
+        while pending:
+            raw.write(pending.popleft().result())
+
+    @property
+    def closed(self) -> bool:
+        return self._fh is None and self._sink is None
+
+    def close(self) -> Path | None:
+        """Finish the output; returns the resolved path, or ``None`` for a stream.
+
+        A file is patched in place with the handle seed and extents. A stream
+        or ``.gz`` target gets the header with its final values first, then the
+        held bundle or the spooled entities.
+        """
+
+        if self.closed:
+            return self._resolved()
+        if self._fh is None:
+            self._write_held()
+            return self._resolved()
+        assert self._fh is not None
+        self._shutdown_pool()
+        self.extents.merge(self._encoder.extents)
+        values = self._header_values(self._encoder.next_handle)
+        if self._sink is not None:
+            self._write_spooled(values)
+            return self._resolved()
+        self._fh.write(self._suffix)
+        self._fh.close()
+        self._fh = None
+        assert self.path is not None
+        with self.path.open("r+b") as fh:
+            for key, offset in self._slots.items():
+                fh.seek(offset)
+                fh.write(values[key].encode("ascii"))
+        return self._resolved()
+
+    def _final_prefix(self, values: dict[str, str]) -> str:
+        prefix = self._prefix
+        for key, value in values.items():
+            prefix = prefix.replace(_SLOTS[key], value, 1)
+        return prefix
+
+    def _write_held(self) -> None:
+        """Write the header, then encode the held bundle straight into the sink."""
+
+        assert self._sink is not None
+        held, self._held = self._held, None
+        handseed = self._encoder.next_handle
+        if held is not None:
+            handseed += emitted_count(held)
+            self.extents.merge(columns_extents(held.columns))
+        out = self._fh = text_writer(self._sink, self.encoding)
+        try:
+            out.write(self._final_prefix(self._header_values(handseed)))
+            if held is not None:
+                self._encode_bundle(held)
+            out.write(self._suffix)
+            out.flush()
+        finally:
+            self._shutdown_pool()
+            self._fh = None
+            out.detach()
+            self._release()
+
+    def _write_spooled(self, values: dict[str, str]) -> None:
+        assert self._fh is not None and self._spool is not None and self._sink is not None
+        spool, sink = self._spool, self._sink
+        try:
+            self._fh.flush()
+            spool.seek(0)
+            sink.write(self._final_prefix(values).encode(self.encoding, errors="dxfreplace"))
+            shutil.copyfileobj(spool, sink, self._buffer_size)
+            sink.write(self._suffix.encode(self.encoding, errors="dxfreplace"))
+        finally:
+            self._release()
+
+    def _header_values(self, handseed: int) -> dict[str, str]:
+        extents = self.extents
+        values = {"HANDSEED": f"{handseed:0{_HANDLE_WIDTH}X}"}
+        if extents.empty:
+            low, high = (1e20, 1e20, 1e20), (-1e20, -1e20, -1e20)
+        else:
+            low, high = (extents.xmin, extents.ymin, 0.0), (extents.xmax, extents.ymax, 0.0)
+        for name, point in (("EXTMIN", low), ("EXTMAX", high)):
+            for axis, value in zip("XYZ", point, strict=True):
+                values[f"{name}{axis}"] = _fixed_float(value)
+        return values
+
+    def _release(self) -> None:
+        """Close the file or spool; a stream passed in is flushed and stays open."""
+
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = self._spool = None
+        if self._sink is not None:
+            if self._owns_stream:
+                self._sink.close()
+            else:
+                self._sink.flush()
+            self._sink = None
+
+    def _resolved(self) -> Path | None:
+        return None if self.path is None else self.path.resolve()
+
+    def _shutdown_pool(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def save(self, path: str | Path | None = None) -> Path | None:
+        """Alias of :meth:`close` for callers written against ``DxfWriter``."""
+
+        if path is not None and (self.path is None or Path(path).resolve() != self.path.resolve()):
+            raise ValueError("StreamingDxfWriter writes to the target given at construction.")
+        return self.close()
+
+    def abort(self) -> None:
+        """Stop writing and delete a partially written file.
+
+        Nothing spooled is written; a caller's stream may already hold output
+        from a failed :meth:`close`.
+        """
+
+        self._shutdown_pool()
+        self._held = None
+        self._release()
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> StreamingDxfWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+__all__ = ["StreamingDxfWriter"]
@@ -0,0 +1,72 @@
+"""Cached template documents for the DXF writers.
+
+``ezdxf.new`` builds every default table, text style and linetype from scratch
+on each call. The first request for a ``(version, layers)`` pair builds that
+document once and keeps it pickled. :func:`new_document` then returns an
+independent copy with a fresh fingerprint GUID and creation date.
+"""
+
+from __future__ import annotations
+
+import pickle
+from collections.abc import Callable, Iterable
+from datetime import datetime
+from functools import lru_cache
+
+import ezdxf
+from ezdxf.document import Drawing
+from ezdxf.tools import juliandate
+
+from .layers import LayerSpec, ensure_layers
+
+LayerKey = tuple[LayerSpec, ...]
+
+# ``cache_clear`` callbacks of caches derived from the templates (see ``streaming``).
+_DERIVED_CACHES: list[Callable[[], None]] = []
+
+
+def layer_key(layers: Iterable[LayerSpec | str]) -> LayerKey:
+    """Hashable, order-preserving form of a layer list."""
+
+    return tuple(LayerSpec(layer) if isinstance(layer, str) else layer for layer in layers)
+
+
+@lru_cache(maxsize=32)
+def _document_blob(version: str, layers: LayerKey) -> bytes:
+    doc = ezdxf.new(version)
+    ensure_layers(doc, layers)
+    return pickle.dumps(doc, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def new_document(version: str, layers: Iterable[LayerSpec | str]) -> Drawing:
+    """Return a new document for ``version`` with ``layers`` already added."""
+
+    blob = _document_blob(version, layer_key(layers))
+    # The blob is produced in this process, so nothing external is unpickled.
+    doc: Drawing = pickle.loads(blob)
+    doc.reset_fingerprint_guid()
+    doc.header["$TDCREATE"] = juliandate(datetime.now())
+    return doc
+
+
+def clear_template_cache() -> None:
+    """Drop every cached template (e.g. after changing ``ezdxf.options``)."""
+
+    _document_blob.cache_clear()
+    for clear in _DERIVED_CACHES:
+        clear()
+
+
+def register_derived_cache(clear: Callable[[], None]) -> None:
+    """Have :func:`clear_template_cache` also call ``clear``."""
+
+    _DERIVED_CACHES.append(clear)
+
+
+__all__ = [
+    "LayerKey",
+    "clear_template_cache",
+    "layer_key",
+    "new_document",
+    "register_derived_cache",
+]
@@ -2,18 +2,54 @@
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import replace
 from decimal import Decimal
-from math import cos, pi, radians, sin
+from itertools import repeat
+from math import pi
 from pathlib import Path
-from typing import Any, cast
+from typing import Any, BinaryIO
 
-import ezdxf
+import numpy as np
+from ezdxf.entities import Arc as DxfArc
+from ezdxf.entities import Circle as DxfCircle
+from ezdxf.entities import DXFGraphic
+from ezdxf.entities import Ellipse as DxfEllipse
+from ezdxf.entities import Insert as DxfInsert
+from ezdxf.entities import Line as DxfLine
+from ezdxf.entities import LWPolyline as DxfLWPolyline
+from ezdxf.entities import Text as DxfText
+from ezdxf.math import Vec3
+from numpy.typing import ArrayLike
+from pydantic import BaseModel
 
+from .columnar import (
+    ColumnarBundle,
+    LayerArg,
+    PolylineTable,
+    RowTable,
+    as_column,
+    as_points,
+)
+from .dxf_encode import (
+    WRITE_ORDER,
+    Extents,
+    arc_bounds,
+    arc_box,
+    columns_extents,
+    ellipse_axes,
+    ellipse_bounds,
+    ellipse_box,
+    rounder,
+)
+from .instancing import DEFAULT_TOLERANCE, InstancePlan, plan_instances
+from .layers import DEFAULT_LAYERS, LayerSpec
 from .models import (
     DEFAULT_LAYER,
     Arc,
     Circle,
+    DrawingBundle,
     Ellipse,
     Line,
     Point,
@@ -21,72 +57,493 @@ from .models import (
     Rect,
     Text,
 )
+from .sinks import open_binary, text_writer
+from .template import new_document
 
 DXF_VERSION = "R2018"
 
 
+def _layer_names(layer: LayerArg, count: int) -> Iterable[str]:
+    if isinstance(layer, str):
+        return repeat(layer, count)
+    if len(layer) != count:
+        raise ValueError(f"Expected one layer name or {count}, got {len(layer)}.")
+    return layer
+
+
 class DxfWriter:
-    """Incrementally build a DXF document."""
+    """Incrementally build a DXF document.
 
-    def __init__(self) -> None:
-        self.doc = ezdxf.new(DXF_VERSION)
+    Entities are created directly from their classes and linked into model
+    space, skipping the per-call ``dxfattribs`` copy and validation done by
+    ``msp.add_*``; the values written here are already validated floats. The
+    bulk methods (``add_circles`` ...) accept sequences or NumPy arrays, and a
+    single layer name or one name per entity. With ``precision`` every real
+    value is rounded to that many decimal places as it is added.
+
+    :attr:`extents` grows with every model-space entity, vectorised for the
+    bulk methods, and is written to ``$EXTMIN``/``$EXTMAX`` on output.
+    """
+
+    def __init__(
+        self,
+        *,
+        version: str = DXF_VERSION,
+        layers: Iterable[LayerSpec | str] = DEFAULT_LAYERS,
+        precision: int | None = None,
+    ) -> None:
+        self.doc = new_document(version, layers)
+        self.precision = precision
+        self._round = rounder(precision)
         self.msp = self.doc.modelspace()
-        self._ensure_layers([DEFAULT_LAYER])
+        block_record = self.msp.block_record
+        self._db = self.doc.entitydb
+        self._space = block_record.entity_space
+        self._owner = block_record.dxf.handle
+        self._block_serial = 0
+        self.extents = Extents()
+        self._block_extents: dict[str, Extents] = {}
+
+    @contextmanager
+    def _into_block(self, name: str) -> Iterator[None]:
+        """Send the fast builders into a new block ``name`` instead of model space.
+
+        The block's own extents are kept for placing its INSERTs.
+        """
+
+        record = self.doc.blocks.new(name, base_point=(0, 0)).block_record
+        saved = self._space, self._owner, self.extents
+        self._space, self._owner = record.entity_space, record.dxf.handle
+        self.extents = self._block_extents[name] = Extents()
+        try:
+            yield
+        finally:
+            self._space, self._owner, self.extents = saved
+
+    def _link(self, entity: DXFGraphic, layer: str) -> Callable[[str, Any], None]:
+        """Bind ``entity`` to the document and model space; returns its attribute setter."""
+
+        entity.doc = self.doc
+        # ``unprotected_set`` skips the per-attribute validation of ``dxf.set``;
+        # the values written through it are already validated.
+        set_attrib = entity.dxf.unprotected_set
+        set_attrib("layer", layer)
+        set_attrib("owner", self._owner)
+        self._db.add(entity)
+        self._space.add(entity)
+        return set_attrib
+
+    def _line(self, x1: float, y1: float, x2: float, y2: float, layer: str) -> None:
+        r = self._round
+        set_attrib = self._link(DxfLine(), layer)
+        set_attrib("start", Vec3(r(x1), r(y1), 0.0))
+        set_attrib("end", Vec3(r(x2), r(y2), 0.0))
+
+    def _circle(self, cx: float, cy: float, r: float, layer: str) -> None:
+        rnd = self._round
+        set_attrib = self._link(DxfCircle(), layer)
+        set_attrib("center", Vec3(rnd(cx), rnd(cy), 0.0))
+        set_attrib("radius", rnd(r))
+
+    def _arc(self, cx: float, cy: float, r: float, start: float, end: float, layer: str) -> None:
+        rnd = self._round
+        set_attrib = self._link(DxfArc(), layer)
+        set_attrib("center", Vec3(rnd(cx), rnd(cy), 0.0))
+        set_attrib("radius", rnd(r))
+        set_attrib("start_angle", rnd(start))
+        set_attrib("end_angle", rnd(end))
+
+    def _ellipse(
+        self, cx: float, cy: float, rx: float, ry: float, rotation: float, layer: str
+    ) -> None:
+        if rx == 0:
+            return
+        r = self._round
+        mx, my, ratio = ellipse_axes(rx, ry, rotation)
+        set_attrib = self._link(DxfEllipse(), layer)
+        set_attrib("center", Vec3(r(cx), r(cy), 0.0))
+        set_attrib("major_axis", Vec3(r(mx), r(my), 0.0))
+        set_attrib("ratio", r(ratio))
+        set_attrib("start_param", 0.0)
+        set_attrib("end_param", 2 * pi)
+
+    def _text(self, content: str, x: float, y: float, height: float, layer: str) -> None:
+        r = self._round
+        set_attrib = self._link(DxfText(), layer)
+        set_attrib("text", content)
+        set_attrib("insert", Vec3(r(x), r(y), 0.0))
+        set_attrib("height", r(height))
+
+    def _lwpolyline(self, points: Iterable[Sequence[float]], closed: bool, layer: str) -> None:
+        if self.precision is not None:
+            r = self._round
+            points = [(r(x), r(y)) for x, y in points]
+        entity = DxfLWPolyline()
+        self._link(entity, layer)
+        entity.set_points(points, format="xy")
+        if closed:
+            entity.closed = True
 
-    def _ensure_layers(self, layers: Iterable[str]) -> None:
-        for layer in layers:
-            if layer not in self.doc.layers:
-                self.doc.layers.add(layer)
+    def _insert(self, name: str, x: float, y: float, rotation: float, layer: str) -> None:
+        r = self._round
+        set_attrib = self._link(DxfInsert(), layer)
+        set_attrib("name", name)
+        set_attrib("insert", Vec3(r(x), r(y), 0.0))
+        if rotation:
+            set_attrib("rotation", r(rotation))
 
+    def _grow_points(self, points: Sequence[Sequence[float]]) -> None:
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.extents.add(min(xs), min(ys), max(xs), max(ys))
+
+    # -- single entities -------------------------------------------------------------
     def add_line(self, line: Line) -> None:
-        start, end, layer = line.as_dxf()
-        self.msp.add_line(start, end, dxfattribs={"layer": layer})
+        (x1, y1), (x2, y2), layer = line.as_dxf()
+        self._line(x1, y1, x2, y2, layer)
+        self.extents.add(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
 
     def add_circle(self, circle: Circle) -> None:
-        center, radius, layer = circle.as_dxf()
-        self.msp.add_circle(center, radius, dxfattribs={"layer": layer})
+        (cx, cy), radius, layer = circle.as_dxf()
+        self._circle(cx, cy, radius, layer)
+        self.extents.add(cx - radius, cy - radius, cx + radius, cy + radius)
 
     def add_rect(self, rect: Rect) -> None:
         points, layer = rect.as_polyline()
-        self.msp.add_lwpolyline(points, close=True, dxfattribs={"layer": layer})
+        self._lwpolyline(points, True, layer)
+        self._grow_points(points)
 
     def add_polyline(self, polyline: Polyline) -> None:
         points, closed, layer = polyline.as_dxf()
         if not points:
             return
-        self.msp.add_lwpolyline(points, close=closed, dxfattribs={"layer": layer})
+        self._lwpolyline(points, closed, layer)
+        self._grow_points(points)
 
     def add_arc(self, arc: Arc) -> None:
-        center, radius, start, end, layer = arc.as_dxf()
-        self.msp.add_arc(center, radius, start, end, dxfattribs={"layer": layer})
+        (cx, cy), radius, start, end, layer = arc.as_dxf()
+        self._arc(cx, cy, radius, start, end, layer)
+        self.extents.add(*arc_box(cx, cy, radius, start, end))
 
     def add_ellipse(self, ellipse: Ellipse) -> None:
-        center, rx, ry, rotation, layer = ellipse.as_dxf()
-        if rx == 0:
-            return
-        ratio = ry / rx
-        angle = radians(rotation)
-        major_axis = (rx * cos(angle), rx * sin(angle))
-        self.msp.add_ellipse(
-            center=center,
-            major_axis=major_axis,
-            ratio=ratio,
-            start_param=0.0,
-            end_param=2 * pi,
-            dxfattribs={"layer": layer},
-        )
+        (cx, cy), rx, ry, rotation, layer = ellipse.as_dxf()
+        self._ellipse(cx, cy, rx, ry, rotation, layer)
+        if rx:
+            self.extents.add(*ellipse_box(cx, cy, rx, ry, rotation))
 
     def add_text(self, text: Text) -> None:
-        content, position, height, layer = text.as_dxf()
-        entity = cast(
-            Any, self.msp.add_text(content, dxfattribs={"layer": layer, "height": height})
+        content, (x, y), height, layer = text.as_dxf()
+        self._text(content, x, y, height, layer)
+        self.extents.add(x, y, x, y + height)
+
+    def add_many(self, entities: Iterable[BaseModel]) -> int:
+        """Add pydantic entities of any type; returns how many were passed."""
+
+        dispatch: dict[type[BaseModel], Callable[[Any], None]] = {
+            Line: self.add_line,
+            Circle: self.add_circle,
+            Rect: self.add_rect,
+            Polyline: self.add_polyline,
+            Arc: self.add_arc,
+            Ellipse: self.add_ellipse,
+            Text: self.add_text,
+        }
+        count = 0
+        for entity in entities:
+            add = dispatch.get(type(entity))
+            if add is None:
+                raise TypeError(f"Unsupported entity type: {type(entity).__name__}")
+            add(entity)
+            count += 1
+        return count
+
+    # -- bulk entities ---------------------------------------------------------------
+    def add_lines(self, starts: ArrayLike, ends: ArrayLike, layer: LayerArg = DEFAULT_LAYER) -> int:
+        a, b = as_points(starts), as_points(ends)
+        self.extents.add_arrays(*np.minimum(a, b).T, *np.maximum(a, b).T)
+        first, second = a.tolist(), b.tolist()
+        names = _layer_names(layer, len(first))
+        for (x1, y1), (x2, y2), name in zip(first, second, names, strict=True):
+            self._line(x1, y1, x2, y2, name)
+        return len(first)
+
+    def add_circles(
+        self, centers: ArrayLike, radii: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> int:
+        centre = as_points(centers)
+        radius = as_column(radii, len(centre))
+        self.extents.add_arrays(*(centre - radius[:, None]).T, *(centre + radius[:, None]).T)
+        xy, radii_list = centre.tolist(), radius.tolist()
+        for (cx, cy), r, name in zip(xy, radii_list, _layer_names(layer, len(xy)), strict=True):
+            self._circle(cx, cy, r, name)
+        return len(xy)
+
+    def add_rects(
+        self, origins: ArrayLike, sizes: ArrayLike, layer: LayerArg = DEFAULT_LAYER
+    ) -> int:
+        origin, size = as_points(origins), as_points(sizes)
+        self.extents.add_arrays(
+            *np.minimum(origin, origin + size).T, *np.maximum(origin, origin + size).T
+        )
+        xy, wh = origin.tolist(), size.tolist()
+        for (ox, oy), (w, h), name in zip(xy, wh, _layer_names(layer, len(xy)), strict=True):
+            corners = ((ox, oy), (ox + w, oy), (ox + w, oy + h), (ox, oy + h), (ox, oy))
+            self._lwpolyline(corners, True, name)
+        return len(xy)
+
+    def add_polylines(
+        self,
+        offsets: ArrayLike,
+        vertices: ArrayLike,
+        closed: ArrayLike = False,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        """Add polylines given CSR ``offsets`` (length ``n + 1``) into ``vertices``."""
+
+        index = np.asarray(offsets, dtype=np.int64).tolist()
+        count = max(0, len(index) - 1)
+        vertex_array = as_points(vertices)
+        if count:
+            used = vertex_array[index[0] : index[-1]]
+            self.extents.add_arrays(*used.T, *used.T)
+        points = vertex_array.tolist()
+        flags = np.broadcast_to(np.asarray(closed, dtype=bool), (count,)).tolist()
+        names = _layer_names(layer, count)
+        for i, (flag, name) in enumerate(zip(flags, names, strict=True)):
+            start, stop = index[i], index[i + 1]
+            if start != stop:
+                self._lwpolyline(points[start:stop], flag, name)
+        return count
+
+    def add_arcs(
+        self,
+        centers: ArrayLike,
+        radii: ArrayLike,
+        start_angles: ArrayLike,
+        end_angles: ArrayLike,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        centre = as_points(centers)
+        n = len(centre)
+        r = as_column(radii, n)
+        start, end = as_column(start_angles, n), as_column(end_angles, n)
+        if n:
+            self.extents.add_arrays(*arc_bounds(centre[:, 0], centre[:, 1], r, start, end))
+        rows = zip(
+            centre.tolist(),
+            r.tolist(),
+            start.tolist(),
+            end.tolist(),
+            _layer_names(layer, n),
+            strict=True,
+        )
+        for (cx, cy), r, start, end, name in rows:
+            self._arc(cx, cy, r, start, end, name)
+        return n
+
+    def add_ellipses(
+        self,
+        centers: ArrayLike,
+        rx: ArrayLike,
+        ry: ArrayLike,
+        rotations: ArrayLike = 0.0,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        centre = as_points(centers)
+        n = len(centre)
+        major, minor, turn = as_column(rx, n), as_column(ry, n), as_column(rotations, n)
+        drawn = major != 0
+        self.extents.add_arrays(
+            *ellipse_bounds(
+                centre[drawn, 0], centre[drawn, 1], major[drawn], minor[drawn], turn[drawn]
+            )
         )
-        entity.set_pos(position)
+        rows = zip(
+            centre.tolist(),
+            major.tolist(),
+            minor.tolist(),
+            turn.tolist(),
+            _layer_names(layer, n),
+            strict=True,
+        )
+        for (cx, cy), major, minor, rotation, name in rows:
+            self._ellipse(cx, cy, major, minor, rotation, name)
+        return n
+
+    def add_texts(
+        self,
+        strings: Sequence[str],
+        positions: ArrayLike,
+        heights: ArrayLike,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        position = as_points(positions)
+        n = len(position)
+        height_array = as_column(heights, n)
+        xs, ys = position[:, 0], position[:, 1]
+        self.extents.add_arrays(xs, ys, xs, ys + height_array)
+        xy, heights_list = position.tolist(), height_array.tolist()
+        for content, (x, y), height, name in zip(
+            strings, xy, heights_list, _layer_names(layer, n), strict=True
+        ):
+            self._text(content, x, y, height, name)
+        return n
+
+    def add_bundle(self, bundle: DrawingBundle | ColumnarBundle) -> None:
+        """Write every staged entity; columnar bundles go through the bulk methods."""
+
+        if isinstance(bundle, ColumnarBundle):
+            self._add_columns(bundle)
+            return
+        for kind in WRITE_ORDER:
+            self.add_many(getattr(bundle, kind))
+
+    def _add_columns(self, bundle: ColumnarBundle) -> None:
+        names = list(bundle.layers)
+        cols = bundle.columns
+
+        def layers(table: RowTable | PolylineTable) -> list[str]:
+            return [names[lid] for lid in table.layer_ids]
+
+        lines = cols.lines.rows
+        self.add_lines(lines[:, :2], lines[:, 2:], layers(cols.lines))
+        circles = cols.circles.rows
+        self.add_circles(circles[:, :2], circles[:, 2], layers(cols.circles))
+        rects = cols.rects.rows
+        self.add_rects(rects[:, :2], rects[:, 2:], layers(cols.rects))
+        polys = cols.polylines
+        self.add_polylines(
+            polys.offsets_array, polys.vertex_array, polys.closed_array, layers(polys)
+        )
+        arcs = cols.arcs.rows
+        self.add_arcs(arcs[:, :2], arcs[:, 2], arcs[:, 3], arcs[:, 4], layers(cols.arcs))
+        ellipses = cols.ellipses.rows
+        self.add_ellipses(
+            ellipses[:, :2],
+            ellipses[:, 2],
+            ellipses[:, 3],
+            ellipses[:, 4],
+            layers(cols.ellipses),
+        )
+        texts = cols.texts
+        rows = texts.rows
+        self.add_texts(texts.strings, rows[:, :2], rows[:, 2], layers(texts))
+
+    # -- blocks ----------------------------------------------------------------------
+    def define_block(
+        self, geometry: DrawingBundle | ColumnarBundle, name: str | None = None
+    ) -> str:
+        """Define a block holding ``geometry`` around base point ``(0, 0)``; returns its name.
+
+        Without ``name`` the next free ``INST<n>`` name is used.
+        """
+
+        if name is None:
+            name = f"INST{self._block_serial}"
+            while name in self.doc.blocks:
+                self._block_serial += 1
+                name = f"INST{self._block_serial}"
+        with self._into_block(name):
+            self.add_bundle(geometry)
+        return name
+
+    def add_inserts(
+        self,
+        name: str,
+        positions: ArrayLike,
+        rotations: ArrayLike = 0.0,
+        layer: LayerArg = DEFAULT_LAYER,
+    ) -> int:
+        """Insert block ``name`` at each position, turned by ``rotations`` degrees."""
+
+        position = as_points(positions)
+        turn = as_column(rotations, len(position))
+        block = self._block_extents.get(name)
+        if block is not None and not block.empty and len(position):
+            # Bounds of the block's box turned by each rotation.
+            corners = np.array(
+                [
+                    (block.xmin, block.ymin),
+                    (block.xmax, block.ymin),
+                    (block.xmax, block.ymax),
+                    (block.xmin, block.ymax),
+                ]
+            )
+            angle = np.radians(turn)[:, None]
+            c, s = np.cos(angle), np.sin(angle)
+            xs = position[:, :1] + c * corners[:, 0] - s * corners[:, 1]
+            ys = position[:, 1:] + s * corners[:, 0] + c * corners[:, 1]
+            self.extents.add_arrays(xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1))
+        xy, turns = position.tolist(), turn.tolist()
+        for (x, y), rotation, layer_name in zip(
+            xy, turns, _layer_names(layer, len(xy)), strict=True
+        ):
+            self._insert(name, x, y, rotation, layer_name)
+        return len(xy)
+
+    def add_instanced(
+        self,
+        bundle: DrawingBundle | ColumnarBundle,
+        *,
+        rotation: bool = False,
+        min_count: int = 2,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> InstancePlan:
+        """Write ``bundle`` with repeated groups defined once as blocks and inserted.
+
+        See :mod:`app.cad.instancing` for how groups are found. Entities that
+        are not instanced are written first, then the INSERTs.
+        """
+
+        if not isinstance(bundle, ColumnarBundle):
+            bundle = ColumnarBundle.from_bundle(bundle)
+        # Turned block boxes overestimate; the source geometry gives exact bounds.
+        extents = replace(self.extents)
+        extents.merge(columns_extents(bundle.columns))
+        plan = plan_instances(bundle, rotation=rotation, min_count=min_count, tolerance=tolerance)
+        self.add_bundle(plan.remainder)
+        for block in plan.blocks:
+            name = self.define_block(block.geometry)
+            self.add_inserts(name, block.positions, block.rotations, block.layer)
+        self.extents = extents
+        return plan
+
+    def write(self, stream: BinaryIO, *, fmt: str = "asc") -> None:
+        """Serialise into a binary ``stream`` (stdout, a socket, ...); it stays open.
+
+        ``ezdxf`` emits tags as it goes, so the serialised document is never
+        held in memory.
+        """
+
+        self._write_extents()
+        if fmt == "bin":
+            self.doc.write(stream, fmt="bin")
+            stream.flush()
+            return
+        text = text_writer(stream, self.doc.output_encoding)
+        self.doc.write(text, fmt=fmt)
+        text.flush()
+        text.detach()
+
+    def _write_extents(self) -> None:
+        extents = self.extents
+        if extents.empty:
+            return
+        low, high = (extents.xmin, extents.ymin, 0.0), (extents.xmax, extents.ymax, 0.0)
+        # ``ezdxf`` copies the model-space layout extents into the header on
+        # export, except a corner at the origin, which it reads as unset.
+        self.msp.dxf.extmin, self.msp.dxf.extmax = low, high
+        self.doc.header["$EXTMIN"], self.doc.header["$EXTMAX"] = low, high
+
+    def save(self, path: str | Path, *, fmt: str = "asc") -> Path:
+        """Write the document as ASCII (``fmt="asc"``) or binary (``"bin"``) DXF.
+
+        A ``.gz`` suffix compresses the output while it is written.
+        """
 
-    def save(self, path: str | Path) -> Path:
         output_path = Path(path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        self.doc.saveas(output_path)
+        with open_binary(output_path) as fh:
+            self.write(fh, fmt=fmt)
         return output_path.resolve()
 
 
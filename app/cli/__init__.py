@@ -1,5 +1,5 @@
 """CLI utilities for the AI AutoCAD chatbot."""
 
-from .executor import execute_commands, load_commands
+from .executor import RunSummary, execute_commands, load_commands
 
-__all__ = ["execute_commands", "load_commands"]
+__all__ = ["RunSummary", "execute_commands", "load_commands"]
@@ -0,0 +1,58 @@
+"""Answer sheets for resolving clarification questions without a human.
+
+A sheet is a flat JSON or YAML mapping. Keys are either a question id, which
+answers one question, or a field name, which answers every question about that
+field::
+
+    {"answer.3.circle.radius": 12, "rect.width": 40, "text.text": "Kitchen"}
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any
+
+from app.dsl.clarify import FollowUpQuestion
+
+
+class AnswerSheet:
+    """Lookup of pre-supplied answers by question id, then by field."""
+
+    def __init__(self, answers: Mapping[str, Any] | None = None) -> None:
+        self.answers: dict[str, Any] = dict(answers or {})
+
+    def lookup(self, question: FollowUpQuestion) -> Any | None:
+        if question.id in self.answers:
+            return self.answers[question.id]
+        return self.answers.get(question.field)
+
+    def __len__(self) -> int:
+        return len(self.answers)
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> AnswerSheet:
+        """Load a JSON or YAML sheet; unreadable files raise ``OSError``, bad content ``ValueError``."""
+
+        source = Path(path)
+        text = source.read_text(encoding="utf8")
+        if source.suffix.lower() in {".yaml", ".yml"}:
+            try:
+                import yaml
+            except ImportError as exc:  # pragma: no cover - optional dependency
+                raise ValueError("PyYAML is required for YAML answer sheets.") from exc
+            try:
+                data = yaml.safe_load(text)
+            except yaml.YAMLError as exc:
+                raise ValueError(f"Answer sheet '{source}' is not valid YAML: {exc}") from exc
+        else:
+            data = json.loads(text)
+        if data is None:
+            data = {}
+        if not isinstance(data, Mapping):
+            raise ValueError(f"Answer sheet '{source}' must contain a mapping of answers.")
+        return cls({str(key): value for key, value in data.items()})
+
+
+__all__ = ["AnswerSheet"]
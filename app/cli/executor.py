@@ -3,26 +3,39 @@
 from __future__ import annotations
 
 import sys
-from collections.abc import Iterable, Sequence
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any, BinaryIO
 
 from dotenv import load_dotenv
 
-from app.cad.models import DrawingBundle
+from app.cad.columnar import ColumnarBundle
+from app.cad.dxf_encode import Extents, columns_extents
+from app.cad.joining import join_lines
+from app.cad.profiles import DEFAULT_PROFILE, OutputProfile, get_profile
+from app.cad.r12 import R12Writer
+from app.cad.simplify import SimplifyReport, simplify_polylines
+from app.cad.streaming import StreamingDxfWriter
 from app.cad.writer import DxfWriter
 from app.core.config import get_settings
-from app.core.conversion import program_to_bundle
+from app.core.conversion import program_to_columns
+from app.core.deadline import Deadline, earliest
 from app.core.nlp_rules import Program
 from app.core.nlp_rules import parse as legacy_parse
 from app.core.units import Unit
-from app.dsl.clarify import FollowUpQuestion, ReadyCommands, clarify
+from app.dsl.clarify import FollowUpQuestion, clarify_pass
+from app.dsl.commands import CommandType
 from app.dsl.compiler import CommandCompiler
 from app.dsl.errors import ParseError
 from app.dsl.llm_parser import LLMParser
-from app.dsl.llm_provider import configure_provider
+from app.dsl.llm_provider import PromptUsage, configure_provider
 from app.memory.session import SessionMemory
+from app.memory.store import MemoryStore, open_store
 
-_FOLLOWUP_DEFAULTS: dict[str, float] = {
+from .answers import AnswerSheet
+
+_FOLLOWUP_DEFAULTS: dict[str, float | str] = {
     "circle.radius": 10.0,
     "circle.center.x": 0.0,
     "circle.center.y": 0.0,
@@ -36,8 +49,49 @@ _FOLLOWUP_DEFAULTS: dict[str, float] = {
     "rect.corner.y": 0.0,
     "rect.center.x": 0.0,
     "rect.center.y": 0.0,
+    "arc.radius": 10.0,
+    "ellipse.rx": 25.0,
+    "ellipse.ry": 15.0,
+    "text.text": "Text",
+    "text.height": 5.0,
 }
 
+_INSTANCING_ERROR = "Block instancing is not available with streaming or minimal R12 output."
+
+
+@dataclass(frozen=True, slots=True)
+class RunSummary:
+    """Outcome of :func:`execute_commands`.
+
+    ``path`` is the resolved output file, or ``None`` for a stream;
+    ``extents`` are the drawing bounds written to ``$EXTMIN``/``$EXTMAX``.
+    ``simplify`` holds the vertex reduction when polylines were simplified and
+    ``prompt`` the largest prompt sent to the LLM provider, when it reports one.
+    """
+
+    path: Path | None
+    entities: int
+    extents: Extents
+    simplify: SimplifyReport | None = None
+    prompt: PromptUsage | None = None
+
+    def __str__(self) -> str:
+        count = f"{self.entities} {'entity' if self.entities == 1 else 'entities'}"
+        extents = self.extents
+        if extents.empty:
+            return f"{count}, no extents"
+        return (
+            f"{count}, extents ({extents.xmin:g}, {extents.ymin:g}) to "
+            f"({extents.xmax:g}, {extents.ymax:g})"
+        )
+
+
+def _largest_prompt(current: PromptUsage | None, parser: LLMParser) -> PromptUsage | None:
+    usage = parser.provider.last_usage
+    if usage is None or (current is not None and current.tokens >= usage.tokens):
+        return current
+    return usage
+
 
 def _program_has_entities(program: Program) -> bool:
     return bool(
@@ -51,23 +105,74 @@ def _program_has_entities(program: Program) -> bool:
     )
 
 
-def _resolve_followups(
-    followups: list[FollowUpQuestion],
+class _FollowupResolver:
+    """Answer follow-up questions from an answer sheet, the user or defaults.
+
+    A sheet answer is used once per question id; if the engine asks again (the
+    value could not be interpreted) the resolver falls back to prompting or the
+    default instead of looping on the same bad answer.
+    """
+
+    def __init__(self, session: SessionMemory, *, answers: AnswerSheet | None = None) -> None:
+        self.session = session
+        self.answers = answers
+        self._used: set[str] = set()
+
+    def resolve(
+        self, followups: list[FollowUpQuestion], *, interactive: bool, numbered: bool = False
+    ) -> None:
+        prompt_user = interactive and sys.stdin.isatty()
+        for question in followups:
+            default = _FOLLOWUP_DEFAULTS.get(question.field, 0.0)
+            supplied = self.answers.lookup(question) if self.answers is not None else None
+            if supplied is not None and question.id not in self._used:
+                self._used.add(question.id)
+                value = supplied
+            elif prompt_user:
+                label = f"[{question.command_index + 1}] " if numbered else ""
+                try:
+                    answer = input(f"{label}{question.prompt} ")
+                except EOFError:
+                    answer = ""
+                value = answer if answer.strip() else default
+            else:
+                value = default
+            self.session.set(question.id, value)
+
+
+def _parse_with_ai(
+    utterance: str,
+    parser: LLMParser,
+    compiler: CommandCompiler,
+    *,
+    deadline: Deadline | None = None,
+) -> list[CommandType] | None:
+    try:
+        return parser.parse(
+            utterance, context={"units": compiler.default_unit.value}, deadline=deadline
+        )
+    except ParseError:
+        return None
+
+
+def _clarify_all(
+    commands: list[CommandType],
     session: SessionMemory,
+    resolver: _FollowupResolver,
     *,
     interactive: bool,
-) -> None:
-    for question in followups:
-        default = _FOLLOWUP_DEFAULTS.get(question.field, 0.0)
-        if interactive and sys.stdin.isatty():
-            try:
-                answer = input(f"{question.prompt} ")
-            except EOFError:
-                answer = ""
-            value = answer if answer.strip() else default
-        else:
-            value = default
-        session.set(question.id, value)
+    numbered: bool = False,
+) -> list[CommandType]:
+    resolution = clarify_pass(commands, session)
+    if numbered and resolution.followups and interactive and sys.stdin.isatty():
+        print(
+            f"{len(resolution.followups)} follow-up question(s) for "
+            f"{len(resolution.pending)} command(s):"
+        )
+    while resolution.followups:
+        resolver.resolve(resolution.followups, interactive=interactive, numbered=numbered)
+        resolution = clarify_pass(resolution.commands, session, indices=resolution.pending)
+    return resolution.commands
 
 
 def _process_with_ai(
@@ -77,59 +182,193 @@ def _process_with_ai(
     session: SessionMemory,
     *,
     interactive: bool,
-) -> DrawingBundle | None:
-    try:
-        commands = parser.parse(utterance, context={"units": compiler.default_unit.value})
-    except ParseError:
+    deadline: Deadline | None = None,
+    resolver: _FollowupResolver | None = None,
+) -> ColumnarBundle | None:
+    commands = _parse_with_ai(utterance, parser, compiler, deadline=deadline)
+    if commands is None:
         return None
 
-    while True:
-        resolution = clarify(commands, session)
-        if isinstance(resolution, ReadyCommands):
-            ready = resolution.commands
-            break
-        _resolve_followups(resolution, session, interactive=interactive)
-    return compiler.compile(ready)
-
-
-def _write_bundle(bundle: DrawingBundle, path: Path) -> Path:
-    writer = DxfWriter()
-    for line in bundle.lines:
-        writer.add_line(line)
-    for circle in bundle.circles:
-        writer.add_circle(circle)
-    for rect in bundle.rects:
-        writer.add_rect(rect)
-    for poly in bundle.polylines:
-        writer.add_polyline(poly)
-    for arc in bundle.arcs:
-        writer.add_arc(arc)
-    for ellipse in bundle.ellipses:
-        writer.add_ellipse(ellipse)
-    for text in bundle.texts:
-        writer.add_text(text)
-    return writer.save(path)
+    # Once the budget is spent, defaults are used instead of blocking on the user.
+    prompt_user = interactive and (deadline is None or not deadline.expired)
+    ready = _clarify_all(
+        commands, session, resolver or _FollowupResolver(session), interactive=prompt_user
+    )
+    return compiler.compile_batch(ready)
+
+
+def _write_bundle(
+    bundle: ColumnarBundle,
+    path: Path | BinaryIO,
+    *,
+    stream: bool = False,
+    workers: int = 1,
+    profile: OutputProfile = DEFAULT_PROFILE,
+    precision: int | None = None,
+    instances: bool = False,
+    instance_rotation: bool = False,
+) -> tuple[Path | None, Extents]:
+    """Write ``bundle`` and return the output path with the drawing extents."""
+
+    if (instances or instance_rotation) and (profile.minimal or stream or workers > 1):
+        raise ValueError(_INSTANCING_ERROR)
+    if profile.minimal:
+        with R12Writer(path, precision=precision) as minimal:
+            minimal.add_bundle(bundle)
+        # R12 files carry no header; the extents are still reported.
+        return minimal.close(), columns_extents(bundle.columns)
+    if stream or workers > 1:
+        if profile.binary:
+            raise ValueError("Binary DXF output cannot be streamed.")
+        with StreamingDxfWriter(
+            path,
+            version=profile.version,
+            layers=bundle.layers,
+            workers=workers,
+            precision=precision,
+        ) as streaming:
+            streaming.add_bundle(bundle)
+        return streaming.close(), streaming.extents
+    writer = DxfWriter(version=profile.version, precision=precision)
+    if instances or instance_rotation:
+        writer.add_instanced(bundle, rotation=instance_rotation)
+    else:
+        writer.add_bundle(bundle)
+    if isinstance(path, Path):
+        return writer.save(path, fmt=profile.fmt), writer.extents
+    writer.write(path, fmt=profile.fmt)
+    return None, writer.extents
 
 
 def execute_commands(
     commands: Sequence[str],
     *,
-    output: Path,
+    output: Path | BinaryIO,
     enable_ai: bool = True,
     interactive: bool | None = None,
     parser: LLMParser | None = None,
-) -> Path:
-    """Process commands and emit a DXF file."""
+    deadline_ms: float | None = None,
+    run_deadline_ms: float | None = None,
+    answers: AnswerSheet | Mapping[str, Any] | None = None,
+    batch_clarify: bool = False,
+    memory_store: MemoryStore | str | Path | None = None,
+    stream: bool = False,
+    workers: int = 1,
+    output_format: str = DEFAULT_PROFILE.name,
+    precision: int | None = None,
+    instances: bool = False,
+    instance_rotation: bool = False,
+    merge_lines: bool = False,
+    simplify_tolerance_mm: float | None = None,
+) -> RunSummary:
+    """Process commands and emit a DXF file.
+
+    ``deadline_ms`` bounds the LLM work spent on each utterance and
+    ``run_deadline_ms`` bounds the whole run; once a budget is spent the
+    utterance falls back to deterministic parsing and default answers.
+
+    With ``batch_clarify`` (implied by ``answers``) every utterance is parsed
+    first and all follow-up questions are resolved in a single round, from the
+    answer sheet, one prompt form or the defaults, before anything is compiled.
+
+    ``memory_store`` (or the ``MEMORY_STORE`` setting) persists clarification
+    defaults across runs; a path is opened with :func:`open_store`. ``stream``
+    writes the DXF with :class:`~app.cad.streaming.StreamingDxfWriter` instead
+    of building an ``ezdxf`` document; ``workers > 1`` implies it and encodes
+    large drawings in that many processes.
+
+    ``output_format`` names an :data:`~app.cad.profiles.OUTPUT_PROFILES` entry
+    (ASCII R2018, binary R2018 or minimal R12); ``precision`` rounds written
+    values to that many decimal places.
+
+    ``instances`` writes repeated groups of entities once as blocks and places
+    them with INSERTs (:mod:`app.cad.instancing`); ``instance_rotation`` also
+    matches rotated copies and implies it. ``merge_lines`` joins chains of
+    lines that share endpoints into polylines first (:mod:`app.cad.joining`).
+    ``simplify_tolerance_mm`` (or the ``SIMPLIFY_TOLERANCE_MM`` setting) then
+    drops polyline vertices that move the outline by at most that distance
+    (:mod:`app.cad.simplify`); the vertex reduction is reported in the summary.
 
+    ``output`` is a path (compressed on the fly when it ends in ``.gz``) or a
+    binary stream such as ``sys.stdout.buffer``. The returned
+    :class:`RunSummary` holds the resolved path (``None`` for a stream), the
+    entity count, the drawing extents and the largest LLM prompt of the run.
+    """
+
+    profile = get_profile(output_format)
+    if profile.binary and (stream or workers > 1):
+        raise ValueError("Binary DXF output cannot be streamed.")
+    if (instances or instance_rotation) and (profile.minimal or stream or workers > 1):
+        raise ValueError(_INSTANCING_ERROR)
     load_dotenv()
+    run_deadline = Deadline.from_ms(run_deadline_ms)
     interactive = bool(interactive if interactive is not None else sys.stdin.isatty())
 
     settings = get_settings()
     default_unit = Unit.from_string(settings.DEFAULT_UNITS, default=Unit.MILLIMETER)
 
-    bundle = DrawingBundle()
-    session = SessionMemory()
+    if simplify_tolerance_mm is None:
+        simplify_tolerance_mm = settings.SIMPLIFY_TOLERANCE_MM
+    if simplify_tolerance_mm is not None and simplify_tolerance_mm <= 0:
+        raise ValueError("simplify_tolerance_mm must be greater than 0.")
+
+    store_source = memory_store if memory_store is not None else settings.MEMORY_STORE
+    store = open_store(store_source) if isinstance(store_source, str | Path) else store_source
+    try:
+        return _execute(
+            commands,
+            output,
+            enable_ai=enable_ai,
+            interactive=interactive,
+            parser=parser,
+            deadline_ms=deadline_ms,
+            run_deadline=run_deadline,
+            default_unit=default_unit,
+            answers=answers,
+            batch_clarify=batch_clarify,
+            store=store,
+            stream=stream,
+            workers=workers,
+            profile=profile,
+            precision=precision,
+            instances=instances or instance_rotation,
+            instance_rotation=instance_rotation,
+            merge_lines=merge_lines,
+            simplify_tolerance_mm=simplify_tolerance_mm,
+        )
+    finally:
+        if store is not None and store is not memory_store:
+            store.close()
+
+
+def _execute(
+    commands: Sequence[str],
+    output: Path | BinaryIO,
+    *,
+    enable_ai: bool,
+    interactive: bool,
+    parser: LLMParser | None,
+    deadline_ms: float | None,
+    run_deadline: Deadline | None,
+    default_unit: Unit,
+    answers: AnswerSheet | Mapping[str, Any] | None,
+    batch_clarify: bool,
+    store: MemoryStore | None,
+    stream: bool,
+    workers: int,
+    profile: OutputProfile,
+    precision: int | None,
+    instances: bool,
+    instance_rotation: bool,
+    merge_lines: bool,
+    simplify_tolerance_mm: float | None,
+) -> RunSummary:
+    bundle = ColumnarBundle()
+    session = SessionMemory(store=store)
     compiler = CommandCompiler(default_unit=default_unit)
+    sheet = answers if isinstance(answers, AnswerSheet) or answers is None else AnswerSheet(answers)
+    resolver = _FollowupResolver(session, answers=sheet)
+    batch = batch_clarify or sheet is not None
 
     active_parser = parser
     if enable_ai and active_parser is None:
@@ -140,25 +379,74 @@ def execute_commands(
         else:
             active_parser = LLMParser(provider=provider)
 
+    # Batch mode keeps utterance order: legacy geometry or a span of parsed commands.
+    segments: list[ColumnarBundle | tuple[int, int]] = []
+    parsed: list[CommandType] = []
+    prompt: PromptUsage | None = None
+
     for utterance in commands:
         if not utterance.strip():
             continue
         program = legacy_parse(utterance)
         if _program_has_entities(program):
-            bundle.extend(program_to_bundle(program))
+            if batch:
+                segments.append(program_to_columns(program))
+            else:
+                program_to_columns(program, bundle)
             continue
         if active_parser is None:
             continue
+        deadline = earliest(run_deadline, Deadline.from_ms(deadline_ms))
+        if batch:
+            utterance_commands = _parse_with_ai(
+                utterance, active_parser, compiler, deadline=deadline
+            )
+            prompt = _largest_prompt(prompt, active_parser)
+            if utterance_commands:
+                segments.append((len(parsed), len(parsed) + len(utterance_commands)))
+                parsed.extend(utterance_commands)
+            continue
         ai_bundle = _process_with_ai(
-            utterance, active_parser, compiler, session, interactive=interactive
+            utterance,
+            active_parser,
+            compiler,
+            session,
+            interactive=interactive,
+            deadline=deadline,
+            resolver=resolver,
         )
+        prompt = _largest_prompt(prompt, active_parser)
         if ai_bundle:
             bundle.extend(ai_bundle)
 
-    if not any(bundle.iter_all()):
+    if batch:
+        prompt_user = interactive and (run_deadline is None or not run_deadline.expired)
+        ready = _clarify_all(parsed, session, resolver, interactive=prompt_user, numbered=True)
+        for segment in segments:
+            if isinstance(segment, ColumnarBundle):
+                bundle.extend(segment)
+            else:
+                bundle.extend(compiler.compile_batch(ready[segment[0] : segment[1]]))
+
+    if not len(bundle):
         raise RuntimeError("No drawable entities were produced from the provided commands.")
+    if merge_lines:
+        bundle = join_lines(bundle)
+    report = None
+    if simplify_tolerance_mm is not None:
+        bundle, report = simplify_polylines(bundle, simplify_tolerance_mm)
 
-    return _write_bundle(bundle, output)
+    path, extents = _write_bundle(
+        bundle,
+        output,
+        stream=stream,
+        workers=workers,
+        profile=profile,
+        precision=precision,
+        instances=instances,
+        instance_rotation=instance_rotation,
+    )
+    return RunSummary(path, len(bundle), extents, report, prompt)
 
 
 def load_commands(cmd: str | None, stdin_stream: Iterable[str]) -> list[str]:
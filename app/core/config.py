@@ -9,6 +9,7 @@ from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 UnitsLiteral = Literal["mm", "in"]
+NumericBackendLiteral = Literal["decimal", "float", "fixed"]
 
 
 class Settings(BaseSettings):
@@ -27,10 +28,41 @@ class Settings(BaseSettings):
         description="Default units used when parsing user input.",
     )
 
+    numeric_backend: NumericBackendLiteral = Field(
+        default="decimal",
+        alias="NUMERIC_BACKEND",
+        description="Arithmetic used for unit conversion: decimal, float or fixed (nanometres).",
+    )
+
+    memory_store: str | None = Field(
+        default=None,
+        alias="MEMORY_STORE",
+        description="Path of the project memory store (.json, or .db/.sqlite for SQLite).",
+    )
+
+    simplify_tolerance_mm: float | None = Field(
+        default=None,
+        alias="SIMPLIFY_TOLERANCE_MM",
+        gt=0,
+        description="Simplify polylines to within this many millimetres before writing.",
+    )
+
     @property
     def DEFAULT_UNITS(self) -> UnitsLiteral:  # noqa: N802 - keep env style attribute
         return self.default_units
 
+    @property
+    def NUMERIC_BACKEND(self) -> NumericBackendLiteral:  # noqa: N802 - keep env style attribute
+        return self.numeric_backend
+
+    @property
+    def MEMORY_STORE(self) -> str | None:  # noqa: N802 - keep env style attribute
+        return self.memory_store or None
+
+    @property
+    def SIMPLIFY_TOLERANCE_MM(self) -> float | None:  # noqa: N802 - keep env style attribute
+        return self.simplify_tolerance_mm
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
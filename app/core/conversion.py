@@ -2,24 +2,46 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from decimal import Decimal
 
-from app.cad.models import Arc, Circle, DrawingBundle, Ellipse, Line, Point, Polyline, Rect, Text
+import numpy as np
+
+from app.cad.columnar import ColumnarBundle, require_positive_array
+from app.cad.models import (
+    DEFAULT_LAYER,
+    Arc,
+    Circle,
+    DrawingBundle,
+    Ellipse,
+    Line,
+    Point,
+    Polyline,
+    Rect,
+    Text,
+    require_positive,
+)
 
 from .nlp_rules import Program
 
 
+def _decimal(value: float) -> Decimal:
+    return Decimal(str(value))
+
+
 def _point(x: float, y: float) -> Point:
-    return Point(x=Decimal(str(x)), y=Decimal(str(y)))
+    return Point(x=_decimal(x), y=_decimal(y))
+
 
+def _trusted_point(x: float, y: float) -> Point:
+    return Point.trusted(_decimal(x), _decimal(y))
 
-def program_to_bundle(program: Program) -> DrawingBundle:
+
+def _validated_bundle(program: Program) -> DrawingBundle:
     bundle = DrawingBundle()
 
     for circle in program.circles:
-        bundle.circles.append(
-            Circle(center=_point(circle.x, circle.y), radius=Decimal(str(circle.r)))
-        )
+        bundle.circles.append(Circle(center=_point(circle.x, circle.y), radius=_decimal(circle.r)))
 
     for line in program.lines:
         bundle.lines.append(Line(start=_point(line.x1, line.y1), end=_point(line.x2, line.y2)))
@@ -34,8 +56,8 @@ def program_to_bundle(program: Program) -> DrawingBundle:
         bundle.rects.append(
             Rect(
                 origin=_point(origin_x, origin_y),
-                width=Decimal(str(rect.w)),
-                height=Decimal(str(rect.h)),
+                width=_decimal(rect.w),
+                height=_decimal(rect.h),
             )
         )
 
@@ -43,7 +65,7 @@ def program_to_bundle(program: Program) -> DrawingBundle:
         bundle.arcs.append(
             Arc(
                 center=_point(arc.x, arc.y),
-                radius=Decimal(str(arc.r)),
+                radius=_decimal(arc.r),
                 start_angle=float(arc.a1),
                 end_angle=float(arc.a2),
             )
@@ -57,8 +79,8 @@ def program_to_bundle(program: Program) -> DrawingBundle:
         bundle.ellipses.append(
             Ellipse(
                 center=_point(ellipse.x, ellipse.y),
-                rx=Decimal(str(ellipse.rx)),
-                ry=Decimal(str(ellipse.ry)),
+                rx=_decimal(ellipse.rx),
+                ry=_decimal(ellipse.ry),
                 rotation=float(ellipse.rot_deg),
             )
         )
@@ -68,11 +90,139 @@ def program_to_bundle(program: Program) -> DrawingBundle:
             Text(
                 text=text.text,
                 position=_point(text.x, text.y),
-                height=Decimal(str(text.height)),
+                height=_decimal(text.height),
+            )
+        )
+
+    return bundle
+
+
+def _trusted_bundle(program: Program) -> DrawingBundle:
+    bundle = DrawingBundle()
+    point = _trusted_point
+
+    bundle.circles.extend(
+        Circle.trusted(point(c.x, c.y), require_positive(_decimal(c.r), "circle.radius"))
+        for c in program.circles
+    )
+    bundle.lines.extend(
+        Line.trusted(point(line.x1, line.y1), point(line.x2, line.y2)) for line in program.lines
+    )
+    for rect in program.rects:
+        if rect.anchor == "center":
+            origin = point(rect.x - rect.w / 2, rect.y - rect.h / 2)
+        else:
+            origin = point(rect.x, rect.y)
+        bundle.rects.append(
+            Rect.trusted(
+                origin,
+                require_positive(_decimal(rect.w), "rect.width"),
+                require_positive(_decimal(rect.h), "rect.height"),
             )
         )
+    bundle.arcs.extend(
+        Arc.trusted(
+            point(a.x, a.y),
+            require_positive(_decimal(a.r), "arc.radius"),
+            float(a.a1),
+            float(a.a2),
+        )
+        for a in program.arcs
+    )
+    bundle.polylines.extend(
+        Polyline.trusted([point(x, y) for x, y in pl.pts], bool(pl.closed))
+        for pl in program.polylines
+    )
+    bundle.ellipses.extend(
+        Ellipse.trusted(
+            point(e.x, e.y),
+            require_positive(_decimal(e.rx), "ellipse.rx"),
+            require_positive(_decimal(e.ry), "ellipse.ry"),
+            float(e.rot_deg),
+        )
+        for e in program.ellipses
+    )
+    bundle.texts.extend(
+        Text.trusted(t.text, point(t.x, t.y), require_positive(_decimal(t.height), "text.height"))
+        for t in program.texts
+    )
+    return bundle
+
 
+def program_to_bundle(program: Program, *, trusted: bool = True) -> DrawingBundle:
+    """Convert a legacy :class:`Program` into a :class:`DrawingBundle`.
+
+    ``Program`` values come from our own rule parser, so by default the models are
+    built through the trusted constructors; pass ``trusted=False`` to run full
+    pydantic validation instead.
+    """
+
+    if trusted:
+        return _trusted_bundle(program)
+    return _validated_bundle(program)
+
+
+def program_to_columns(
+    program: Program,
+    bundle: ColumnarBundle | None = None,
+    *,
+    layers: Mapping[str, str] | None = None,
+) -> ColumnarBundle:
+    """Append a legacy :class:`Program` to a :class:`ColumnarBundle` without models.
+
+    ``Program`` already carries float64 millimetres, so the values are copied
+    as-is; routing them through ``Decimal`` (as :func:`program_to_bundle` does)
+    round-trips to the same floats. ``layers`` maps an entity kind such as
+    ``"circles"`` to its layer name (default ``A-GEOM``).
+    """
+
+    bundle = bundle if bundle is not None else ColumnarBundle()
+    cols = bundle.columns
+
+    def layer(kind: str) -> int:
+        return bundle.layers.intern((layers or {}).get(kind, DEFAULT_LAYER))
+
+    if program.circles:
+        rows = np.array([(c.x, c.y, c.r) for c in program.circles], dtype=np.float64)
+        require_positive_array(rows[:, 2], "circle.radius")
+        cols.circles.extend(rows, layer("circles"))
+    if program.lines:
+        rows = np.array([(ln.x1, ln.y1, ln.x2, ln.y2) for ln in program.lines], dtype=np.float64)
+        cols.lines.extend(rows, layer("lines"))
+    if program.rects:
+        rows = np.array([(r.x, r.y, r.w, r.h) for r in program.rects], dtype=np.float64)
+        require_positive_array(rows[:, 2], "rect.width")
+        require_positive_array(rows[:, 3], "rect.height")
+        centred = np.array([r.anchor == "center" for r in program.rects])
+        rows[centred, 0] -= rows[centred, 2] / 2
+        rows[centred, 1] -= rows[centred, 3] / 2
+        cols.rects.extend(rows, layer("rects"))
+    if program.polylines:
+        sizes = [len(pl.pts) for pl in program.polylines]
+        vertices = np.array(
+            [pt for pl in program.polylines for pt in pl.pts], dtype=np.float64
+        ).reshape(-1, 2)
+        closed = np.array([pl.closed for pl in program.polylines], dtype=bool)
+        cols.polylines.extend(
+            np.concatenate(([0], np.cumsum(sizes))), vertices, closed, layer("polylines")
+        )
+    if program.arcs:
+        rows = np.array([(a.x, a.y, a.r, a.a1, a.a2) for a in program.arcs], dtype=np.float64)
+        require_positive_array(rows[:, 2], "arc.radius")
+        cols.arcs.extend(rows, layer("arcs"))
+    if program.ellipses:
+        rows = np.array(
+            [(e.x, e.y, e.rx, e.ry, e.rot_deg) for e in program.ellipses], dtype=np.float64
+        )
+        require_positive_array(rows[:, 2], "ellipse.rx")
+        require_positive_array(rows[:, 3], "ellipse.ry")
+        cols.ellipses.extend(rows, layer("ellipses"))
+    if program.texts:
+        rows = np.array([(t.x, t.y, t.height) for t in program.texts], dtype=np.float64)
+        require_positive_array(rows[:, 2], "text.height")
+        cols.texts.strings.extend(t.text for t in program.texts)
+        cols.texts.extend(rows, layer("texts"))
     return bundle
 
 
-__all__ = ["program_to_bundle"]
+__all__ = ["program_to_bundle", "program_to_columns"]
@@ -0,0 +1,86 @@
+"""Monotonic latency budgets shared by the CLI and the LLM parser."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call does not complete within its latency budget."""
+
+
+@dataclass(frozen=True, slots=True)
+class Deadline:
+    """Absolute point in time (``time.monotonic`` based) by which work must finish."""
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(time.monotonic() + max(0.0, seconds))
+
+    @classmethod
+    def from_ms(cls, milliseconds: float | None) -> Deadline | None:
+        if milliseconds is None:
+            return None
+        return cls.after(milliseconds / 1000.0)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def within(self, milliseconds: float | None) -> Deadline:
+        """Return a child deadline that is at most ``milliseconds`` away."""
+
+        if milliseconds is None:
+            return self
+        child = Deadline.after(milliseconds / 1000.0)
+        return child if child.expires_at < self.expires_at else self
+
+
+def earliest(*deadlines: Deadline | None) -> Deadline | None:
+    """Return the tightest of the provided deadlines, ignoring ``None``."""
+
+    active = [deadline for deadline in deadlines if deadline is not None]
+    if not active:
+        return None
+    return min(active, key=lambda deadline: deadline.expires_at)
+
+
+def call_with_timeout(func: Callable[[], Any], timeout: float) -> Any:
+    """Run ``func`` in a daemon thread and wait at most ``timeout`` seconds.
+
+    The worker cannot be cancelled, so a provider that ignores its own timeout
+    keeps running in the background; the caller is released either way.
+    """
+
+    outcome: list[Any] = []
+    failure: list[BaseException] = []
+    done = threading.Event()
+
+    def _runner() -> None:
+        try:
+            outcome.append(func())
+        except BaseException as exc:  # re-raised in the caller thread
+            failure.append(exc)
+        finally:
+            done.set()
+
+    threading.Thread(target=_runner, name="deadline-call", daemon=True).start()
+    if not done.wait(timeout):
+        raise DeadlineExceeded(f"Call did not complete within {timeout:.3f}s.")
+    if failure:
+        raise failure[0]
+    return outcome[0]
+
+
+__all__ = ["Deadline", "DeadlineExceeded", "call_with_timeout", "earliest"]
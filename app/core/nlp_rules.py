@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from dataclasses import dataclass
 
-from .units import to_mm
+from .units import mm_value
 
 
 @dataclass
@@ -126,9 +126,9 @@ def parse(text: str) -> Program:
             m.group(6),
         )
         if rad_num:
-            r = float(to_mm(float(rad_num), rad_unit or "mm"))
+            r = mm_value(float(rad_num), rad_unit or "mm")
         elif pre_num:
-            r = float(to_mm(float(pre_num), pre_unit or "mm"))
+            r = mm_value(float(pre_num), pre_unit or "mm")
         else:
             continue
         circles.append(CircleCmd(float(cx), float(cy), float(r)))
@@ -160,12 +160,12 @@ def parse(text: str) -> Program:
         m_width = width_re.search(chunk)
         if m_width:
             w_val, w_unit = m_width.group(1), m_width.group(2)
-            wmm = float(to_mm(float(w_val), w_unit or "mm"))
+            wmm = mm_value(float(w_val), w_unit or "mm")
 
         m_height = height_re.search(chunk)
         if m_height:
             h_val, h_unit = m_height.group(1), m_height.group(2)
-            hmm = float(to_mm(float(h_val), h_unit or "mm"))
+            hmm = mm_value(float(h_val), h_unit or "mm")
 
         if wmm is None or hmm is None:
             m_sh = shorthand_re.search(chunk)
@@ -177,9 +177,9 @@ def parse(text: str) -> Program:
                     m_sh.group(4),
                 )
                 if wmm is None:
-                    wmm = float(to_mm(float(w_val), w_unit or "mm"))
+                    wmm = mm_value(float(w_val), w_unit or "mm")
                 if hmm is None:
-                    hmm = float(to_mm(float(h_val), h_unit or "mm"))
+                    hmm = mm_value(float(h_val), h_unit or "mm")
 
         wmm = wmm if wmm is not None else 100.0
         hmm = hmm if hmm is not None else 100.0
@@ -222,7 +222,7 @@ def parse(text: str) -> Program:
             ArcCmd(
                 float(cx),
                 float(cy),
-                float(to_mm(float(r_val), r_unit)),
+                mm_value(float(r_val), r_unit),
                 float(a1),
                 float(a2),
             )
@@ -251,8 +251,8 @@ def parse(text: str) -> Program:
             EllipseCmd(
                 cx,
                 cy,
-                float(to_mm(rx_val, rx_unit)),
-                float(to_mm(ry_val, ry_unit)),
+                mm_value(rx_val, rx_unit),
+                mm_value(ry_val, ry_unit),
                 rot,
             )
         )
@@ -263,7 +263,7 @@ def parse(text: str) -> Program:
     ):
         s, x, y = m.group(1), float(m.group(2)), float(m.group(3))
         h_val, h_unit = m.group(4), (m.group(5) or "mm")
-        height = float(to_mm(float(h_val), h_unit)) if h_val else 100.0
+        height = mm_value(float(h_val), h_unit) if h_val else 100.0
         texts.append(TextCmd(x, y, s, height))
 
     return Program(
@@ -1,4 +1,16 @@
-"""Utilities for unit conversion using :class:`~decimal.Decimal`."""
+"""Utilities for unit conversion using :class:`~decimal.Decimal`.
+
+``to_mm``/``from_mm``/``convert_length`` always return exact, quantised
+``Decimal`` values. Hot paths that only need floats use :func:`mm_value` and
+the array helpers, whose arithmetic follows the ``NUMERIC_BACKEND`` setting:
+
+* ``decimal`` – exact ``Decimal`` conversion, then ``float`` (default)
+* ``float`` – float64 arithmetic rounded to :data:`MM_DECIMALS` places
+* ``fixed`` – integer nanometres (``1 nm == MM_PRECISION``)
+
+The array helpers and ``CommandCompiler.compile_batch`` snap to whole
+nanometres with :func:`round_nm`, which breaks ties as each backend does.
+"""
 
 from __future__ import annotations
 
@@ -7,8 +19,15 @@ from collections.abc import Iterable
 from decimal import ROUND_HALF_UP, Decimal, getcontext
 from enum import Enum
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+from .config import Settings, get_settings
+
 MM_PER_INCH = Decimal("25.4")
 MM_PRECISION = Decimal("0.000001")
+MM_DECIMALS = 6
+NM_PER_MM = 1_000_000
 
 getcontext().prec = 28
 
@@ -23,38 +42,82 @@ class Unit(str, Enum):
     def from_string(cls, value: str | None, default: Unit | None = None) -> Unit:
         if value is None or not value.strip():
             return default or cls.MILLIMETER
-        normalized = value.strip().lower()
-        for unit, aliases in _ALIASES.items():
-            if normalized in aliases:
-                return unit
-        raise ValueError(f"Unsupported unit '{value}'")
+        unit = _ALIAS_LOOKUP.get(value.strip().lower())
+        if unit is None:
+            raise ValueError(f"Unsupported unit '{value}'")
+        return unit
+
+
+class NumericBackend(str, Enum):
+    """Arithmetic used by the float conversion helpers."""
+
+    DECIMAL = "decimal"
+    FLOAT = "float"
+    FIXED = "fixed"
 
 
 _ALIASES: dict[Unit, set[str]] = {
     Unit.MILLIMETER: {"mm", "millimeter", "millimeters", "millimetre", "millimetres"},
     Unit.INCH: {"in", "inch", "inches", '"'},
 }
+_ALIAS_LOOKUP: dict[str, Unit] = {
+    alias: unit for unit, aliases in _ALIASES.items() for alias in aliases
+}
+
+_MM_FACTOR: dict[Unit, Decimal] = {Unit.MILLIMETER: Decimal(1), Unit.INCH: MM_PER_INCH}
+_MM_FACTOR_FLOAT: dict[Unit, float] = {unit: float(f) for unit, f in _MM_FACTOR.items()}
+_NM_FACTOR: dict[Unit, int] = {unit: int(f * NM_PER_MM) for unit, f in _MM_FACTOR.items()}
 
 _LENGTH_RE = re.compile(r"^\s*([-+]?\d+(?:\.\d+)?)\s*([a-z\"]+)?\s*$", re.IGNORECASE)
 
+# (settings object, default unit, backend); refreshed whenever ``reload_settings`` swaps the object.
+_defaults: tuple[Settings, Unit, NumericBackend] | None = None
+
 
 def _quantize(value: Decimal) -> Decimal:
     return value.quantize(MM_PRECISION, rounding=ROUND_HALF_UP)
 
 
+def _resolve_defaults() -> tuple[Unit, NumericBackend]:
+    global _defaults
+    settings = get_settings()
+    cached = _defaults
+    if cached is None or cached[0] is not settings:
+        unit = Unit.from_string(settings.DEFAULT_UNITS, default=Unit.MILLIMETER)
+        cached = _defaults = (settings, unit, NumericBackend(settings.NUMERIC_BACKEND))
+    return cached[1], cached[2]
+
+
 def _resolve_default_unit() -> Unit:
-    from .config import get_settings
+    return _resolve_defaults()[0]
 
-    settings = get_settings()
-    return Unit.from_string(settings.DEFAULT_UNITS, default=Unit.MILLIMETER)
+
+def numeric_backend() -> NumericBackend:
+    """Backend selected by the ``NUMERIC_BACKEND`` setting."""
+
+    return _resolve_defaults()[1]
+
+
+def _resolve_backend(backend: NumericBackend | str | None) -> NumericBackend:
+    if backend is None:
+        return numeric_backend()
+    return backend if isinstance(backend, NumericBackend) else NumericBackend(backend)
 
 
 def _resolve_unit(unit: Unit | str | None, fallback: Unit | None = None) -> Unit:
     if isinstance(unit, Unit):
         return unit
-    return Unit.from_string(
-        unit if unit is None or isinstance(unit, str) else str(unit), default=fallback
-    )
+    if unit is None or not str(unit).strip():
+        return fallback or _resolve_default_unit()
+    return Unit.from_string(str(unit))
+
+
+def _as_decimal(value: float | int | Decimal) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
 
 
 def parse_length(text: str, *, default_unit: Unit | None = None) -> Decimal:
@@ -62,24 +125,24 @@ def parse_length(text: str, *, default_unit: Unit | None = None) -> Decimal:
     if not match:
         raise ValueError(f"Could not parse length expression '{text}'")
     magnitude = Decimal(match.group(1))
-    unit = _resolve_unit(match.group(2), fallback=default_unit or _resolve_default_unit())
+    unit = _resolve_unit(match.group(2), fallback=default_unit)
     return to_mm(magnitude, unit=unit)
 
 
 def to_mm(value: float | int | Decimal, unit: Unit | str | None) -> Decimal:
-    unit_enum = _resolve_unit(unit, fallback=_resolve_default_unit())
-    decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
-    if unit_enum == Unit.INCH:
+    unit_enum = _resolve_unit(unit)
+    decimal_value = _as_decimal(value)
+    if unit_enum is Unit.INCH:
         return _quantize(decimal_value * MM_PER_INCH)
     return _quantize(decimal_value)
 
 
 def from_mm(value: float | int | Decimal, unit: Unit | str | None) -> Decimal:
-    unit_enum = _resolve_unit(unit, fallback=_resolve_default_unit())
-    decimal_value = value if isinstance(value, Decimal) else Decimal(str(value))
-    if unit_enum == Unit.INCH:
+    unit_enum = _resolve_unit(unit)
+    decimal_value = _as_decimal(value)
+    if unit_enum is Unit.INCH:
         return _quantize(decimal_value / MM_PER_INCH)
-    if unit_enum == Unit.MILLIMETER:
+    if unit_enum is Unit.MILLIMETER:
         return _quantize(decimal_value)
     raise ValueError(f"Unsupported unit '{unit_enum}'")
 
@@ -87,9 +150,106 @@ def from_mm(value: float | int | Decimal, unit: Unit | str | None) -> Decimal:
 def convert_length(
     value: float | int | Decimal, from_unit: Unit | str, to_unit: Unit | str
 ) -> Decimal:
-    mm_value = to_mm(value, from_unit)
-    return from_mm(mm_value, to_unit)
+    return from_mm(to_mm(value, from_unit), to_unit)
+
+
+def to_nm(value: float | int | Decimal, unit: Unit | str | None) -> int:
+    """Convert ``value`` to integer nanometres (the fixed-point representation)."""
+
+    factor = _NM_FACTOR[_resolve_unit(unit)]
+    if isinstance(value, Decimal):
+        return int((value * factor).to_integral_value(rounding=ROUND_HALF_UP))
+    return round(value * factor)
+
+
+def mm_value(
+    value: float | int | Decimal,
+    unit: Unit | str | None,
+    *,
+    backend: NumericBackend | str | None = None,
+) -> float:
+    """Return ``value`` in millimetres as a float using the configured backend."""
+
+    resolved = _resolve_backend(backend)
+    if resolved is NumericBackend.FLOAT:
+        # Snap to the 1e-6 mm grid; cheaper than ``round(x, MM_DECIMALS)``.
+        return round(float(value) * _MM_FACTOR_FLOAT[_resolve_unit(unit)] * NM_PER_MM) / NM_PER_MM
+    if resolved is NumericBackend.FIXED:
+        return to_nm(value, unit) / NM_PER_MM
+    return float(to_mm(value, unit))
+
+
+def round_nm(
+    nanometres: ArrayLike, *, backend: NumericBackend | str | None = None
+) -> NDArray[np.float64]:
+    """Round to whole nanometres the way ``backend`` rounds scalars.
+
+    ``decimal`` rounds ties away from zero like ``ROUND_HALF_UP``, after
+    clearing the binary noise that would hide a decimal tie; ``float`` and
+    ``fixed`` round ties to even like :func:`round`.
+    """
+
+    values = np.asarray(nanometres, dtype=np.float64)
+    if _resolve_backend(backend) is NumericBackend.DECIMAL:
+        cleaned = np.round(values, 3)
+        return np.copysign(np.floor(np.abs(cleaned) + 0.5), cleaned)
+    return np.rint(values)
+
+
+def to_nm_array(
+    values: ArrayLike, unit: Unit | str | None, *, backend: NumericBackend | str | None = None
+) -> NDArray[np.int64]:
+    factor = _NM_FACTOR[_resolve_unit(unit)]
+    scaled = np.asarray(values, dtype=np.float64) * factor
+    return round_nm(scaled, backend=backend).astype(np.int64)
+
+
+def to_mm_array(
+    values: ArrayLike,
+    unit: Unit | str | None,
+    *,
+    backend: NumericBackend | str | None = None,
+) -> NDArray[np.float64]:
+    """Vectorised :func:`mm_value`: snapped to whole nanometres with :func:`round_nm`."""
+
+    return to_nm_array(values, unit, backend=backend) / NM_PER_MM
+
+
+def from_mm_array(
+    values: ArrayLike, unit: Unit | str | None, *, backend: NumericBackend | str | None = None
+) -> NDArray[np.float64]:
+    """Vectorised :func:`from_mm` as floats, rounded like :func:`to_mm_array`."""
+
+    scaled = np.asarray(values, dtype=np.float64) / _MM_FACTOR_FLOAT[_resolve_unit(unit)]
+    return round_nm(scaled * NM_PER_MM, backend=backend) / NM_PER_MM
+
+
+def unit_factor(unit: Unit | str | None) -> float:
+    """Millimetres per ``unit`` as a float, for callers that scale in bulk."""
+
+    return _MM_FACTOR_FLOAT[_resolve_unit(unit)]
 
 
 def available_units() -> Iterable[str]:
-    return sorted({alias for aliases in _ALIASES.values() for alias in aliases})
+    return sorted(_ALIAS_LOOKUP)
+
+
+__all__ = [
+    "MM_PER_INCH",
+    "MM_PRECISION",
+    "NumericBackend",
+    "Unit",
+    "available_units",
+    "convert_length",
+    "from_mm",
+    "from_mm_array",
+    "mm_value",
+    "numeric_backend",
+    "parse_length",
+    "round_nm",
+    "to_mm",
+    "to_mm_array",
+    "to_nm",
+    "to_nm_array",
+    "unit_factor",
+]
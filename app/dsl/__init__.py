@@ -1,10 +1,18 @@
 """DSL package exposing rule, LLM and clarification utilities."""
 
-from .clarify import FollowUpQuestion, ReadyCommands, clarify
-from .commands import CommandList, CommandType, DrawCircle, DrawLine, DrawRect
+from .clarify import ClarifyPass, FollowUpQuestion, ReadyCommands, clarify, clarify_pass
+from .commands import (
+    CommandList,
+    CommandType,
+    DrawCircle,
+    DrawLine,
+    DrawRect,
+    validate_command_list,
+)
 from .llm_parser import LLMParser, llm_parse
 from .llm_provider import BaseLLMProvider, configure_provider
 from .parse_rule import parse_rule
+from .singleflight import SingleFlight, SingleFlightParser
 
 __all__ = [
     "CommandList",
@@ -12,12 +20,17 @@ __all__ = [
     "DrawCircle",
     "DrawLine",
     "DrawRect",
+    "validate_command_list",
     "parse_rule",
     "llm_parse",
     "LLMParser",
+    "SingleFlight",
+    "SingleFlightParser",
     "configure_provider",
     "BaseLLMProvider",
     "clarify",
+    "clarify_pass",
+    "ClarifyPass",
     "FollowUpQuestion",
     "ReadyCommands",
 ]
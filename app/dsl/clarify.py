@@ -1,18 +1,35 @@
-"""Clarification engine for filling incomplete command data."""
+"""Clarification engine for filling incomplete command data.
+
+The fields to clarify are derived once from the ``CommandType`` schemas: every
+numeric field without a default, both components of every coordinate (including
+each polyline point) and free-text fields. Fields marked ``COMPILER_DEFAULT``,
+such as the arc angles, are left for the compiler to fill in. Session keys follow
+``<kind>.<field>[.<component>]`` (for example ``circle.center.x``); rectangle
+positions are keyed by their anchor (``rect.center.x``) and polyline points by
+index (``polyline.points.0.x``).
+"""
 
 from __future__ import annotations
 
-from collections.abc import Iterable
-from typing import Any
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Literal, get_args, get_origin
 
 from pydantic import BaseModel, ConfigDict
 
-from app.memory.session import SessionMemory
+from .commands import COMPILER_DEFAULT, CommandType, Coordinate
 
-from .commands import CommandType, DrawCircle, DrawLine, DrawRect
+if TYPE_CHECKING:
+    from app.memory.session import SessionMemory
 
 _USE_PREVIOUS = {"use previous value", "previous", "same", "last", "prior"}
 
+_NOUNS = {"rect": "rectangle", "text": "label"}
+_LABELS = {"rx": "X radius", "ry": "Y radius", "center": "centre"}
+
+FieldKind = Literal["text", "number", "coordinate", "points"]
+
 
 class FollowUpQuestion(BaseModel):
     model_config = ConfigDict(extra="forbid")
@@ -30,11 +47,95 @@ class ReadyCommands(BaseModel):
     commands: list[CommandType]
 
 
-def _normalise_answer(answer: Any) -> Any:
+@dataclass(frozen=True, slots=True)
+class FieldSpec:
+    """One clarifiable field of a command model."""
+
+    name: str
+    kind: FieldKind
+    key: str
+    prompt: str
+
+
+@dataclass(slots=True)
+class ClarifyPass:
+    """Outcome of clarifying a command list once.
+
+    ``commands`` holds every command with whatever could be resolved filled in;
+    ``pending`` lists the indices that still have open questions.
+    """
+
+    commands: list[CommandType]
+    followups: list[FollowUpQuestion] = field(default_factory=list)
+
+    @property
+    def pending(self) -> list[int]:
+        return sorted({question.command_index for question in self.followups})
+
+
+def _command_models() -> tuple[type[BaseModel], ...]:
+    union = get_args(CommandType)[0]
+    return tuple(get_args(union))
+
+
+def _field_kind(annotation: Any, default: Any) -> FieldKind | None:
+    if annotation is Coordinate:
+        return "coordinate"
+    if get_origin(annotation) is list and get_args(annotation) == (Coordinate,):
+        return "points"
+    if annotation is str:
+        return "text"
+    members = get_args(annotation) or (annotation,)
+    if float in members and default is None:
+        return "number"
+    return None
+
+
+def _specs_for(model: type[BaseModel]) -> tuple[FieldSpec, ...]:
+    kind_name = str(model.model_fields["type"].default).removeprefix("draw_")
+    noun = _NOUNS.get(kind_name, kind_name)
+    anchored = "anchor" in model.model_fields
+    specs: list[FieldSpec] = []
+    for name, info in model.model_fields.items():
+        if COMPILER_DEFAULT in info.metadata:
+            continue
+        kind = _field_kind(info.annotation, info.default)
+        if kind is None:
+            continue
+        label = _LABELS.get(name, name.replace("_", " "))
+        if kind == "coordinate":
+            # Rectangle positions are keyed and described by their anchor.
+            part = "{anchor}" if anchored and name == "position" else name
+            key = f"{kind_name}.{part}"
+            prompt = f"Provide the {noun} {label if part == name else part} {{axis}} coordinate."
+        elif kind == "points":
+            key = f"{kind_name}.{name}.{{index}}"
+            prompt = f"Provide the {noun} point {{number}} {{axis}} coordinate."
+        elif kind == "text":
+            key = f"{kind_name}.{name}"
+            prompt = f"What {label} should the {noun} contain?"
+        else:
+            key = f"{kind_name}.{name}"
+            prompt = f"What {label} should the {noun} have?"
+        specs.append(FieldSpec(name, kind, key, prompt))
+    order = {"text": 0, "number": 1, "coordinate": 2, "points": 3}
+    return tuple(sorted(specs, key=lambda spec: order[spec.kind]))
+
+
+@lru_cache(maxsize=1)
+def command_field_specs() -> dict[type[BaseModel], tuple[FieldSpec, ...]]:
+    """Clarifiable fields for every command model, derived from the schemas once."""
+
+    return {model: _specs_for(model) for model in _command_models()}
+
+
+def _normalise_answer(answer: Any, expected: str = "number") -> Any:
     if isinstance(answer, str):
         stripped = answer.strip().lower()
         if stripped in _USE_PREVIOUS:
             return "__USE_PREVIOUS__"
+        if expected == "text":
+            return answer.strip()
         try:
             return float(answer)
         except ValueError:
@@ -42,30 +143,34 @@ def _normalise_answer(answer: Any) -> Any:
     return answer
 
 
-def _resolve_numeric(
+def _resolve_value(
     session: SessionMemory,
     command_index: int,
     key: str,
     current: Any,
     prompt: str,
     followups: list[FollowUpQuestion],
-) -> float | None:
-    if current is not None:
-        value = float(current)
+    expected: str = "number",
+) -> Any:
+    text = expected == "text"
+    if current is not None and (current != "" or not text):
+        value = current if text else float(current)
         session.remember_default(key, value)
         return value
 
     answer_key = f"answer.{command_index}.{key}"
     answer = session.pop(answer_key)
     if answer is not None:
-        normalised = _normalise_answer(answer)
+        normalised = _normalise_answer(answer, expected)
         if normalised == "__USE_PREVIOUS__":
             default = session.get_default(key)
             if default is not None:
-                return float(default)
+                return default if text else float(default)
         else:
             try:
-                value = float(normalised)
+                value = str(normalised) if text else float(normalised)
+                if text and not value:
+                    raise ValueError(value)
             except (TypeError, ValueError):
                 followups.append(
                     FollowUpQuestion(
@@ -73,15 +178,16 @@ def _resolve_numeric(
                         command_index=command_index,
                         field=key,
                         prompt=f"{prompt} (could not interpret '{answer}')",
+                        expected=expected,
                     )
                 )
-                return None
+                return current
             session.remember_default(key, value)
             return value
 
     default = session.get_default(key)
     if default is not None:
-        return float(default)
+        return default if text else float(default)
 
     followups.append(
         FollowUpQuestion(
@@ -89,155 +195,103 @@ def _resolve_numeric(
             command_index=command_index,
             field=key,
             prompt=prompt,
+            expected=expected,
         )
     )
-    return None
+    return current
 
 
-def _clarify_circle(
-    index: int, cmd: DrawCircle, session: SessionMemory, followups: list[FollowUpQuestion]
-) -> DrawCircle:
-    radius = _resolve_numeric(
-        session,
-        index,
-        "circle.radius",
-        cmd.radius,
-        "What radius should the circle have?",
-        followups,
-    )
-
-    center_x = _resolve_numeric(
-        session,
-        index,
-        "circle.center.x",
-        cmd.center.x,
-        "Provide the circle centre X coordinate.",
-        followups,
-    )
-    center_y = _resolve_numeric(
-        session,
-        index,
-        "circle.center.y",
-        cmd.center.y,
-        "Provide the circle centre Y coordinate.",
-        followups,
-    )
-
-    new_center = cmd.center.model_copy(update={"x": center_x, "y": center_y})
-    return cmd.model_copy(update={"radius": radius, "center": new_center})
-
-
-def _clarify_line(
-    index: int, cmd: DrawLine, session: SessionMemory, followups: list[FollowUpQuestion]
-) -> DrawLine:
-    start_x = _resolve_numeric(
-        session,
-        index,
-        "line.start.x",
-        cmd.start.x,
-        "Provide the line start X coordinate.",
-        followups,
-    )
-    start_y = _resolve_numeric(
-        session,
-        index,
-        "line.start.y",
-        cmd.start.y,
-        "Provide the line start Y coordinate.",
-        followups,
-    )
-    end_x = _resolve_numeric(
-        session,
-        index,
-        "line.end.x",
-        cmd.end.x,
-        "Provide the line end X coordinate.",
-        followups,
-    )
-    end_y = _resolve_numeric(
-        session,
-        index,
-        "line.end.y",
-        cmd.end.y,
-        "Provide the line end Y coordinate.",
-        followups,
+def _resolve_coordinate(
+    session: SessionMemory,
+    index: int,
+    coord: Coordinate,
+    key: str,
+    prompt: str,
+    followups: list[FollowUpQuestion],
+) -> Coordinate:
+    x = _resolve_value(
+        session, index, f"{key}.x", coord.x, prompt.replace("{axis}", "X"), followups
     )
-
-    return cmd.model_copy(
-        update={
-            "start": cmd.start.model_copy(update={"x": start_x, "y": start_y}),
-            "end": cmd.end.model_copy(update={"x": end_x, "y": end_y}),
-        }
+    y = _resolve_value(
+        session, index, f"{key}.y", coord.y, prompt.replace("{axis}", "Y"), followups
     )
+    if x == coord.x and y == coord.y:
+        return coord
+    return coord.model_copy(update={"x": x, "y": y})
+
+
+def _clarify_command(
+    index: int, command: CommandType, session: SessionMemory, followups: list[FollowUpQuestion]
+) -> CommandType:
+    specs = command_field_specs().get(type(command), ())
+    anchor = getattr(command, "anchor", "")
+    updates: dict[str, Any] = {}
+    for spec in specs:
+        current = getattr(command, spec.name)
+        value: Any
+        if spec.kind == "coordinate":
+            key = spec.key.replace("{anchor}", anchor)
+            prompt = spec.prompt.replace("{anchor}", anchor)
+            value = _resolve_coordinate(session, index, current, key, prompt, followups)
+        elif spec.kind == "points":
+            value = [
+                _resolve_coordinate(
+                    session,
+                    index,
+                    point,
+                    spec.key.replace("{index}", str(position)),
+                    spec.prompt.replace("{number}", str(position + 1)),
+                    followups,
+                )
+                for position, point in enumerate(current)
+            ]
+            if all(new is old for new, old in zip(value, current, strict=True)):
+                continue
+        else:
+            value = _resolve_value(
+                session, index, spec.key, current, spec.prompt, followups, spec.kind
+            )
+        if value is not current and value != current:
+            updates[spec.name] = value
+    return command.model_copy(update=updates) if updates else command
 
 
-def _clarify_rect(
-    index: int, cmd: DrawRect, session: SessionMemory, followups: list[FollowUpQuestion]
-) -> DrawRect:
-    width = _resolve_numeric(
-        session,
-        index,
-        "rect.width",
-        cmd.width,
-        "What width should the rectangle have?",
-        followups,
-    )
-    height = _resolve_numeric(
-        session,
-        index,
-        "rect.height",
-        cmd.height,
-        "What height should the rectangle have?",
-        followups,
-    )
+def clarify_pass(
+    commands: Sequence[CommandType],
+    session: SessionMemory,
+    *,
+    indices: Iterable[int] | None = None,
+) -> ClarifyPass:
+    """Resolve what the session can answer, visiting only ``indices`` if given.
 
-    anchor_key = f"rect.{cmd.anchor}.x"
-    pos_x = _resolve_numeric(
-        session,
-        index,
-        anchor_key,
-        cmd.position.x,
-        f"Provide the rectangle {cmd.anchor} X coordinate.",
-        followups,
-    )
-    pos_y = _resolve_numeric(
-        session,
-        index,
-        anchor_key.replace(".x", ".y"),
-        cmd.position.y,
-        f"Provide the rectangle {cmd.anchor} Y coordinate.",
-        followups,
-    )
+    Question ids keep the command's position in ``commands`` so answers can be
+    supplied for a later pass over just the unresolved entries.
+    """
 
-    return cmd.model_copy(
-        update={
-            "width": width,
-            "height": height,
-            "position": cmd.position.model_copy(update={"x": pos_x, "y": pos_y}),
-        }
-    )
+    resolved = list(commands)
+    followups: list[FollowUpQuestion] = []
+    with session.batch():
+        for index in range(len(resolved)) if indices is None else indices:
+            resolved[index] = _clarify_command(index, resolved[index], session, followups)
+    return ClarifyPass(commands=resolved, followups=followups)
 
 
 def clarify(
     commands: Iterable[CommandType], session: SessionMemory
 ) -> ReadyCommands | list[FollowUpQuestion]:
-    followups: list[FollowUpQuestion] = []
-    resolved: list[CommandType] = []
-
-    for index, command in enumerate(commands):
-        if isinstance(command, DrawCircle):
-            resolved.append(_clarify_circle(index, command, session, followups))
-        elif isinstance(command, DrawLine):
-            resolved.append(_clarify_line(index, command, session, followups))
-        elif isinstance(command, DrawRect):
-            resolved.append(_clarify_rect(index, command, session, followups))
-        else:  # pragma: no cover - defensive
-            resolved.append(command)
-
-    if followups:
-        return followups
-
-    return ReadyCommands(commands=resolved)
-
-
-__all__ = ["clarify", "FollowUpQuestion", "ReadyCommands"]
+    result = clarify_pass(list(commands), session)
+    if result.followups:
+        return result.followups
+
+    return ReadyCommands(commands=result.commands)
+
+
+__all__ = [
+    "ClarifyPass",
+    "FieldSpec",
+    "FollowUpQuestion",
+    "ReadyCommands",
+    "clarify",
+    "clarify_pass",
+    "command_field_specs",
+]
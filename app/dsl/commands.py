@@ -2,9 +2,22 @@
 
 from __future__ import annotations
 
-from typing import Annotated, Literal
+from functools import lru_cache
+from typing import Annotated, Any, Literal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+
+
+class CompilerDefault:
+    """Field marker: the compiler supplies a value, so clarification never asks for it."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "COMPILER_DEFAULT"
+
+
+COMPILER_DEFAULT = CompilerDefault()
 
 
 class Coordinate(BaseModel):
@@ -73,8 +86,12 @@ class DrawArc(Command):
     center: Coordinate = Field(default_factory=Coordinate)
     radius: float | None = Field(default=None, ge=0)
     radius_unit: Literal["mm", "in"] | None = Field(default=None)
-    start_angle: float | None = Field(default=None, description="Start angle in degrees")
-    end_angle: float | None = Field(default=None, description="End angle in degrees")
+    start_angle: Annotated[float | None, COMPILER_DEFAULT] = Field(
+        default=None, description="Start angle in degrees"
+    )
+    end_angle: Annotated[float | None, COMPILER_DEFAULT] = Field(
+        default=None, description="End angle in degrees"
+    )
 
 
 class DrawEllipse(Command):
@@ -105,3 +122,21 @@ class CommandList(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
     commands: list[CommandType]
+
+
+COMMAND_LIST_ADAPTER: TypeAdapter[CommandList] = TypeAdapter(CommandList)
+
+
+def validate_command_list(payload: str | bytes | dict[str, Any]) -> CommandList:
+    """Validate a provider payload; raw JSON is parsed and validated in one pass."""
+
+    if isinstance(payload, str | bytes | bytearray):
+        return COMMAND_LIST_ADAPTER.validate_json(payload)
+    return COMMAND_LIST_ADAPTER.validate_python(payload)
+
+
+@lru_cache(maxsize=1)
+def command_list_schema() -> dict[str, Any]:
+    """JSON schema of :class:`CommandList`, built once per process."""
+
+    return COMMAND_LIST_ADAPTER.json_schema()
@@ -4,9 +4,27 @@ from __future__ import annotations
 
 from collections.abc import Iterable
 from decimal import Decimal
+from typing import Any, TypeVar, cast
 
-from app.cad.models import Arc, Circle, DrawingBundle, Ellipse, Line, Point, Polyline, Rect, Text
-from app.core.units import Unit, to_mm
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel
+
+from app.cad.columnar import ColumnarBundle, require_positive_array
+from app.cad.models import (
+    DEFAULT_LAYER,
+    Arc,
+    Circle,
+    DrawingBundle,
+    Ellipse,
+    Line,
+    Point,
+    Polyline,
+    Rect,
+    Text,
+    require_positive,
+)
+from app.core.units import NM_PER_MM, NumericBackend, Unit, round_nm, to_mm, unit_factor
 
 from .commands import (
     CommandType,
@@ -30,45 +48,250 @@ _DEFAULT_VALUES = {
     "text.height": Decimal("5"),
 }
 
+_M = TypeVar("_M", bound=BaseModel)
+
+_Units = str | Unit | None
+
+
+class _BatchPlan:
+    """Flat, per-type columns gathered from a command list in a single pass.
+
+    Every coordinate lands in one shared array (in command order) so cursor
+    semantics can be resolved with prefix sums; dimensions keep their raw
+    value next to a nanometre-per-unit factor so conversion happens in bulk.
+    Values are rounded to whole nanometres as ``backend`` rounds scalars.
+    """
+
+    def __init__(self, default_unit: Unit, backend: NumericBackend | str | None = None) -> None:
+        self.backend = backend
+        self._factors: dict[_Units, float] = {None: unit_factor(default_unit) * NM_PER_MM}
+        self.xs: list[float] = []
+        self.ys: list[float] = []
+        self.coord_factors: list[float] = []
+        self.relative: list[bool] = []
+        # kind -> coordinate indices / dimension (value, factor) pairs / extra scalars
+        self.coords: dict[str, list[int]] = {}
+        self.dims: dict[str, tuple[list[float], list[float]]] = {}
+        self.extras: dict[str, list[Any]] = {}
+
+    def factor(self, unit: _Units) -> float:
+        factor = self._factors.get(unit)
+        if factor is None:
+            factor = self._factors[unit] = unit_factor(unit) * NM_PER_MM
+        return factor
+
+    def coordinate(self, kind: str, coord: Coordinate) -> None:
+        self.coords.setdefault(kind, []).append(len(self.xs))
+        self.xs.append(coord.x if coord.x is not None else 0.0)
+        self.ys.append(coord.y if coord.y is not None else 0.0)
+        self.coord_factors.append(self.factor(coord.unit))
+        self.relative.append(coord.system == "relative")
+
+    def dimension(self, field: str, value: float | None, unit: _Units) -> None:
+        values, factors = self.dims.setdefault(field, ([], []))
+        if value is None:
+            values.append(float(_DEFAULT_VALUES[field]))
+            factors.append(float(NM_PER_MM))
+        else:
+            values.append(value)
+            factors.append(self.factor(unit))
+
+    def extra(self, key: str, value: Any) -> None:
+        self.extras.setdefault(key, []).append(value)
+
+    def dimension_nm(self, field: str) -> NDArray[np.float64]:
+        values, factors = self.dims.get(field, ([], []))
+        scaled = np.asarray(values, dtype=np.float64) * np.asarray(factors)
+        resolved = round_nm(scaled, backend=self.backend)
+        require_positive_array(resolved / NM_PER_MM, field)
+        return resolved
+
+    def resolve(self, cursor: tuple[int, int]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Absolute coordinates in nanometres, honouring relative offsets.
+
+        A relative coordinate adds to the previous coordinate (or ``cursor`` for
+        the first one), so each value is the running sum since the most recent
+        absolute coordinate. Sums run on whole nanometres and are exact.
+        """
+
+        factors = np.asarray(self.coord_factors, dtype=np.float64)
+        relative = np.asarray(self.relative, dtype=bool)
+        anchors = np.where(relative, -1, np.arange(relative.size))
+        np.maximum.accumulate(anchors, out=anchors)
+        resolved = []
+        for values, start in ((self.xs, cursor[0]), (self.ys, cursor[1])):
+            scaled = np.asarray(values, dtype=np.float64) * factors
+            nm = round_nm(scaled, backend=self.backend).astype(np.int64)
+            running = np.cumsum(nm)
+            before = running - nm
+            base = np.where(anchors >= 0, before[np.maximum(anchors, 0)], -start)
+            resolved.append((running - base).astype(np.float64))
+        return resolved[0], resolved[1]
+
 
 class CommandCompiler:
-    """Compile parsed command models into CAD primitives."""
+    """Compile parsed command models into CAD primitives.
 
-    def __init__(self, *, default_unit: Unit = Unit.MILLIMETER) -> None:
+    Commands are validated when they are parsed, so by default the CAD models are
+    built with their trusted constructors; ``trusted=False`` re-validates them.
+    :meth:`compile_batch` rounds to nanometres with ``backend`` (default: the
+    ``NUMERIC_BACKEND`` setting); :meth:`compile` builds exact ``Decimal`` models.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_unit: Unit = Unit.MILLIMETER,
+        trusted: bool = True,
+        backend: NumericBackend | str | None = None,
+    ) -> None:
         self.default_unit = default_unit
+        self.trusted = trusted
+        self.backend = backend
         self._cursor = Point(x=Decimal("0"), y=Decimal("0"))
 
+    def _build(self, model: type[_M], **values: Any) -> _M:
+        if self.trusted:
+            return cast(_M, cast(Any, model).trusted(**values))
+        return model(**values)
+
+    def _point(self, x: Decimal, y: Decimal) -> Point:
+        return self._build(Point, x=x, y=y)
+
     def _to_mm(self, value: float | int | Decimal | None, unit: str | None) -> Decimal:
         if value is None:
             raise ValueError("Missing numeric value")
-        resolved_unit = unit or self.default_unit.value
-        return to_mm(value, resolved_unit)
+        return to_mm(value, unit or self.default_unit)
 
     def _coordinate(self, coord: Coordinate, *, update_cursor: bool = True) -> Point:
         x_val = coord.x if coord.x is not None else 0.0
         y_val = coord.y if coord.y is not None else 0.0
-        unit = coord.unit or self.default_unit.value
+        unit = coord.unit or self.default_unit
         x_mm = to_mm(x_val, unit)
         y_mm = to_mm(y_val, unit)
 
         if coord.system == "relative":
-            point = Point(x=self._cursor.x + x_mm, y=self._cursor.y + y_mm)
+            point = self._point(self._cursor.x + x_mm, self._cursor.y + y_mm)
         else:
-            point = Point(x=x_mm, y=y_mm)
+            point = self._point(x_mm, y_mm)
 
         if update_cursor:
             self._cursor = point
         return point
 
     def _radius(self, radius: float | None, unit: str | None, *, field: str) -> Decimal:
-        if radius is None:
-            return _DEFAULT_VALUES[field]
-        return self._to_mm(radius, unit)
+        return self._dimension(radius, unit, field=field)
 
     def _dimension(self, value: float | None, unit: str | None, *, field: str) -> Decimal:
         if value is None:
             return _DEFAULT_VALUES[field]
-        return self._to_mm(value, unit)
+        resolved = self._to_mm(value, unit)
+        return require_positive(resolved, field) if self.trusted else resolved
+
+    def compile_batch(self, commands: Iterable[CommandType]) -> ColumnarBundle:
+        """Compile ``commands`` straight into array-backed geometry.
+
+        Produces the same geometry as :meth:`compile` (and leaves the cursor in
+        the same place) but converts units and resolves relative coordinates over
+        flat arrays instead of one coordinate at a time.
+        """
+
+        plan = _BatchPlan(self.default_unit, self.backend)
+        for command in commands:
+            kind = type(command)
+            if kind is DrawCircle:
+                circle = cast(DrawCircle, command)
+                plan.dimension("circle.radius", circle.radius, circle.radius_unit)
+                plan.coordinate("circle", circle.center)
+            elif kind is DrawLine:
+                line = cast(DrawLine, command)
+                plan.coordinate("line.start", line.start)
+                plan.coordinate("line.end", line.end)
+            elif kind is DrawRect:
+                rect = cast(DrawRect, command)
+                plan.dimension("rect.width", rect.width, rect.width_unit)
+                plan.dimension("rect.height", rect.height, rect.height_unit)
+                plan.coordinate("rect", rect.position)
+                plan.extra("rect.center", rect.anchor == "center")
+            elif kind is DrawPolyline:
+                polyline = cast(DrawPolyline, command)
+                if polyline.points:
+                    for coord in polyline.points:
+                        plan.coordinate("polyline", coord)
+                    plan.extra("polyline.size", len(polyline.points))
+                    plan.extra("polyline.closed", polyline.closed)
+            elif kind is DrawArc:
+                arc = cast(DrawArc, command)
+                plan.dimension("arc.radius", arc.radius, arc.radius_unit)
+                plan.coordinate("arc", arc.center)
+                plan.extra("arc.start", arc.start_angle if arc.start_angle is not None else 0.0)
+                plan.extra("arc.end", arc.end_angle if arc.end_angle is not None else 360.0)
+            elif kind is DrawEllipse:
+                ellipse = cast(DrawEllipse, command)
+                plan.dimension("ellipse.rx", ellipse.rx, ellipse.rx_unit)
+                plan.dimension("ellipse.ry", ellipse.ry, ellipse.ry_unit)
+                plan.coordinate("ellipse", ellipse.center)
+                plan.extra("ellipse.rotation", ellipse.rotation or 0.0)
+            elif kind is DrawText:
+                text = cast(DrawText, command)
+                plan.coordinate("text", text.position)
+                plan.dimension("text.height", text.height, text.height_unit)
+                plan.extra("text", text.text)
+        return self._emit_batch(plan)
+
+    def _emit_batch(self, plan: _BatchPlan) -> ColumnarBundle:
+        bundle = ColumnarBundle()
+        if not plan.xs:
+            return bundle
+        cursor = (int(self._cursor.x * NM_PER_MM), int(self._cursor.y * NM_PER_MM))
+        px, py = plan.resolve(cursor)
+        self._cursor = self._point(_mm(px[-1]), _mm(py[-1]))
+        layer = bundle.layers.intern(DEFAULT_LAYER)
+        cols = bundle.columns
+
+        def at(kind: str) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+            index = np.asarray(plan.coords.get(kind, []), dtype=np.int64)
+            return px[index], py[index]
+
+        def rows(*columns: Any) -> NDArray[np.float64]:
+            return np.column_stack(columns) / NM_PER_MM
+
+        def scalars(key: str) -> NDArray[np.float64]:
+            return np.asarray(plan.extras.get(key, []), dtype=np.float64)
+
+        if "circle" in plan.coords:
+            cx, cy = at("circle")
+            cols.circles.extend(rows(cx, cy, plan.dimension_nm("circle.radius")), layer)
+        if "line.start" in plan.coords:
+            (x1, y1), (x2, y2) = at("line.start"), at("line.end")
+            cols.lines.extend(rows(x1, y1, x2, y2), layer)
+        if "rect" in plan.coords:
+            ox, oy = at("rect")
+            width, height = plan.dimension_nm("rect.width"), plan.dimension_nm("rect.height")
+            centred = np.asarray(plan.extras["rect.center"], dtype=bool)
+            ox = np.where(centred, ox - width / 2, ox)
+            oy = np.where(centred, oy - height / 2, oy)
+            cols.rects.extend(rows(ox, oy, width, height), layer)
+        if "polyline" in plan.coords:
+            vx, vy = at("polyline")
+            offsets = np.concatenate(([0], np.cumsum(plan.extras["polyline.size"])))
+            closed = np.asarray(plan.extras["polyline.closed"], dtype=bool)
+            cols.polylines.extend(offsets, rows(vx, vy), closed, layer)
+        if "arc" in plan.coords:
+            cx, cy = at("arc")
+            radius = plan.dimension_nm("arc.radius") / NM_PER_MM
+            angles = np.column_stack((scalars("arc.start"), scalars("arc.end")))
+            cols.arcs.extend(np.column_stack((rows(cx, cy), radius, angles)), layer)
+        if "ellipse" in plan.coords:
+            cx, cy = at("ellipse")
+            axes = rows(plan.dimension_nm("ellipse.rx"), plan.dimension_nm("ellipse.ry"))
+            rotation = scalars("ellipse.rotation")
+            cols.ellipses.extend(np.column_stack((rows(cx, cy), axes, rotation)), layer)
+        if "text" in plan.coords:
+            tx, ty = at("text")
+            cols.texts.strings.extend(plan.extras["text"])
+            cols.texts.extend(rows(tx, ty, plan.dimension_nm("text.height")), layer)
+        return bundle
 
     def compile(self, commands: Iterable[CommandType]) -> DrawingBundle:
         bundle = DrawingBundle()
@@ -77,47 +300,63 @@ class CommandCompiler:
             if isinstance(command, DrawCircle):
                 radius = self._radius(command.radius, command.radius_unit, field="circle.radius")
                 center = self._coordinate(command.center)
-                bundle.circles.append(Circle(center=center, radius=radius))
+                bundle.circles.append(self._build(Circle, center=center, radius=radius))
             elif isinstance(command, DrawLine):
                 start = self._coordinate(command.start)
                 end = self._coordinate(command.end)
-                bundle.lines.append(Line(start=start, end=end))
+                bundle.lines.append(self._build(Line, start=start, end=end))
             elif isinstance(command, DrawRect):
                 width = self._dimension(command.width, command.width_unit, field="rect.width")
                 height = self._dimension(command.height, command.height_unit, field="rect.height")
                 position = self._coordinate(command.position)
                 if command.anchor == "center":
-                    origin = Point(x=position.x - width / 2, y=position.y - height / 2)
+                    origin = self._point(position.x - width / 2, position.y - height / 2)
                 else:
                     origin = position
-                bundle.rects.append(Rect(origin=origin, width=width, height=height))
+                bundle.rects.append(self._build(Rect, origin=origin, width=width, height=height))
             elif isinstance(command, DrawPolyline):
                 points: list[Point] = []
                 for coord in command.points:
                     points.append(self._coordinate(coord))
                 if points:
-                    bundle.polylines.append(Polyline(points=points, closed=command.closed))
+                    bundle.polylines.append(
+                        self._build(Polyline, points=points, closed=command.closed)
+                    )
             elif isinstance(command, DrawArc):
                 radius = self._radius(command.radius, command.radius_unit, field="arc.radius")
                 center = self._coordinate(command.center)
                 start_angle = command.start_angle if command.start_angle is not None else 0.0
                 end_angle = command.end_angle if command.end_angle is not None else 360.0
                 bundle.arcs.append(
-                    Arc(center=center, radius=radius, start_angle=start_angle, end_angle=end_angle)
+                    self._build(
+                        Arc,
+                        center=center,
+                        radius=radius,
+                        start_angle=start_angle,
+                        end_angle=end_angle,
+                    )
                 )
             elif isinstance(command, DrawEllipse):
                 rx = self._dimension(command.rx, command.rx_unit, field="ellipse.rx")
                 ry = self._dimension(command.ry, command.ry_unit, field="ellipse.ry")
                 center = self._coordinate(command.center)
                 bundle.ellipses.append(
-                    Ellipse(center=center, rx=rx, ry=ry, rotation=command.rotation or 0.0)
+                    self._build(
+                        Ellipse, center=center, rx=rx, ry=ry, rotation=command.rotation or 0.0
+                    )
                 )
             elif isinstance(command, DrawText):
                 position = self._coordinate(command.position)
                 height = self._dimension(command.height, command.height_unit, field="text.height")
-                bundle.texts.append(Text(text=command.text, position=position, height=height))
+                bundle.texts.append(
+                    self._build(Text, text=command.text, position=position, height=height)
+                )
 
         return bundle
 
 
+def _mm(nanometres: float) -> Decimal:
+    return Decimal(int(nanometres)) / NM_PER_MM
+
+
 __all__ = ["CommandCompiler"]
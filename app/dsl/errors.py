@@ -23,6 +23,8 @@ E_RADIUS_REQUIRED = ("E102", "Circle radius is required for this utterance.")
 E_DIMENSION_REQUIRED = ("E103", "Rectangle width and height are required.")
 E_PROVIDER_MISSING = ("E200", "LLM provider is not configured.")
 E_SCHEMA_VALIDATION = ("E201", "Provider response did not satisfy the command schema.")
+E_DEADLINE_EXCEEDED = ("E202", "LLM parsing ran out of its latency budget.")
+E_CASSETTE_MISS = ("E203", "Replay cassette has no recording for this prompt.")
 E_MEMORY_EXPIRED = ("E300", "Session memory entry has expired.")
 
 
@@ -3,13 +3,17 @@
 from __future__ import annotations
 
 import json
+from functools import partial
 from typing import Any
 
 from pydantic import ValidationError
 
-from .commands import CommandList, CommandType
-from .errors import E_SCHEMA_VALIDATION, raise_error
+from app.core.deadline import Deadline, DeadlineExceeded, call_with_timeout
+
+from .commands import CommandType, command_list_schema, validate_command_list
+from .errors import E_DEADLINE_EXCEEDED, E_SCHEMA_VALIDATION, ParseError, raise_error
 from .llm_provider import BaseLLMProvider, configure_provider
+from .parse_rule import parse_rule
 
 _PROMPT_TEMPLATE = """
 You are a CAD command extraction assistant.
@@ -47,11 +51,30 @@ class LLMParser:
             prompt += "\nPlease fix them in the next response."
         return prompt
 
-    def parse(self, text: str, context: dict[str, Any] | None = None) -> list[CommandType]:
-        schema = CommandList.model_json_schema()
+    @staticmethod
+    def _fallback(text: str, errors: list[dict[str, Any]] | None) -> list[CommandType]:
+        """Deterministic parsing used once the latency budget is spent."""
+
+        try:
+            return parse_rule(text)
+        except ParseError as exc:
+            detail = json.dumps(errors, indent=2, sort_keys=True) if errors else None
+            raise_error(E_DEADLINE_EXCEEDED, detail=detail, cause=exc)
+
+    def parse(
+        self,
+        text: str,
+        context: dict[str, Any] | None = None,
+        *,
+        deadline: Deadline | None = None,
+    ) -> list[CommandType]:
+        schema = command_list_schema()
         errors: list[dict[str, Any]] | None = None
 
         for attempt in range(self.max_retries):
+            if deadline is not None and deadline.expired:
+                return self._fallback(text, errors)
+
             prompt = self._format_prompt(text, schema, errors, context=context)
             provider_context: dict[str, Any] = {"attempt": attempt}
             if context:
@@ -59,38 +82,52 @@ class LLMParser:
             if errors:
                 provider_context["errors"] = errors
 
-            payload = self.provider.parse(prompt, schema, context=provider_context)
-            if isinstance(payload, str):
+            if deadline is None:
+                payload = self.provider.parse(prompt, schema, context=provider_context)
+            else:
+                timeout = deadline.remaining()
+                provider_context["timeout"] = timeout
                 try:
-                    payload = json.loads(payload)
-                except json.JSONDecodeError as exc:
-                    errors = [{"type": "json_parse_error", "message": str(exc)}]
-                    continue
-
+                    payload = call_with_timeout(
+                        partial(self.provider.parse, prompt, schema, context=provider_context),
+                        timeout,
+                    )
+                except DeadlineExceeded:
+                    return self._fallback(text, errors)
             try:
-                envelope = CommandList.model_validate(payload)
+                envelope = validate_command_list(payload)
             except ValidationError as exc:
-                errors = [
-                    {
-                        "loc": e["loc"],
-                        "msg": e["msg"],
-                        "type": e["type"],
-                    }
-                    for e in exc.errors()
-                ]
+                details = exc.errors()
+                if details and details[0]["type"] == "json_invalid":
+                    errors = [{"type": "json_parse_error", "message": details[0]["msg"]}]
+                else:
+                    errors = [
+                        {
+                            "loc": e["loc"],
+                            "msg": e["msg"],
+                            "type": e["type"],
+                        }
+                        for e in details
+                    ]
                 continue
 
-            return list(envelope.commands)
+            commands = list(envelope.commands)
+            self.provider.record_result(text, commands)
+            return commands
 
         detail = json.dumps(errors, indent=2, sort_keys=True) if errors else None
         raise_error(E_SCHEMA_VALIDATION, detail=detail)
 
 
 def llm_parse(
-    text: str, context: dict[str, Any] | None = None, *, parser: LLMParser | None = None
+    text: str,
+    context: dict[str, Any] | None = None,
+    *,
+    parser: LLMParser | None = None,
+    deadline: Deadline | None = None,
 ) -> list[CommandType]:
     parser = parser or LLMParser()
-    return parser.parse(text, context=context)
+    return parser.parse(text, context=context, deadline=deadline)
 
 
 __all__ = ["llm_parse", "LLMParser"]
@@ -6,15 +6,33 @@ import json
 import os
 from abc import ABC, abstractmethod
 from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
-from .errors import E_PROVIDER_MISSING, ParseError, raise_error
+from .commands import CommandType
+from .errors import E_PROVIDER_MISSING, raise_error
+
+
+@dataclass(frozen=True, slots=True)
+class PromptUsage:
+    """Size of the prompt sent on a single provider call."""
+
+    chars: int
+    tokens: int
+    history_turns: int
+
+    def __str__(self) -> str:
+        return f"{self.chars} chars (~{self.tokens} tokens, {self.history_turns} history turn(s))"
 
 
 class BaseLLMProvider(ABC):
-    """Abstract base class representing a model provider."""
+    """Abstract base class representing a model provider.
+
+    Providers that build their own prompts set ``last_usage`` on every call.
+    """
 
     name: str = "base"
+    last_usage: PromptUsage | None = None
 
     def __init__(self, **config: Any) -> None:
         self.config = config
@@ -25,6 +43,14 @@ class BaseLLMProvider(ABC):
     ) -> dict[str, Any] | str:
         """Parse ``text`` against ``schema`` using the provider."""
 
+    def record_result(self, utterance: str, commands: list[CommandType]) -> None:
+        """Hook invoked with the validated commands for ``utterance``.
+
+        Providers that keep conversational state override this; the default is a no-op.
+        """
+
+        del utterance, commands
+
 
 class MockProvider(BaseLLMProvider):
     """Simple provider used in tests and development."""
@@ -53,13 +79,28 @@ ProviderFactory = Callable[[dict[str, Any]], BaseLLMProvider]
 
 
 class ProviderRegistry:
-    def __init__(self) -> None:
+    """Provider factories by name.
+
+    ``loader`` registers further providers on the first lookup. Loading them
+    lazily keeps ``app.dsl`` importable on its own, without an import cycle
+    with ``app.ai``, and lets real import errors surface instead of leaving
+    only the built-in providers registered.
+    """
+
+    def __init__(self, loader: Callable[[], None] | None = None) -> None:
         self._registry: dict[str, ProviderFactory] = {}
+        self._loader = loader
 
     def register(self, name: str, factory: ProviderFactory) -> None:
         self._registry[name.lower()] = factory
 
+    def _load(self) -> None:
+        if self._loader is not None:
+            self._loader()
+            self._loader = None
+
     def get(self, name: str, config: dict[str, Any]) -> BaseLLMProvider:
+        self._load()
         try:
             factory = self._registry[name.lower()]
         except KeyError as exc:  # pragma: no cover - defensive
@@ -71,19 +112,18 @@ class ProviderRegistry:
         return factory(config)
 
     def available(self) -> list[str]:  # pragma: no cover - trivial
+        self._load()
         return sorted(self._registry.keys())
 
 
-REGISTRY = ProviderRegistry()
-REGISTRY.register("mock", lambda cfg: MockProvider(**cfg))
+def _load_ai_providers() -> None:
+    """Import ``app.ai``, which registers the LangChain and cassette providers."""
+
+    import app.ai  # noqa: F401
 
-try:  # Register optional LangChain providers when available
-    from app.ai import register_langchain_providers
 
-    register_langchain_providers(REGISTRY)
-except ParseError:
-    # If LangChain dependencies are missing we continue with the mock provider only.
-    pass
+REGISTRY = ProviderRegistry(loader=_load_ai_providers)
+REGISTRY.register("mock", lambda cfg: MockProvider(**cfg))
 
 
 def configure_provider(name: str | None = None, **overrides: Any) -> BaseLLMProvider:
@@ -116,4 +156,4 @@ def configure_provider(name: str | None = None, **overrides: Any) -> BaseLLMProv
     return REGISTRY.get(provider_name, config)
 
 
-__all__ = ["BaseLLMProvider", "MockProvider", "REGISTRY", "configure_provider"]
+__all__ = ["BaseLLMProvider", "MockProvider", "PromptUsage", "REGISTRY", "configure_provider"]
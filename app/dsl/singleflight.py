@@ -0,0 +1,122 @@
+"""Coalesce identical in-flight LLM parse requests into a single provider call."""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from app.core.deadline import Deadline, DeadlineExceeded
+
+from .commands import CommandType
+from .llm_parser import LLMParser
+
+
+@dataclass(slots=True)
+class _Call:
+    done: threading.Event = field(default_factory=threading.Event)
+    result: Any = None
+    error: BaseException | None = None
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any], *, timeout: float | None = None) -> Any:
+        """Execute ``func`` for ``key`` or wait for the identical call already running.
+
+        ``timeout`` only bounds how long a follower waits for the leader; the
+        leader itself runs ``func`` to completion.
+        """
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+
+        if leader:
+            try:
+                call.result = func()
+            except BaseException as exc:
+                call.error = exc
+                raise
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.done.set()
+            return call.result
+
+        if not call.done.wait(timeout):
+            raise DeadlineExceeded(f"Coalesced call for '{key}' did not finish in time.")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+def normalise_prompt(text: str, context: dict[str, Any] | None = None) -> str:
+    """Key used to detect identical requests: whitespace folded text plus context.
+
+    Case is kept, since it can be content (``write "ABC"`` is not ``write "abc"``).
+    """
+
+    utterance = " ".join(text.split())
+    return f"{utterance}\x1f{json.dumps(context or {}, sort_keys=True, default=str)}"
+
+
+class SingleFlightParser(LLMParser):
+    """:class:`LLMParser` that shares one provider round-trip between identical requests."""
+
+    def __init__(self, *args: Any, group: SingleFlight | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.group = group or SingleFlight()
+
+    def parse(
+        self,
+        text: str,
+        context: dict[str, Any] | None = None,
+        *,
+        deadline: Deadline | None = None,
+    ) -> list[CommandType]:
+        key = normalise_prompt(text, context)
+        timeout = deadline.remaining() if deadline is not None else None
+        try:
+            commands = self.group.do(
+                key,
+                lambda: super(SingleFlightParser, self).parse(text, context, deadline=deadline),
+                timeout=timeout,
+            )
+        except DeadlineExceeded:
+            # The shared call outlived this caller's budget; degrade like LLMParser does.
+            return self._fallback(text, None)
+        # Every caller receives its own list so later clarification cannot leak across them.
+        return list(commands)
+
+
+__all__ = ["SingleFlight", "SingleFlightParser", "normalise_prompt"]
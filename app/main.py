@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import sys
 from pathlib import Path
 
+from app.cad.profiles import DEFAULT_PROFILE, OUTPUT_PROFILES
+from app.cli.answers import AnswerSheet
 from app.cli.executor import execute_commands, load_commands
 
 
@@ -14,7 +17,7 @@ def build_parser() -> argparse.ArgumentParser:
         "--out",
         type=Path,
         default=Path("outputs/cli_output.dxf"),
-        help="Destination DXF file path",
+        help="Destination DXF file path; .gz compresses while writing and - writes to stdout",
     )
     parser.add_argument(
         "--no-ai",
@@ -26,6 +29,80 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Do not prompt for missing information; always use defaults",
     )
+    parser.add_argument(
+        "--deadline-ms",
+        type=float,
+        default=None,
+        help="Latency budget in milliseconds for LLM parsing of each command",
+    )
+    parser.add_argument(
+        "--run-deadline-ms",
+        type=float,
+        default=None,
+        help="Latency budget in milliseconds for LLM parsing across the whole run",
+    )
+    parser.add_argument(
+        "--batch-clarify",
+        action="store_true",
+        help="Parse every command first, then answer all follow-up questions in one round",
+    )
+    parser.add_argument(
+        "--answers",
+        type=Path,
+        default=None,
+        help="JSON/YAML answer sheet keyed by question id or field (implies --batch-clarify)",
+    )
+    parser.add_argument(
+        "--memory",
+        type=Path,
+        default=None,
+        help="Project memory store for clarification defaults (.json, or .db/.sqlite for SQLite)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream entities straight to the DXF file instead of building it in memory",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Encode large drawings in this many processes (implies --stream)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUT_PROFILES),
+        default=DEFAULT_PROFILE.name,
+        help="Output profile: ascii (R2018), binary (R2018 binary DXF) or r12 (minimal R12)",
+    )
+    parser.add_argument(
+        "--precision",
+        type=int,
+        default=None,
+        help="Round coordinates to this many decimal places (ASCII formats)",
+    )
+    parser.add_argument(
+        "--instances",
+        action="store_true",
+        help="Write repeated groups of entities once as blocks placed with INSERTs",
+    )
+    parser.add_argument(
+        "--instance-rotation",
+        action="store_true",
+        help="Also match rotated copies when instancing (implies --instances)",
+    )
+    parser.add_argument(
+        "--merge-lines",
+        action="store_true",
+        help="Join chains of lines that share endpoints into polylines",
+    )
+    parser.add_argument(
+        "--simplify-mm",
+        type=float,
+        default=None,
+        help="Simplify polylines to within this tolerance in millimetres "
+        "(default: SIMPLIFY_TOLERANCE_MM)",
+    )
     return parser
 
 
@@ -33,22 +110,64 @@ def main(argv: list[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
 
-    commands = load_commands(args.cmd, sys.stdin)
-    if not commands:
-        raise SystemExit("No commands provided")
-
-    try:
-        output = execute_commands(
-            commands,
-            output=args.out,
-            enable_ai=not args.no_ai,
-            interactive=not args.non_interactive,
-        )
-    except RuntimeError as exc:  # pragma: no cover - user feedback path
-        print(f"Error: {exc}")
-        raise SystemExit(2) from exc
-
-    print(f"DXF saved to: {output}")
+    if args.precision is not None and args.precision < 0:
+        parser.error("--precision must be zero or positive")
+    if OUTPUT_PROFILES[args.format].binary:
+        if args.stream or args.workers > 1:
+            parser.error("--format binary cannot be combined with --stream or --workers")
+        if args.precision is not None:
+            parser.error("--precision only applies to ASCII formats")
+    if args.simplify_mm is not None and args.simplify_mm <= 0:
+        parser.error("--simplify-mm must be greater than 0")
+
+    instancing = args.instances or args.instance_rotation
+    if instancing and (args.stream or args.workers > 1 or OUTPUT_PROFILES[args.format].minimal):
+        parser.error("--instances cannot be combined with --stream, --workers or --format r12")
+
+    # With ``--out -`` stdout carries only the DXF; prompts and messages go to stderr.
+    to_stdout = str(args.out) == "-"
+    target = sys.stdout.buffer if to_stdout else args.out
+    messages = contextlib.redirect_stdout(sys.stderr) if to_stdout else contextlib.nullcontext()
+    with messages:
+        commands = load_commands(args.cmd, sys.stdin)
+        if not commands:
+            raise SystemExit("No commands provided")
+
+        try:
+            answers = AnswerSheet.from_file(args.answers) if args.answers else None
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"Could not load answer sheet: {exc}") from exc
+
+        try:
+            summary = execute_commands(
+                commands,
+                output=target,
+                enable_ai=not args.no_ai,
+                interactive=not args.non_interactive,
+                deadline_ms=args.deadline_ms,
+                run_deadline_ms=args.run_deadline_ms,
+                answers=answers,
+                batch_clarify=args.batch_clarify,
+                memory_store=args.memory,
+                stream=args.stream,
+                workers=args.workers,
+                output_format=args.format,
+                precision=args.precision,
+                instances=instancing,
+                instance_rotation=args.instance_rotation,
+                merge_lines=args.merge_lines,
+                simplify_tolerance_mm=args.simplify_mm,
+            )
+        except RuntimeError as exc:  # pragma: no cover - user feedback path
+            print(f"Error: {exc}")
+            raise SystemExit(2) from exc
+
+        if summary.simplify is not None:
+            print(f"Simplified polylines: {summary.simplify}")
+        if summary.prompt is not None:
+            print(f"Largest LLM prompt: {summary.prompt}")
+        print(f"DXF saved to: {summary.path or 'stdout'}")
+        print(f"Drawing: {summary}")
 
 
 if __name__ == "__main__":
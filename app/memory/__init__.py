@@ -1,6 +1,15 @@
 """Memory utilities for the DSL clarification engine."""
 
-from .session import SessionMemory
-from .store import ProjectMemoryStore
+from .session import SessionManager, SessionManagerStats, SessionMemory, SessionMemoryStats
+from .store import MemoryStore, ProjectMemoryStore, SQLiteMemoryStore, open_store
 
-__all__ = ["SessionMemory", "ProjectMemoryStore"]
+__all__ = [
+    "SessionManager",
+    "SessionManagerStats",
+    "SessionMemory",
+    "SessionMemoryStats",
+    "MemoryStore",
+    "ProjectMemoryStore",
+    "SQLiteMemoryStore",
+    "open_store",
+]
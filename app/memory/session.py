@@ -2,69 +2,395 @@
 
 from __future__ import annotations
 
+import functools
+import heapq
+import itertools
 import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
 from typing import Any
 
 from app.dsl.errors import E_MEMORY_EXPIRED, raise_error
 
-from .store import ProjectMemoryStore
+from .store import MemoryStore
+
+Clock = Callable[[], float]
+
+# Rebuild an expiry heap once stale entries outnumber live ones by this factor.
+_COMPACT_FACTOR = 2
+_COMPACT_SLACK = 64
+
+
+@dataclass(slots=True)
+class SessionMemoryStats:
+    entries: int
+    heap_size: int
+    evicted: int
+    expired: int
 
 
 class SessionMemory:
+    """Per-session key/value memory backed by project-level defaults.
+
+    Entries live in insertion/access order so ``max_entries`` can evict the
+    least recently used key in O(1). Expiry times are tracked in a min-heap and
+    :meth:`sweep` drops every expired entry without scanning the whole session.
+
+    With ``strict_expiry`` (the default) reading an expired key raises
+    ``E300`` so callers can re-ask the user; otherwise expired keys are evicted
+    quietly, both on read and by automatic sweeps on write.
+    """
+
     def __init__(
         self,
         *,
         ttl: float = 600.0,
-        store: ProjectMemoryStore | None = None,
+        store: MemoryStore | None = None,
         project_id: str = "default",
+        max_entries: int | None = None,
+        strict_expiry: bool = True,
+        defaults: dict[str, Any] | None = None,
+        clock: Clock = time.time,
     ) -> None:
         self.ttl = ttl
         self.store = store
         self.project_id = project_id
-        self._data: dict[str, tuple[Any, float | None]] = {}
-        self._defaults: dict[str, Any] = store.load_project(project_id) if store else {}
+        self.max_entries = max_entries
+        self.strict_expiry = strict_expiry
+        self.clock = clock
+        self._data: OrderedDict[str, tuple[Any, float | None]] = OrderedDict()
+        self._heap: list[tuple[float, str]] = []
+        self._defaults: dict[str, Any] = (
+            defaults if defaults is not None else (store.load_project(project_id) if store else {})
+        )
+        self._listener: Callable[[int], None] | None = None
+        self.evicted = 0
+        self.expired = 0
 
     def _expiry_for(self, ttl: float | None) -> float | None:
         effective_ttl = self.ttl if ttl is None else ttl
         if effective_ttl <= 0:
             return None
-        return time.time() + effective_ttl
+        return self.clock() + effective_ttl
+
+    def _changed(self, delta: int) -> None:
+        if self._listener is not None and delta:
+            self._listener(delta)
+
+    def _remove(self, key: str) -> tuple[Any, float | None]:
+        entry = self._data.pop(key)
+        self._changed(-1)
+        return entry
 
     def set(self, key: str, value: Any, *, ttl: float | None = None, persist: bool = False) -> None:
-        self._data[key] = (value, self._expiry_for(ttl))
+        expires = self._expiry_for(ttl)
+        is_new = key not in self._data
+        self._data[key] = (value, expires)
+        self._data.move_to_end(key)
+        if expires is not None:
+            heapq.heappush(self._heap, (expires, key))
+        if is_new:
+            self._changed(1)
+        if not self.strict_expiry and self._heap and self._heap[0][0] < self.clock():
+            self.sweep()
+        if self.max_entries is not None:
+            while len(self._data) > self.max_entries:
+                self.evict_lru()
+        self._maybe_compact()
         if persist:
             self.remember_default(key, value)
 
     def get(self, key: str, default: Any | None = None) -> Any:
-        if key in self._data:
-            value, expires = self._data[key]
-            if expires is not None and expires < time.time():
-                self._data.pop(key, None)
-                raise_error(E_MEMORY_EXPIRED, detail=f"Key '{key}' expired.")
-            return value
+        entry = self._data.get(key)
+        if entry is not None:
+            value, expires = entry
+            if expires is not None and expires < self.clock():
+                self._remove(key)
+                self.expired += 1
+                if self.strict_expiry:
+                    raise_error(E_MEMORY_EXPIRED, detail=f"Key '{key}' expired.")
+            else:
+                self._data.move_to_end(key)
+                return value
         if key in self._defaults:
             return self._defaults[key]
         return default
 
     def delete(self, key: str) -> None:
-        self._data.pop(key, None)
+        if key in self._data:
+            self._remove(key)
 
     def pop(self, key: str, default: Any | None = None) -> Any:
         if key not in self._data:
             return default
-        value, _ = self._data.pop(key)
+        value, expires = self._remove(key)
+        if not self.strict_expiry and expires is not None and expires < self.clock():
+            self.expired += 1
+            return default
         return value
 
+    def evict_lru(self) -> str | None:
+        """Drop the least recently used entry; returns its key."""
+
+        if not self._data:
+            return None
+        key, _ = self._data.popitem(last=False)
+        self._changed(-1)
+        self.evicted += 1
+        return key
+
+    def sweep(self, now: float | None = None) -> int:
+        """Remove every entry whose TTL has passed; returns how many were dropped."""
+
+        now = self.clock() if now is None else now
+        heap = self._heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            expires, key = heapq.heappop(heap)
+            entry = self._data.get(key)
+            # Skip heap entries left behind by overwrites, deletes and evictions.
+            if entry is not None and entry[1] == expires:
+                self._remove(key)
+                removed += 1
+        self.expired += removed
+        return removed
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > _COMPACT_FACTOR * len(self._data) + _COMPACT_SLACK:
+            self._heap = [
+                (expires, key) for key, (_, expires) in self._data.items() if expires is not None
+            ]
+            heapq.heapify(self._heap)
+
     def remember_default(self, key: str, value: Any) -> None:
+        if key in self._defaults and self._defaults[key] == value:
+            return
         self._defaults[key] = value
         if self.store:
             self.store.set_value(self.project_id, key, value)
 
+    @contextmanager
+    def batch(self) -> Iterator[SessionMemory]:
+        """Persist every default remembered inside the block in one store write."""
+
+        if self.store is None:
+            yield self
+            return
+        with self.store.batch():
+            yield self
+
     def get_default(self, key: str, default: Any | None = None) -> Any:
         return self._defaults.get(key, default)
 
+    def stats(self) -> SessionMemoryStats:
+        return SessionMemoryStats(
+            entries=len(self._data),
+            heap_size=len(self._heap),
+            evicted=self.evicted,
+            expired=self.expired,
+        )
+
+    def __len__(self) -> int:
+        return len(self._data)
+
     def clear(self) -> None:  # pragma: no cover - utility
+        self._changed(-len(self._data))
         self._data.clear()
+        self._heap.clear()
+
+
+@dataclass(slots=True)
+class SessionManagerStats:
+    sessions: int
+    projects: int
+    entries: int
+    heap_size: int
+    created: int
+    evicted_sessions: int
+    expired_sessions: int
+    evicted_entries: int
+
+
+class SessionManager:
+    """Hold many :class:`SessionMemory` instances for a long-running service.
+
+    * Lookups are O(1); each access refreshes the session's idle deadline.
+    * Idle sessions expire through a min-heap sweep (one heap entry per session).
+    * ``max_sessions`` and ``max_total_entries`` evict least recently used
+      sessions; ``max_entries_per_session`` bounds each session individually.
+    * Sessions created here expire entries quietly instead of raising ``E300``.
+    * Sessions of the same project share one defaults dict, loaded once and
+      released with the project's last session.
+    """
+
+    def __init__(
+        self,
+        *,
+        session_ttl: float = 1800.0,
+        entry_ttl: float = 600.0,
+        max_sessions: int = 10_000,
+        max_entries_per_session: int | None = 256,
+        max_total_entries: int | None = 1_000_000,
+        store: MemoryStore | None = None,
+        clock: Clock = time.time,
+    ) -> None:
+        self.session_ttl = session_ttl
+        self.entry_ttl = entry_ttl
+        self.max_sessions = max_sessions
+        self.max_entries_per_session = max_entries_per_session
+        self.max_total_entries = max_total_entries
+        self.store = store
+        self.clock = clock
+        self._sessions: OrderedDict[str, SessionMemory] = OrderedDict()
+        self._deadlines: dict[str, float] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._counter = itertools.count()
+        self._project_defaults: dict[str, dict[str, Any]] = {}
+        self._project_sessions: dict[str, int] = {}
+        self._entries = 0
+        self._enforcing = False
+        self.created = 0
+        self.evicted_sessions = 0
+        self.expired_sessions = 0
+        self.evicted_entries = 0
+
+    def _defaults_for(self, project_id: str) -> dict[str, Any]:
+        """Shared defaults of ``project_id``, counted against one more session."""
+
+        defaults = self._project_defaults.get(project_id)
+        if defaults is None:
+            defaults = self.store.load_project(project_id) if self.store else {}
+            self._project_defaults[project_id] = defaults
+        self._project_sessions[project_id] = self._project_sessions.get(project_id, 0) + 1
+        return defaults
+
+    def _on_entries_changed(self, session_id: str, delta: int) -> None:
+        self._entries += delta
+        if (
+            self._enforcing
+            or self.max_total_entries is None
+            or self._entries <= self.max_total_entries
+        ):
+            return
+        self._enforcing = True
+        try:
+            self._enforce_total(session_id)
+        finally:
+            self._enforcing = False
+
+    def _enforce_total(self, session_id: str) -> None:
+        limit = self.max_total_entries
+        if limit is None:
+            return
+        # Evict whole sessions, oldest first, sparing the one being written to.
+        for victim in list(self._sessions):
+            if self._entries <= limit:
+                return
+            if victim != session_id:
+                self._discard(victim)
+                self.evicted_sessions += 1
+        current = self._sessions.get(session_id)
+        while current is not None and self._entries > limit:
+            if current.evict_lru() is None:
+                break
+            self.evicted_entries += 1
+
+    def get(self, session_id: str, *, project_id: str = "default") -> SessionMemory:
+        """Return the session, creating it if needed, and refresh its idle deadline."""
+
+        now = self.clock()
+        self.sweep(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = SessionMemory(
+                ttl=self.entry_ttl,
+                store=self.store,
+                project_id=project_id,
+                max_entries=self.max_entries_per_session,
+                strict_expiry=False,
+                defaults=self._defaults_for(project_id),
+                clock=self.clock,
+            )
+            session._listener = functools.partial(self._on_entries_changed, session_id)
+            self._sessions[session_id] = session
+            self.created += 1
+            deadline = now + self.session_ttl
+            heapq.heappush(self._heap, (deadline, next(self._counter), session_id))
+            while len(self._sessions) > self.max_sessions:
+                oldest = next(iter(self._sessions))
+                self._discard(oldest)
+                self.evicted_sessions += 1
+        else:
+            self._sessions.move_to_end(session_id)
+            deadline = now + self.session_ttl
+        self._deadlines[session_id] = deadline
+        self._maybe_compact()
+        return session
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._sessions
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def drop(self, session_id: str) -> None:
+        if session_id in self._sessions:
+            self._discard(session_id)
+
+    def _discard(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._deadlines.pop(session_id, None)
+        self._entries -= len(session)
+        session._listener = None
+        project_id = session.project_id
+        remaining = self._project_sessions[project_id] - 1
+        if remaining:
+            self._project_sessions[project_id] = remaining
+        else:
+            del self._project_sessions[project_id]
+            del self._project_defaults[project_id]
+
+    def sweep(self, now: float | None = None) -> int:
+        """Expire idle sessions; returns how many were dropped."""
+
+        now = self.clock() if now is None else now
+        heap = self._heap
+        removed = 0
+        while heap and heap[0][0] < now:
+            _, _, session_id = heapq.heappop(heap)
+            deadline = self._deadlines.get(session_id)
+            if deadline is None:
+                continue  # already dropped or evicted
+            if deadline >= now:
+                # Touched since it was scheduled: keep a single entry at its new deadline.
+                heapq.heappush(heap, (deadline, next(self._counter), session_id))
+                continue
+            self._discard(session_id)
+            removed += 1
+        self.expired_sessions += removed
+        return removed
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > _COMPACT_FACTOR * len(self._sessions) + _COMPACT_SLACK:
+            self._heap = [
+                (deadline, next(self._counter), session_id)
+                for session_id, deadline in self._deadlines.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def stats(self) -> SessionManagerStats:
+        return SessionManagerStats(
+            sessions=len(self._sessions),
+            projects=len(self._project_defaults),
+            entries=self._entries,
+            heap_size=len(self._heap),
+            created=self.created,
+            evicted_sessions=self.evicted_sessions,
+            expired_sessions=self.expired_sessions,
+            evicted_entries=self.evicted_entries,
+        )
 
 
-__all__ = ["SessionMemory"]
+__all__ = ["SessionManager", "SessionManagerStats", "SessionMemory", "SessionMemoryStats"]
@@ -1,45 +1,325 @@
-"""Project scoped persistence for clarification defaults."""
+"""Project scoped persistence for clarification defaults.
+
+Two backends implement :class:`MemoryStore`:
+
+* :class:`ProjectMemoryStore` keeps the original pretty-printed JSON file.
+  Writes are atomic (temp file + rename) and guarded by an advisory lock.
+* :class:`SQLiteMemoryStore` keeps one row per project key in a WAL-mode
+  database, so concurrent processes can read while another writes.
+
+Both backends coalesce the writes made inside :meth:`MemoryStore.batch` into a
+single file write or transaction, and skip writes when a value is unchanged.
+The JSON layout (``{project_id: {key: value}}``) is the import/export format
+for every backend.
+"""
 
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+if sys.platform != "win32":
+    import fcntl
+
+ProjectData = dict[str, dict[str, Any]]
+
+_DELETED = object()
+
+SQLITE_SUFFIXES = frozenset({".db", ".sqlite", ".sqlite3"})
+
+
+def _atomic_write_json(path: Path, data: ProjectData) -> None:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf8") as fh:
+            json.dump(data, fh, indent=2, sort_keys=True)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+class MemoryStore(ABC):
+    """Backend interface for project-level clarification defaults."""
+
+    @abstractmethod
+    def load_project(self, project_id: str) -> dict[str, Any]:
+        """Return a copy of every stored key for ``project_id``."""
+
+    @abstractmethod
+    def set_values(self, project_id: str, values: Mapping[str, Any]) -> None:
+        """Store several keys for ``project_id`` at once."""
+
+    @abstractmethod
+    def delete_value(self, project_id: str, key: str) -> None: ...
+
+    @abstractmethod
+    def projects(self) -> list[str]: ...
+
+    def set_value(self, project_id: str, key: str, value: Any) -> None:
+        self.set_values(project_id, {key: value})
+
+    @contextmanager
+    def batch(self) -> Iterator[MemoryStore]:
+        """Group writes so they are persisted together when the block exits."""
+
+        yield self
+
+    def export_data(self) -> ProjectData:
+        return {project_id: self.load_project(project_id) for project_id in self.projects()}
+
+    def export_json(self, path: str | Path) -> Path:
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        _atomic_write_json(target, self.export_data())
+        return target
+
+    def import_json(self, path: str | Path) -> int:
+        """Merge a JSON export into this store; returns the number of keys read."""
+
+        with Path(path).open("r", encoding="utf8") as fh:
+            data = json.load(fh)
+        if not isinstance(data, Mapping):
+            raise ValueError(f"Memory export '{path}' must map project ids to key/value objects.")
+        count = 0
+        with self.batch():
+            for project_id, values in data.items():
+                if not isinstance(values, Mapping):
+                    raise ValueError(f"Project '{project_id}' in '{path}' must be an object.")
+                self.set_values(str(project_id), values)
+                count += len(values)
+        return count
+
+    def close(self) -> None:
+        """Release backend resources; the JSON store holds none between calls."""
+
+        return None
+
 
-class ProjectMemoryStore:
+class ProjectMemoryStore(MemoryStore):
     """Simple JSON backed key-value store keyed by project identifier."""
 
     def __init__(self, path: str | Path) -> None:
         self.path = Path(path)
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock_path = self.path.with_name(f"{self.path.name}.lock")
+        self._thread_lock = threading.RLock()
+        self._batch_depth = 0
+        self._batch_data: ProjectData | None = None
+        self._dirty = False
         if not self.path.exists():
-            self._write({})
+            with self._locked():
+                if not self.path.exists():
+                    self._write({})
 
-    def _read(self) -> dict[str, dict[str, Any]]:
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            if sys.platform == "win32" or self._batch_depth:
+                yield
+                return
+            with self._lock_path.open("a") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self) -> ProjectData:
+        if self._batch_data is not None:
+            return self._batch_data
         with self.path.open("r", encoding="utf8") as fh:
             return json.load(fh)
 
-    def _write(self, data: dict[str, dict[str, Any]]) -> None:
-        with self.path.open("w", encoding="utf8") as fh:
-            json.dump(data, fh, indent=2, sort_keys=True)
+    def _write(self, data: ProjectData) -> None:
+        if self._batch_data is not None:
+            self._dirty = True
+            return
+        _atomic_write_json(self.path, data)
+
+    @contextmanager
+    def batch(self) -> Iterator[MemoryStore]:
+        with self._locked():
+            outermost = self._batch_depth == 0
+            if outermost:
+                self._batch_data = self._read()
+                self._dirty = False
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if outermost:
+                    data, dirty = self._batch_data, self._dirty
+                    self._batch_data = None
+                    if dirty and data is not None:
+                        self._write(data)
 
     def load_project(self, project_id: str) -> dict[str, Any]:
         data = self._read()
         return data.get(project_id, {}).copy()
 
-    def set_value(self, project_id: str, key: str, value: Any) -> None:
-        data = self._read()
-        project = data.setdefault(project_id, {})
-        project[key] = value
-        self._write(data)
+    def projects(self) -> list[str]:
+        return sorted(self._read())
+
+    def set_values(self, project_id: str, values: Mapping[str, Any]) -> None:
+        with self._locked():
+            data = self._read()
+            project = data.setdefault(project_id, {})
+            changed = {
+                key: value
+                for key, value in values.items()
+                if key not in project or project[key] != value
+            }
+            if changed:
+                project.update(changed)
+                self._write(data)
 
     def delete_value(self, project_id: str, key: str) -> None:
-        data = self._read()
-        project = data.get(project_id)
-        if project and key in project:
-            project.pop(key)
-            self._write(data)
+        with self._locked():
+            data = self._read()
+            project = data.get(project_id)
+            if project and key in project:
+                project.pop(key)
+                self._write(data)
+
+
+class SQLiteMemoryStore(MemoryStore):
+    """Per-key rows in a WAL-mode SQLite database, safe for concurrent processes.
+
+    Outside :meth:`batch` every write is its own ``BEGIN IMMEDIATE``
+    transaction. Inside a batch writes are buffered (last write per key wins)
+    and flushed in one transaction when the outermost batch exits.
+    """
+
+    def __init__(self, path: str | Path, *, timeout: float = 30.0) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._pending: dict[tuple[str, str], Any] = {}
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS project_memory ("
+            "project_id TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+            "PRIMARY KEY (project_id, key)) WITHOUT ROWID"
+        )
+
+    def load_project(self, project_id: str) -> dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM project_memory WHERE project_id = ?", (project_id,)
+            ).fetchall()
+            values = {key: json.loads(value) for key, value in rows}
+            for (pending_project, key), value in self._pending.items():
+                if pending_project != project_id:
+                    continue
+                if value is _DELETED:
+                    values.pop(key, None)
+                else:
+                    values[key] = value
+            return values
+
+    def projects(self) -> list[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT project_id FROM project_memory").fetchall()
+            names = {row[0] for row in rows}
+            names.update(project for project, _ in self._pending)
+            return sorted(names)
+
+    def set_values(self, project_id: str, values: Mapping[str, Any]) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._pending[(project_id, key)] = value
+            if not self._batch_depth:
+                self._flush()
+
+    def delete_value(self, project_id: str, key: str) -> None:
+        with self._lock:
+            self._pending[(project_id, key)] = _DELETED
+            if not self._batch_depth:
+                self._flush()
+
+    @contextmanager
+    def batch(self) -> Iterator[MemoryStore]:
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered changes; they stay buffered if the transaction fails."""
+
+        pending = self._pending
+        if not pending:
+            return
+        upserts = [
+            (project_id, key, json.dumps(value, sort_keys=True))
+            for (project_id, key), value in pending.items()
+            if value is not _DELETED
+        ]
+        deletes = [
+            (project_id, key) for (project_id, key), value in pending.items() if value is _DELETED
+        ]
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if upserts:
+                # The WHERE clause leaves unchanged rows (and their pages) untouched.
+                conn.executemany(
+                    "INSERT INTO project_memory (project_id, key, value) VALUES (?, ?, ?) "
+                    "ON CONFLICT (project_id, key) DO UPDATE SET value = excluded.value "
+                    "WHERE project_memory.value IS NOT excluded.value",
+                    upserts,
+                )
+            if deletes:
+                conn.executemany(
+                    "DELETE FROM project_memory WHERE project_id = ? AND key = ?", deletes
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        self._pending = {}
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._conn.close()
+
+
+def open_store(path: str | Path) -> MemoryStore:
+    """Open the backend matching ``path``: SQLite for ``.db``/``.sqlite``, JSON otherwise."""
+
+    target = Path(path)
+    if target.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteMemoryStore(target)
+    return ProjectMemoryStore(target)
 
 
-__all__ = ["ProjectMemoryStore"]
+__all__ = [
+    "MemoryStore",
+    "ProjectMemoryStore",
+    "SQLiteMemoryStore",
+    "open_store",
+]
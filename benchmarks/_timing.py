@@ -0,0 +1,38 @@
+"""Small timing helpers shared by the benchmark scripts."""
+
+from __future__ import annotations
+
+import statistics
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+
+def measure(func: Callable[[], Any], *, repeat: int = 5, warmup: int = 1) -> list[float]:
+    """Return wall-clock durations (seconds) of ``repeat`` calls after ``warmup`` calls."""
+
+    for _ in range(warmup):
+        func()
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarise(label: str, durations: Sequence[float], *, per: int = 1) -> str:
+    best = min(durations)
+    median = statistics.median(durations)
+    line = f"{label:<40} best {best * 1e3:9.2f} ms  median {median * 1e3:9.2f} ms"
+    if per > 1:
+        line += f"  ({median / per * 1e9:8.1f} ns/item)"
+    return line
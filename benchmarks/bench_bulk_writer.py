@@ -0,0 +1,69 @@
+"""Per-entity cost of building an ``ezdxf`` document through ``DxfWriter``.
+
+python -m benchmarks.bench_bulk_writer --entities 50000
+
+Compares ``msp.add_circle`` with ``dxfattribs`` (the previous writer path),
+``DxfWriter.add_circle`` on pydantic models, ``DxfWriter.add_circles`` on
+arrays, and ``DxfWriter.add_bundle`` on a columnar bundle of mixed entities.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+import numpy as np
+
+from app.cad.models import Circle, Point
+from app.cad.writer import DxfWriter
+
+from ._timing import measure, summarise
+from .bench_streaming import synthetic_chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    n = args.entities
+
+    rng = np.random.default_rng(11)
+    centers = rng.uniform(-1e4, 1e4, (n, 2))
+    radii = rng.uniform(1, 100, n)
+    points = centers.tolist()
+    radius_list = radii.tolist()
+    models = [
+        Circle(center=Point(x=x, y=y), radius=r)
+        for (x, y), r in zip(points[: n // 10], radius_list, strict=False)
+    ]
+    (bundle,) = synthetic_chunks(n, n)
+
+    def msp_add_circle() -> None:
+        msp = DxfWriter().msp
+        attribs = {"layer": "A-GEOM"}
+        for center, r in zip(points, radius_list, strict=True):
+            msp.add_circle(center, r, dxfattribs=attribs)
+
+    def add_circle_models() -> None:
+        writer = DxfWriter()
+        for circle in models:
+            writer.add_circle(circle)
+
+    def add_circles() -> None:
+        DxfWriter().add_circles(centers, radii)
+
+    def add_bundle() -> None:
+        DxfWriter().add_bundle(bundle)
+
+    runs = [
+        ("msp.add_circle (dxfattribs)", msp_add_circle, n),
+        ("DxfWriter.add_circle (models)", add_circle_models, len(models)),
+        ("DxfWriter.add_circles (arrays)", add_circles, n),
+        ("DxfWriter.add_bundle (lines+circles)", add_bundle, n),
+    ]
+    for label, func, count in runs:
+        print(summarise(label, measure(func, repeat=args.repeat), per=count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Time building large bundles with and without validation, and the batch compiler.
+
+python -m benchmarks.bench_bundle --entities 1000000 [--pause-gc]
+
+The library leaves the cyclic garbage collector alone. ``--pause-gc`` disables
+it around the timed calls, as an application that owns the process may choose
+to do while building millions of acyclic models.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+
+from app.core.conversion import program_to_bundle, program_to_columns
+from app.core.nlp_rules import CircleCmd, LineCmd, PolylineCmd, Program, RectCmd
+from app.dsl.commands import Coordinate, DrawCircle, DrawLine
+from app.dsl.compiler import CommandCompiler
+
+from ._timing import measure, summarise
+
+
+def synthetic_program(count: int, seed: int = 3) -> Program:
+    rng = random.Random(seed)
+    quarter = count // 4
+
+    def value() -> float:
+        return round(rng.uniform(-1000, 1000), 3)
+
+    return Program(
+        circles=[CircleCmd(value(), value(), rng.uniform(1, 50)) for _ in range(quarter)],
+        lines=[LineCmd(value(), value(), value(), value()) for _ in range(quarter)],
+        rects=[RectCmd(value(), value(), 10.0, 20.0) for _ in range(quarter)],
+        arcs=[],
+        polylines=[
+            PolylineCmd([(value(), value()) for _ in range(4)]) for _ in range(count - 3 * quarter)
+        ],
+        ellipses=[],
+        texts=[],
+        save=None,
+    )
+
+
+def synthetic_commands(count: int, seed: int = 5) -> list[DrawCircle | DrawLine]:
+    rng = random.Random(seed)
+    commands: list[DrawCircle | DrawLine] = []
+    for index in range(count):
+        if index % 2:
+            commands.append(DrawCircle(radius=rng.uniform(1, 9), center=Coordinate(x=1, y=2)))
+        else:
+            commands.append(
+                DrawLine(
+                    start=Coordinate(x=rng.uniform(0, 9), y=0),
+                    end=Coordinate(x=1, y=1, system="relative"),
+                )
+            )
+    return commands
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--pause-gc", action="store_true", help="disable the cyclic collector")
+    args = parser.parse_args()
+    if args.pause_gc:
+        gc.disable()
+
+    n = args.entities
+    program = synthetic_program(n)
+    for trusted in (False, True):
+        label = f"program_to_bundle trusted={trusted}"
+        durations = measure(
+            lambda t=trusted: program_to_bundle(program, trusted=t), repeat=args.repeat
+        )
+        print(summarise(label, durations, per=n))
+
+    durations = measure(lambda: program_to_columns(program), repeat=args.repeat)
+    print(summarise("program_to_columns", durations, per=n))
+
+    commands = synthetic_commands(n)
+    for trusted in (False, True):
+        label = f"CommandCompiler.compile trusted={trusted}"
+        durations = measure(
+            lambda t=trusted: CommandCompiler(trusted=t).compile(commands), repeat=args.repeat
+        )
+        print(summarise(label, durations, per=n))
+
+    durations = measure(lambda: CommandCompiler().compile_batch(commands), repeat=args.repeat)
+    print(summarise("CommandCompiler.compile_batch", durations, per=n))
+
+
+if __name__ == "__main__":
+    main()
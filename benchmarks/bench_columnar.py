@@ -0,0 +1,69 @@
+"""Compare memory and DXF write throughput of ``DrawingBundle`` and ``ColumnarBundle``.
+
+python -m benchmarks.bench_columnar --entities 1000000 --write-entities 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.writer import DxfWriter
+from app.core.conversion import program_to_bundle
+
+from ._timing import measure, summarise
+from .bench_bundle import synthetic_program
+
+
+def _retained_bytes(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Bytes still allocated after ``build`` returns, i.e. held by its result."""
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def _write(bundle: Any) -> None:
+    DxfWriter().add_bundle(bundle)
+
+
+def _memory_report(n: int) -> None:
+    program = synthetic_program(n)
+    bundle, model_bytes = _retained_bytes(lambda: program_to_bundle(program))
+    columnar, column_bytes = _retained_bytes(lambda: ColumnarBundle.from_bundle(bundle))
+    for label, size in (("DrawingBundle", model_bytes), ("ColumnarBundle", column_bytes)):
+        print(
+            f"{label:<16} {size / 2**20:9.1f} MiB for {n} entities  "
+            f"({size / n:7.1f} B/entity, {size / n * 1e6 / 2**20:7.0f} MiB per million)"
+        )
+    print(f"ColumnarBundle.nbytes() {columnar.nbytes() / 2**20:.1f} MiB of column data")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=200_000)
+    parser.add_argument("--write-entities", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    _memory_report(args.entities)
+
+    w = args.write_entities
+    small = program_to_bundle(synthetic_program(w))
+    staged = ColumnarBundle.from_bundle(small)
+    for label, target in (("write DrawingBundle", small), ("write ColumnarBundle", staged)):
+        durations = measure(lambda t=target: _write(t), repeat=args.repeat)
+        print(summarise(label, durations, per=w))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Cost of computing drawing extents over staged columns.
+
+python -m benchmarks.bench_extents --entities 10000000
+
+The drawing mixes lines, circles, arcs, rotated ellipses and rectangles in
+equal parts. ``columns_extents`` is what ``StreamingDxfWriter`` and the
+``DxfWriter`` bulk methods run to fill ``$EXTMIN``/``$EXTMAX``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.dxf_encode import columns_extents
+
+from ._timing import measure, summarise
+
+
+def mixed_bundle(entities: int, *, seed: int = 3) -> ColumnarBundle:
+    rng = np.random.default_rng(seed)
+    n = max(1, entities // 5)
+
+    def points() -> np.ndarray:
+        return rng.uniform(-1e5, 1e5, (n, 2))
+
+    def sizes() -> np.ndarray:
+        return rng.uniform(1, 50, n)
+
+    def angles() -> np.ndarray:
+        return rng.uniform(0, 360, n)
+
+    bundle = ColumnarBundle()
+    bundle.add_lines(points(), points())
+    bundle.add_circles(points(), sizes())
+    bundle.add_arcs(points(), sizes(), angles(), angles())
+    bundle.add_ellipses(points(), sizes(), sizes(), angles())
+    bundle.add_rects(points(), rng.uniform(1, 50, (n, 2)))
+    return bundle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=10_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bundle = mixed_bundle(args.entities)
+    count = len(bundle)
+    print(
+        summarise(
+            f"columns_extents ({count} entities)",
+            measure(lambda: columns_extents(bundle.columns), repeat=args.repeat),
+            per=count,
+        )
+    )
+    tracemalloc.start()
+    extents = columns_extents(bundle.columns)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"peak temporaries {peak / 2**20:.1f} MiB  extents {extents}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""File size, write time and read time of each output profile on the same drawing.
+
+python -m benchmarks.bench_formats --entities 100000 --precision 3
+
+Every profile writes one mixed drawing (lines, circles, rectangles, polylines,
+arcs, ellipses and texts with random coordinates). The file is then read back
+with ``ezdxf.readfile``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import ezdxf
+import numpy as np
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.r12 import R12Writer
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.writer import DxfWriter
+
+
+def mixed_bundle(total: int, *, simple: bool = False, seed: int = 3) -> ColumnarBundle:
+    """About ``total`` entities spread evenly over the entity kinds.
+
+    ``simple`` drawings hold only lines, circles and arcs, the geometry R12
+    stores as compactly as later versions.
+    """
+
+    rng = np.random.default_rng(seed)
+    n = max(1, total // (3 if simple else 7))
+
+    def coords(*shape: int) -> np.ndarray:
+        return rng.uniform(-1e4, 1e4, shape)
+
+    def sizes(count: int) -> np.ndarray:
+        return rng.uniform(1, 500, count)
+
+    bundle = ColumnarBundle()
+    bundle.add_lines(coords(n, 2), coords(n, 2))
+    bundle.add_circles(coords(n, 2), sizes(n))
+    bundle.add_arcs(coords(n, 2), sizes(n), rng.uniform(0, 360, n), rng.uniform(0, 360, n))
+    if simple:
+        return bundle
+    bundle.add_rects(coords(n, 2), np.column_stack([sizes(n), sizes(n)]))
+    bundle.add_polylines(np.arange(0, 4 * n + 1, 4), coords(4 * n, 2))
+    bundle.add_ellipses(coords(n, 2), sizes(n), sizes(n), rng.uniform(0, 180, n))
+    bundle.add_texts([f"T{i}" for i in range(n)], coords(n, 2), sizes(n) / 10)
+    return bundle
+
+
+def _document(fmt: str, precision: int | None) -> Callable[[ColumnarBundle, Path], None]:
+    def write(bundle: ColumnarBundle, path: Path) -> None:
+        writer = DxfWriter(precision=precision)
+        writer.add_bundle(bundle)
+        writer.save(path, fmt=fmt)
+
+    return write
+
+
+def _streaming(precision: int | None) -> Callable[[ColumnarBundle, Path], None]:
+    def write(bundle: ColumnarBundle, path: Path) -> None:
+        with StreamingDxfWriter(path, precision=precision) as writer:
+            writer.add_bundle(bundle)
+
+    return write
+
+
+def _r12(precision: int | None) -> Callable[[ColumnarBundle, Path], None]:
+    def write(bundle: ColumnarBundle, path: Path) -> None:
+        with R12Writer(path, precision=precision) as writer:
+            writer.add_bundle(bundle)
+
+    return write
+
+
+def _run_profiles(
+    profiles: list[tuple[str, Callable[[ColumnarBundle, Path], None]]],
+    bundle: ColumnarBundle,
+    tmp: Path,
+) -> None:
+    for label, write in profiles:
+        path = tmp / "bench.dxf"
+        started = time.perf_counter()
+        write(bundle, path)
+        written = time.perf_counter() - started
+        size = path.stat().st_size
+        started = time.perf_counter()
+        ezdxf.readfile(path)
+        read = time.perf_counter() - started
+        print(
+            f"{label:<32} size {size / 2**20:8.2f} MiB  write {written:7.2f} s  read {read:7.2f} s"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--precision", type=int, default=3)
+    args = parser.parse_args()
+
+    p = args.precision
+    profiles = [
+        ("ascii R2018", _document("asc", None)),
+        (f"ascii R2018 precision {p}", _document("asc", p)),
+        ("binary R2018", _document("bin", None)),
+        ("streaming ascii", _streaming(None)),
+        (f"streaming ascii precision {p}", _streaming(p)),
+        ("minimal R12", _r12(None)),
+        (f"minimal R12 precision {p}", _r12(p)),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for simple in (False, True):
+            bundle = mixed_bundle(args.entities, simple=simple)
+            kinds = "lines, circles, arcs" if simple else "all entity kinds"
+            print(f"{len(bundle)} entities ({kinds})")
+            _run_profiles(profiles, bundle, Path(tmp))
+
+
+if __name__ == "__main__":
+    main()
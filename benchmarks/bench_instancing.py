@@ -0,0 +1,81 @@
+"""File size, write time and read time of a panel layout with and without instancing.
+
+python -m benchmarks.bench_instancing --panels 5000
+
+Each panel is a rectangle with four bolt holes, repeated on a
+grid inside a sheet border. Half the panels are turned by 90 degrees and
+drawn as closed polylines. Translation-only matching needs one block per
+orientation, while ``rotation=True`` needs a single block. Files are read
+back with ``ezdxf.readfile``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import tempfile
+import time
+from pathlib import Path
+
+import ezdxf
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.writer import DxfWriter
+
+HOLES = ((10.0, 10.0), (90.0, 10.0), (10.0, 70.0), (90.0, 70.0))
+
+
+def panel_layout(panels: int) -> ColumnarBundle:
+    side = max(1, math.isqrt(panels))
+    bundle = ColumnarBundle()
+    bundle.add_rect(-50, -50, side * 150 + 100, side * 150 + 100, layer="BORDER")
+    for index in range(panels):
+        ox, oy = (index % side) * 150.0, (index // side) * 150.0
+        turned = index % 2 == 1
+        if turned:
+            # The same panel turned by 90 degrees about its corner at (ox + 80, oy).
+            ax = ox + 80
+            corners = [(ax, oy), (ax, oy + 100), (ox, oy + 100), (ox, oy)]
+            bundle.add_polyline(corners, True)
+            holes = [(ax - hy, oy + hx) for hx, hy in HOLES]
+        else:
+            bundle.add_rect(ox, oy, 100, 80)
+            holes = [(ox + hx, oy + hy) for hx, hy in HOLES]
+        for x, y in holes:
+            bundle.add_circle(x, y, 3, layer="HOLES")
+    return bundle
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--panels", type=int, default=5000)
+    args = parser.parse_args()
+
+    bundle = panel_layout(args.panels)
+    print(f"{len(bundle)} entities, {args.panels} panels")
+    variants = [("plain", None), ("instanced", False), ("instanced + rotation", True)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.dxf"
+        for label, rotation in variants:
+            started = time.perf_counter()
+            writer = DxfWriter()
+            if rotation is None:
+                writer.add_bundle(bundle)
+                blocks = inserts = 0
+            else:
+                plan = writer.add_instanced(bundle, rotation=rotation)
+                blocks, inserts = len(plan.blocks), plan.insert_count
+            writer.save(path)
+            written = time.perf_counter() - started
+            size = path.stat().st_size
+            started = time.perf_counter()
+            ezdxf.readfile(path)
+            read = time.perf_counter() - started
+            print(
+                f"{label:<22} blocks {blocks:2d}  inserts {inserts:6d}  size {size / 2**20:7.2f} MiB  "
+                f"write {written:6.2f} s  read {read:6.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Time of joining line chains and its effect on entity count and file size.
+
+python -m benchmarks.bench_joining --outlines 20000
+
+Every outline is a hexagon drawn as separate lines, in shuffled order and
+with some lines drawn backwards. Every second hexagon is left open by dropping
+its last side. Both drawings are written with ``StreamingDxfWriter``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.joining import join_lines
+from app.cad.streaming import StreamingDxfWriter
+
+from ._timing import measure, summarise
+
+
+def outline_lines(outlines: int, *, sides: int = 6, seed: int = 5) -> ColumnarBundle:
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, sides, endpoint=False)
+    centres = rng.uniform(-1e5, 1e5, (outlines, 1, 2))
+    radii = rng.uniform(5, 50, (outlines, 1, 1))
+    ring = np.stack([np.cos(angles), np.sin(angles)], axis=-1)
+    corners = centres + radii * ring
+    starts = corners.reshape(-1, 2)
+    ends = np.roll(corners, -1, axis=1).reshape(-1, 2)
+    if outlines > 1:
+        # Chop every second outline open so both chain kinds are exercised.
+        open_mask = np.zeros((outlines, sides), dtype=bool)
+        open_mask[::2, -1] = True
+        keep = ~open_mask.reshape(-1)
+        starts, ends = starts[keep], ends[keep]
+    flip = rng.random(len(starts)) < 0.3
+    starts[flip], ends[flip] = ends[flip], starts[flip].copy()
+    order = rng.permutation(len(starts))
+    bundle = ColumnarBundle()
+    bundle.add_lines(starts[order], ends[order])
+    return bundle
+
+
+def _write(bundle: ColumnarBundle, path: Path) -> int:
+    with StreamingDxfWriter(path) as writer:
+        writer.add_bundle(bundle)
+    return path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--outlines", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bundle = outline_lines(args.outlines)
+    lines = len(bundle)
+    print(
+        summarise(
+            f"join_lines ({lines} lines)",
+            measure(lambda: join_lines(bundle), repeat=args.repeat),
+            per=lines,
+        )
+    )
+    joined = join_lines(bundle)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, drawing in (("lines", bundle), ("joined", joined)):
+            started = time.perf_counter()
+            size = _write(drawing, Path(tmp) / f"{label}.dxf")
+            written = time.perf_counter() - started
+            print(
+                f"{label:<8} entities {len(drawing):8d}  size {size / 2**20:7.2f} MiB  "
+                f"write {written:6.2f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Measure ``StreamingDxfWriter`` encoding throughput across worker processes.
+
+python -m benchmarks.bench_parallel_encode --entities 2000000 --workers 1 4 16
+
+Gains are bounded by the physical core count; the parent still writes every
+chunk, so very fast disks help more than extra workers beyond that.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from pathlib import Path
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.streaming import StreamingDxfWriter
+
+from ._timing import measure, summarise
+from .bench_streaming import synthetic_chunks
+
+
+def _write(bundle: ColumnarBundle, path: Path, workers: int, chunk_size: int) -> None:
+    with StreamingDxfWriter(path, workers=workers, chunk_size=chunk_size) as writer:
+        writer.add_bundle(bundle)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bundle = next(synthetic_chunks(args.entities, args.entities))
+    print(f"{os.cpu_count()} CPUs available")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.dxf"
+        for workers in args.workers:
+            durations = measure(
+                lambda w=workers: _write(bundle, path, w, args.chunk_size),
+                repeat=args.repeat,
+                warmup=0,
+            )
+            print(summarise(f"workers={workers}", durations, per=len(bundle)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""End-to-end timing of ``execute_commands`` against a recorded LLM cassette.
+
+Record once against any provider, then replay offline as often as needed::
+
+    python -m benchmarks.bench_replay --commands examples/sample_commands.txt \
+        --cassette outputs/bench.jsonl --record openai
+    python -m benchmarks.bench_replay --commands examples/sample_commands.txt \
+        --cassette outputs/bench.jsonl --replay-latency
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+from app.ai.cassette import RecordingProvider, ReplayProvider
+from app.cli.executor import execute_commands
+from app.dsl.llm_parser import LLMParser
+from app.dsl.llm_provider import configure_provider
+
+from ._timing import measure, summarise
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", type=Path, required=True, help="One utterance per line")
+    parser.add_argument("--cassette", type=Path, required=True)
+    parser.add_argument("--record", metavar="PROVIDER", help="Record traffic from PROVIDER first")
+    parser.add_argument("--replay-latency", action="store_true")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    commands = [line.strip() for line in args.commands.read_text().splitlines() if line.strip()]
+    out = Path(tempfile.mkdtemp()) / "bench.dxf"
+
+    if args.record:
+        recorder = RecordingProvider(configure_provider(args.record), args.cassette)
+        execute_commands(commands, output=out, interactive=False, parser=LLMParser(recorder))
+
+    replay = ReplayProvider(args.cassette, replay_latency=args.replay_latency)
+
+    def run() -> None:
+        replay.rewind()
+        execute_commands(commands, output=out, interactive=False, parser=LLMParser(replay))
+
+    print(summarise(f"execute_commands x{len(commands)}", measure(run, repeat=args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Churn through many short sessions and report throughput and retained memory.
+
+python -m benchmarks.bench_sessions --sessions 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from app.memory import SessionManager
+
+KEYS = ("circle.radius", "circle.center.x", "circle.center.y", "rect.width")
+
+
+class _SimClock:
+    """Simulated time so session and entry TTLs elapse without sleeping."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _churn(sessions: int, *, rate: float, session_ttl: float, max_sessions: int) -> None:
+    clock = _SimClock()
+    manager = SessionManager(
+        session_ttl=session_ttl,
+        entry_ttl=session_ttl,
+        max_sessions=max_sessions,
+        clock=clock,
+    )
+    step = 1.0 / rate
+    checkpoint = max(1, sessions // 5)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for i in range(sessions):
+        session = manager.get(f"session-{i}")
+        for key in KEYS:
+            session.set(key, i)
+        session.get(KEYS[0])
+        clock.now += step
+        if (i + 1) % checkpoint == 0:
+            current, _ = tracemalloc.get_traced_memory()
+            stats = manager.stats()
+            print(
+                f"{i + 1:>10} sessions  live {stats.sessions:>7}  entries {stats.entries:>8}  "
+                f"heap {stats.heap_size:>7}  traced {current / 2**20:7.1f} MiB"
+            )
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{sessions} sessions in {elapsed:.2f} s ({elapsed / sessions * 1e6:.2f} us/session, "
+        f"peak {peak / 2**20:.1f} MiB traced)"
+    )
+    print(manager.stats())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=200_000)
+    parser.add_argument(
+        "--rate", type=float, default=1000.0, help="new sessions per simulated second"
+    )
+    parser.add_argument("--session-ttl", type=float, default=30.0)
+    parser.add_argument("--max-sessions", type=int, default=10_000)
+    args = parser.parse_args()
+    _churn(
+        args.sessions,
+        rate=args.rate,
+        session_ttl=args.session_ttl,
+        max_sessions=args.max_sessions,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time of polyline simplification and its effect on vertex count and file size.
+
+python -m benchmarks.bench_simplify --polylines 200 --vertices 5000
+
+Every polyline is a traced curve sampled far more densely than it needs to be,
+with sub-tolerance jitter on each vertex. One extra polyline carries a million
+vertices to show that long inputs stay linear in practice. Both drawings are
+written with ``StreamingDxfWriter``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.simplify import simplify_polylines
+from app.cad.streaming import StreamingDxfWriter
+
+from ._timing import measure, summarise
+
+
+def dense_polylines(
+    polylines: int, vertices: int, *, noise: float = 0.002, seed: int = 9
+) -> ColumnarBundle:
+    rng = np.random.default_rng(seed)
+    bundle = ColumnarBundle()
+    counts = [vertices] * polylines + [1_000_000]
+    for index, count in enumerate(counts):
+        t = np.linspace(0, 4 * np.pi, count)
+        xs = t * 100 + index * 10
+        ys = np.sin(t) * 200 + (t * 3) % 40 + rng.uniform(-noise, noise, count)
+        bundle.add_polyline(np.column_stack([xs, ys]).tolist())
+    return bundle
+
+
+def _write(bundle: ColumnarBundle, path: Path) -> int:
+    with StreamingDxfWriter(path) as writer:
+        writer.add_bundle(bundle)
+    return path.stat().st_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--polylines", type=int, default=200)
+    parser.add_argument("--vertices", type=int, default=5000)
+    parser.add_argument("--tolerance", type=float, default=0.01)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bundle = dense_polylines(args.polylines, args.vertices)
+    total = len(bundle.columns.polylines.vertex_array)
+    print(
+        summarise(
+            f"simplify_polylines ({total} vertices)",
+            measure(lambda: simplify_polylines(bundle, args.tolerance), repeat=args.repeat),
+            per=total,
+        )
+    )
+    simplified, report = simplify_polylines(bundle, args.tolerance)
+    print(report)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, drawing in (("dense", bundle), ("simplified", simplified)):
+            started = time.perf_counter()
+            size = _write(drawing, Path(tmp) / f"{label}.dxf")
+            written = time.perf_counter() - started
+            print(f"{label:<11} size {size / 2**20:8.2f} MiB  write {written:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Per-drawing cost of creating and writing small DXF files.
+
+python -m benchmarks.bench_templates --drawings 200
+
+Compares a document built with ``ezdxf.new`` plus layer setup (the writers'
+previous constructor) with the cached template copies used by ``DxfWriter``
+and ``StreamingDxfWriter``, both for construction alone and for a complete
+ten-entity drawing saved to disk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from pathlib import Path
+
+import ezdxf
+
+from app.cad.layers import LEGACY_LAYERS, ensure_layers
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.template import new_document
+from app.cad.writer import DxfWriter
+
+from ._timing import measure, summarise
+
+VERSION = "R2010"
+LAYERS = list(LEGACY_LAYERS.values())
+CENTERS = [(float(i), float(i)) for i in range(10)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--drawings", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    n = args.drawings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = Path(tmp)
+
+        def uncached_new() -> None:
+            for _ in range(n):
+                ensure_layers(ezdxf.new(VERSION), LAYERS)
+
+        def cached_new() -> None:
+            for _ in range(n):
+                new_document(VERSION, LAYERS)
+
+        def uncached_drawing() -> None:
+            for i in range(n):
+                doc = ezdxf.new(VERSION)
+                ensure_layers(doc, LAYERS)
+                msp = doc.modelspace()
+                for center in CENTERS:
+                    msp.add_circle(center, 1.0, dxfattribs={"layer": "CIRCLES"})
+                doc.saveas(out / f"uncached_{i}.dxf")
+
+        def writer_drawing() -> None:
+            for i in range(n):
+                writer = DxfWriter(version=VERSION, layers=LAYERS)
+                writer.add_circles(CENTERS, 1.0, layer="CIRCLES")
+                writer.save(out / f"writer_{i}.dxf")
+
+        def streaming_drawing() -> None:
+            for i in range(n):
+                with StreamingDxfWriter(
+                    out / f"stream_{i}.dxf", version=VERSION, layers=LAYERS
+                ) as writer:
+                    writer.add_circles(CENTERS, 1.0, layer="CIRCLES")
+
+        runs = [
+            ("ezdxf.new + layers", uncached_new),
+            ("new_document (cached template)", cached_new),
+            ("drawing: ezdxf.new + saveas", uncached_drawing),
+            ("drawing: DxfWriter", writer_drawing),
+            ("drawing: StreamingDxfWriter", streaming_drawing),
+        ]
+        for label, func in runs:
+            print(summarise(label, measure(func, repeat=args.repeat), per=n))
+
+
+if __name__ == "__main__":
+    main()
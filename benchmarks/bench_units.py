@@ -0,0 +1,51 @@
+"""Compare unit conversion throughput across numeric backends.
+
+python -m benchmarks.bench_units --values 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from app.core.nlp_rules import parse
+from app.core.units import NumericBackend, Unit, mm_value, to_mm, to_mm_array
+
+from ._timing import measure, summarise
+
+UTTERANCE = (
+    "draw a 2 inch circle at (0,0); make a rectangle 40x20 with center at (5,5); "
+    "draw an arc radius 40 mm at (0,0) from 0 to 90; ellipse center (0,0) rx 4 in ry 2 in rot 15; "
+    'text "Kitchen" at (100,200) height 50 mm'
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--values", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    values = [rng.uniform(-500, 500) for _ in range(args.values)]
+    n = len(values)
+
+    durations = measure(lambda: [to_mm(v, Unit.INCH) for v in values], repeat=args.repeat)
+    print(summarise("to_mm (Decimal)", durations, per=n))
+    for backend in NumericBackend:
+        durations = measure(
+            lambda b=backend: [mm_value(v, Unit.INCH, backend=b) for v in values],
+            repeat=args.repeat,
+        )
+        print(summarise(f"mm_value backend={backend.value}", durations, per=n))
+        durations = measure(
+            lambda b=backend: to_mm_array(values, Unit.INCH, backend=b), repeat=args.repeat
+        )
+        print(summarise(f"to_mm_array backend={backend.value}", durations, per=n))
+
+    durations = measure(lambda: [parse(UTTERANCE) for _ in range(500)], repeat=args.repeat)
+    print(summarise("nlp_rules.parse", durations, per=500))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Compare ``json.loads`` + ``model_validate`` with the single-pass ``validate_json`` path.
+
+Uses responses from a cassette when ``--cassette`` is given, otherwise synthesises
+a realistic mix of command payloads::
+
+    python -m benchmarks.bench_validation --count 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from contextlib import suppress
+from pathlib import Path
+
+from app.dsl.commands import CommandList, validate_command_list
+
+from ._timing import measure, summarise
+
+
+def _synthetic(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+
+    def coord() -> dict[str, object]:
+        return {"x": round(rng.uniform(-500, 500), 3), "y": round(rng.uniform(-500, 500), 3)}
+
+    makers = [
+        lambda: {"type": "draw_circle", "center": coord(), "radius": rng.uniform(1, 50)},
+        lambda: {"type": "draw_line", "start": coord(), "end": coord()},
+        lambda: {"type": "draw_rect", "position": coord(), "width": 20, "height": "30"},
+        lambda: {"type": "draw_polyline", "points": [coord() for _ in range(8)], "closed": True},
+    ]
+    return [
+        json.dumps({"commands": [rng.choice(makers)() for _ in range(rng.randint(1, 6))]})
+        for _ in range(count)
+    ]
+
+
+def _from_cassette(path: Path, count: int) -> list[str]:
+    responses = []
+    for line in path.read_text(encoding="utf8").splitlines():
+        if line.strip():
+            response = json.loads(line)["response"]
+            responses.append(response if isinstance(response, str) else json.dumps(response))
+    return (responses * (count // max(1, len(responses)) + 1))[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--cassette", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = (
+        _from_cassette(args.cassette, args.count) if args.cassette else _synthetic(args.count)
+    )
+
+    def two_pass() -> None:
+        for payload in payloads:
+            with suppress(ValueError):
+                CommandList.model_validate(json.loads(payload))
+
+    def one_pass() -> None:
+        for payload in payloads:
+            with suppress(ValueError):
+                validate_command_list(payload)
+
+    n = len(payloads)
+    print(summarise("json.loads + model_validate", measure(two_pass, repeat=args.repeat), per=n))
+    print(summarise("TypeAdapter.validate_json", measure(one_pass, repeat=args.repeat), per=n))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Concurrency load harness for the LangChain/OpenAI parsing path.
+
+Starts the local stub endpoint (or targets ``--url``) and drives either the LLM
+parser or ``execute_commands`` from a thread pool, reporting throughput and
+latency percentiles. The default utterances are all answered by the LLM in
+both modes; in ``--mode execute`` any ``--commands`` line the legacy rule
+parser handles never reaches the endpoint, so those requests are reported on
+their own line. Runs fully offline::
+
+    python -m benchmarks.load_harness --concurrency 16 --requests 500 \
+        --latency lognormal:-3,0.5 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from app.ai.stub_server import StubConfig, start_server
+from app.cli.executor import execute_commands
+from app.core.conversion import program_to_columns
+from app.core.nlp_rules import parse as legacy_parse
+from app.dsl.errors import ParseError
+from app.dsl.llm_parser import LLMParser
+from app.dsl.llm_provider import configure_provider
+
+from ._timing import percentile
+
+DEFAULT_UTTERANCES = [
+    "draw circle r=50 at (100,100)",
+    "draw line from (0,0) to rel(100,0)",
+    "draw rect w=20 h=30 center (10,10)",
+    "connect (5,5) to rel(10,10)",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", help="Existing OpenAI-compatible base URL (skips the stub)")
+    parser.add_argument("--mode", choices=["parser", "execute"], default="parser")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", default="fixed:0.05")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--commands", type=Path, help="Utterances to cycle, one per line")
+    args = parser.parse_args()
+
+    utterances = DEFAULT_UTTERANCES
+    if args.commands:
+        utterances = [ln.strip() for ln in args.commands.read_text().splitlines() if ln.strip()]
+
+    # execute_commands tries the legacy rule parser first; those utterances skip the LLM.
+    legacy: set[str] = set()
+    if args.mode == "execute":
+        legacy = {text for text in set(utterances) if len(program_to_columns(legacy_parse(text)))}
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server = start_server(StubConfig(latency=args.latency, error_rate=args.error_rate))
+        base_url = server.base_url
+
+    local = threading.local()
+    out_dir = Path(tempfile.mkdtemp())
+
+    def worker_parser() -> LLMParser:
+        # One provider per worker keeps conversational history out of the measurement.
+        if not hasattr(local, "parser"):
+            provider = configure_provider(
+                "openai", api_key="stub", base_url=base_url, history_tokens=0
+            )
+            local.parser = LLMParser(provider=provider)
+        return local.parser
+
+    def one(index: int) -> tuple[float, bool]:
+        utterance = utterances[index % len(utterances)]
+        started = time.perf_counter()
+        try:
+            if args.mode == "parser":
+                worker_parser().parse(utterance, context={"units": "mm"})
+            else:
+                execute_commands(
+                    [utterance],
+                    output=out_dir / f"{index}.dxf",
+                    interactive=False,
+                    parser=worker_parser(),
+                )
+            ok = True
+        except (ParseError, RuntimeError, OSError):
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(one, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    if server is not None:
+        server.shutdown()
+
+    failures = sum(1 for _, ok in results if not ok)
+    print(f"mode={args.mode} concurrency={args.concurrency} requests={args.requests}")
+    print(f"throughput {args.requests / elapsed:10.1f} req/s   failures {failures}")
+    routes: dict[str, list[float]] = {"llm": [], "legacy": []}
+    for index, (duration, _) in enumerate(results):
+        route = "legacy" if utterances[index % len(utterances)] in legacy else "llm"
+        routes[route].append(duration)
+    for route, latencies in routes.items():
+        if not latencies:
+            continue
+        pcts = "  ".join(
+            f"p{pct} {percentile(latencies, pct) * 1e3:8.1f} ms" for pct in (50, 90, 99)
+        )
+        print(f"{route:<7}{len(latencies):6d} req   {pcts}")
+
+
+if __name__ == "__main__":
+    main()
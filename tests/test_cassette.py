@@ -0,0 +1,41 @@
+import pytest
+
+from app.ai.cassette import RecordingProvider, ReplayProvider
+from app.dsl.commands import DrawCircle
+from app.dsl.errors import E_CASSETTE_MISS, ParseError
+from app.dsl.llm_parser import LLMParser
+from app.dsl.llm_provider import BaseLLMProvider, configure_provider
+
+VALID = '{"commands": [{"type": "draw_circle", "center": {"x": 1, "y": 1}, "radius": 4}]}'
+
+
+class SequenceProvider(BaseLLMProvider):
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+
+    def parse(self, text, schema, *, context=None):
+        return self.responses.pop(0)
+
+
+def test_record_then_replay_reproduces_retries(tmp_path):
+    cassette = tmp_path / "run.jsonl"
+    recorder = RecordingProvider(SequenceProvider(["{not json", VALID]), cassette)
+    recorded = LLMParser(provider=recorder).parse("a circle")
+
+    assert len(cassette.read_text().splitlines()) == 2
+
+    replay = configure_provider("replay", cassette=str(cassette))
+    assert isinstance(replay, ReplayProvider)
+    replayed = LLMParser(provider=replay).parse("a circle")
+    assert isinstance(replayed[0], DrawCircle)
+    assert [c.model_dump() for c in replayed] == [c.model_dump() for c in recorded]
+
+
+def test_replay_miss_raises(tmp_path):
+    cassette = tmp_path / "empty.jsonl"
+    cassette.write_text("")
+    parser = LLMParser(provider=ReplayProvider(cassette))
+    with pytest.raises(ParseError) as exc:
+        parser.parse("never recorded")
+    assert exc.value.code == E_CASSETTE_MISS[0]
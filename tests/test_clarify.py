@@ -2,8 +2,8 @@ import time
 
 import pytest
 
-from app.dsl.clarify import ReadyCommands, clarify
-from app.dsl.commands import Coordinate, DrawCircle
+from app.dsl.clarify import ReadyCommands, clarify, clarify_pass, command_field_specs
+from app.dsl.commands import Coordinate, DrawArc, DrawCircle, DrawPolyline, DrawRect, DrawText
 from app.dsl.errors import E_MEMORY_EXPIRED, ParseError
 from app.memory.session import SessionMemory
 from app.memory.store import ProjectMemoryStore
@@ -56,3 +56,50 @@ def test_session_ttl_expiration(tmp_path):
     with pytest.raises(ParseError) as exc:
         session.get("transient")
     assert exc.value.code == E_MEMORY_EXPIRED[0]
+
+
+def test_specs_cover_every_command_type():
+    specs = command_field_specs()
+    keys = {model.__name__: [spec.key for spec in fields] for model, fields in specs.items()}
+    assert keys["DrawArc"] == ["arc.radius", "arc.center"]
+    assert keys["DrawEllipse"] == ["ellipse.rx", "ellipse.ry", "ellipse.center"]
+    assert keys["DrawText"] == ["text.text", "text.height", "text.position"]
+    assert keys["DrawPolyline"] == ["polyline.points.{index}"]
+    assert keys["DrawRect"][-1] == "rect.{anchor}"
+
+
+def test_clarify_leaves_arc_angles_to_the_compiler():
+    result = clarify([DrawArc(center=Coordinate(x=0, y=0), radius=5)], SessionMemory())
+    assert isinstance(result, ReadyCommands)
+    arc = result.commands[0]
+    assert (arc.start_angle, arc.end_angle) == (None, None)
+
+
+def test_clarify_covers_polylines_text_and_rect_anchor():
+    session = SessionMemory()
+    commands = [
+        DrawPolyline(points=[Coordinate(x=1, y=2), Coordinate(x=3)]),
+        DrawText(position=Coordinate(x=0, y=0), height=4),
+        DrawRect(anchor="center", width=2, height=3),
+    ]
+    result = clarify(commands, session)
+    assert [(q.command_index, q.field, q.expected) for q in result] == [
+        (0, "polyline.points.1.y", "number"),
+        (1, "text.text", "text"),
+        (2, "rect.center.x", "number"),
+        (2, "rect.center.y", "number"),
+    ]
+
+
+def test_clarify_pass_only_revisits_pending_commands():
+    session = SessionMemory()
+    complete = DrawCircle(radius=1, center=Coordinate(x=0, y=0))
+    first = clarify_pass([complete, DrawText(height=2, position=Coordinate(x=1, y=1))], session)
+    assert first.pending == [1]
+    assert first.commands[0] is complete
+
+    session.set("answer.1.text.text", "Kitchen")
+    second = clarify_pass(first.commands, session, indices=first.pending)
+    assert not second.followups
+    assert second.commands[0] is complete
+    assert second.commands[1].text == "Kitchen"
@@ -1,5 +1,9 @@
+import json
+
 import ezdxf
+import pytest
 
+from app.cli.answers import AnswerSheet
 from app.cli.executor import execute_commands
 from app.dsl.llm_parser import LLMParser
 from app.dsl.llm_provider import BaseLLMProvider
@@ -23,7 +27,7 @@ def test_execute_commands_rule_only(tmp_path):
     out = tmp_path / "rule.dxf"
     path = execute_commands(
         ["draw a line from 0,0 to 100,0"], output=out, enable_ai=False, interactive=False
-    )
+    ).path
     doc = ezdxf.readfile(path)
     assert any(entity.dxftype() == "LINE" for entity in doc.modelspace())
 
@@ -37,6 +41,104 @@ def test_execute_commands_ai_with_provider(tmp_path):
         enable_ai=True,
         interactive=False,
         parser=parser,
-    )
+    ).path
     doc = ezdxf.readfile(path)
     assert any(entity.dxftype() == "CIRCLE" for entity in doc.modelspace())
+
+
+class SequenceProvider(BaseLLMProvider):
+    """Return one incomplete command per call, recording how often it was asked."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.calls = 0
+
+    def parse(self, text, schema, *, context=None):
+        response = self.responses[self.calls % len(self.responses)]
+        self.calls += 1
+        return {"commands": [response]}
+
+
+def test_batch_clarification_uses_answer_sheet(tmp_path):
+    sheet = tmp_path / "answers.json"
+    sheet.write_text(
+        json.dumps({"circle.radius": 7, "answer.1.circle.radius": 9, "circle.center.x": 2}),
+        encoding="utf8",
+    )
+    provider = SequenceProvider([{"type": "draw_circle", "center": {"y": 1}}])
+    path = execute_commands(
+        ["sketch a circle", "draw a line from 0,0 to 10,0", "and another circle"],
+        output=tmp_path / "batch.dxf",
+        interactive=False,
+        parser=LLMParser(provider=provider),
+        answers=AnswerSheet.from_file(sheet),
+    ).path
+    circles = ezdxf.readfile(path).modelspace().query("CIRCLE")
+    assert sorted(c.dxf.radius for c in circles) == [7, 9]
+    assert {tuple(c.dxf.center)[:2] for c in circles} == {(2, 1)}
+    assert provider.calls == 2
+
+
+def test_answer_sheet_falls_back_to_default_on_bad_answer(tmp_path):
+    provider = SequenceProvider([{"type": "draw_circle", "center": {"x": 0, "y": 0}}])
+    path = execute_commands(
+        ["sketch a circle"],
+        output=tmp_path / "fallback.dxf",
+        interactive=False,
+        parser=LLMParser(provider=provider),
+        answers={"circle.radius": "large"},
+    ).path
+    (circle,) = ezdxf.readfile(path).modelspace().query("CIRCLE")
+    assert circle.dxf.radius == 10
+
+
+def test_answer_sheet_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    sheet = tmp_path / "answers.yaml"
+    sheet.write_text("text.text: Kitchen\nrect.width: 40\n", encoding="utf8")
+    loaded = AnswerSheet.from_file(sheet)
+    assert loaded.answers == {"text.text": "Kitchen", "rect.width": 40}
+
+
+def test_malformed_answer_sheet_raises_value_error(tmp_path):
+    pytest.importorskip("yaml")
+    sheet = tmp_path / "broken.yaml"
+    sheet.write_text("text.text: [Kitchen\n", encoding="utf8")
+    with pytest.raises(ValueError, match="not valid YAML"):
+        AnswerSheet.from_file(sheet)
+
+
+def test_memory_store_remembers_defaults_across_runs(tmp_path):
+    store_path = tmp_path / "memory.db"
+    first = SequenceProvider([{"type": "draw_circle", "center": {"x": 0, "y": 0}}])
+    execute_commands(
+        ["a circle"],
+        output=tmp_path / "first.dxf",
+        interactive=False,
+        parser=LLMParser(provider=first),
+        answers={"circle.radius": 42},
+        memory_store=store_path,
+    )
+    second = SequenceProvider([{"type": "draw_circle", "center": {"x": 0, "y": 0}}])
+    path = execute_commands(
+        ["another circle"],
+        output=tmp_path / "second.dxf",
+        interactive=False,
+        parser=LLMParser(provider=second),
+        memory_store=store_path,
+    ).path
+    circles = [e for e in ezdxf.readfile(path).modelspace() if e.dxftype() == "CIRCLE"]
+    assert [c.dxf.radius for c in circles] == [42]
+
+
+def test_execute_commands_streaming_output(tmp_path):
+    path = execute_commands(
+        ["draw a line from 0,0 to 100,0; draw a circle radius 5 at 1,2"],
+        output=tmp_path / "stream.dxf",
+        enable_ai=False,
+        interactive=False,
+        stream=True,
+    ).path
+    kinds = sorted(entity.dxftype() for entity in ezdxf.readfile(path).modelspace())
+    assert kinds == ["CIRCLE", "LINE"]
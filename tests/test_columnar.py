@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import ezdxf
+import numpy as np
+
+from app.cad.columnar import ColumnarBundle, LayerTable
+from app.cad.models import DEFAULT_LAYER, Circle, Point
+from app.cad.writer import DxfWriter
+from app.core.conversion import program_to_bundle
+from app.core.nlp_rules import parse
+
+UTTERANCE = (
+    "draw a 2 inch circle at (0,0) and a line from 0,0 to 100,50; "
+    "make a rectangle 40x20 with center at (5,5); draw an arc radius 40 mm at (0,0) from 0 to 90; "
+    "polyline closed points: 0,0 10,0 10,10; ellipse center (0,0) rx 40 mm ry 20 mm rot 15; "
+    'text "Kitchen" at (100,200) height 50 mm'
+)
+
+
+def test_round_trip_preserves_models():
+    bundle = program_to_bundle(parse(UTTERANCE))
+    columnar = ColumnarBundle.from_bundle(bundle)
+    assert len(columnar) == 7
+    assert columnar.to_bundle().model_dump() == bundle.model_dump()
+    assert [type(e).__name__ for e in columnar.iter_all()] == [
+        type(e).__name__ for e in bundle.iter_all()
+    ]
+
+
+def test_layers_are_interned_and_remapped_on_extend():
+    layers = LayerTable()
+    assert layers.intern(DEFAULT_LAYER) == 0
+    assert layers.intern("walls") == 1
+    assert layers.intern("walls") == 1
+
+    first = ColumnarBundle()
+    first.add_circle(0, 0, 1, layer="walls")
+    second = ColumnarBundle()
+    second.add_circle(5, 5, 2, layer="doors")
+    second.add_circle(6, 6, 3, layer="walls")
+    first.extend(second)
+
+    assert list(first.layers) == [DEFAULT_LAYER, "walls", "doors"]
+    assert [c.layer for c in first.circles] == ["walls", "doors", "walls"]
+    np.testing.assert_array_equal(first.columns.circles.rows[:, 2], [1.0, 2.0, 3.0])
+
+
+def test_polylines_use_offsets_into_shared_vertices():
+    columnar = ColumnarBundle()
+    columnar.add_polyline([(0, 0), (1, 0), (1, 1)], closed=True)
+    columnar.add_polyline([(5, 5), (6, 6)])
+    table = columnar.columns.polylines
+    np.testing.assert_array_equal(table.offsets_array, [0, 3, 5])
+    assert table.vertex_array.shape == (5, 2)
+
+    copy = ColumnarBundle()
+    copy.add_polyline([(9, 9), (8, 8)])
+    copy.extend(columnar)
+    assert [len(p.points) for p in copy.polylines] == [2, 3, 2]
+    assert [p.closed for p in copy.polylines] == [False, True, False]
+    assert copy.polylines[-1].points[1] == Point(x=6, y=6)
+
+
+def test_slice_kind_keeps_layer_ids_and_vertices():
+    columnar = ColumnarBundle()
+    columnar.add_polyline([(0, 0), (1, 0), (1, 1)], closed=True, layer="P")
+    columnar.add_polyline([(5, 5), (6, 6)])
+    columnar.add_polyline([(7, 7), (8, 8), (9, 9)], layer="Q")
+    columnar.add_text("a", 0, 0, 1)
+    columnar.add_text("b", 1, 1, 2, layer="Q")
+
+    polys = columnar.slice_kind("polylines", 1, 3)
+    assert [p.points[0] for p in polys.polylines] == [Point(x=5, y=5), Point(x=7, y=7)]
+    assert [p.layer for p in polys.polylines] == [DEFAULT_LAYER, "Q"]
+    assert len(polys) == 2
+    texts = columnar.slice_kind("texts", 1, 2)
+    assert [(t.text, t.layer) for t in texts.texts] == [("b", "Q")]
+
+
+def test_subset_selects_rows_by_mask():
+    columnar = ColumnarBundle()
+    columnar.add_polyline([(0, 0), (1, 0), (1, 1)], closed=True, layer="P")
+    columnar.add_polyline([(5, 5), (6, 6)])
+    columnar.add_polyline([(7, 7), (8, 8), (9, 9)], layer="Q")
+    columnar.add_text("a", 0, 0, 1)
+    columnar.add_text("b", 1, 1, 2, layer="Q")
+    columnar.add_circle(0, 0, 1)
+
+    part = columnar.subset(
+        {"polylines": np.array([True, False, True]), "texts": np.array([False, True])}
+    )
+    assert [len(p.points) for p in part.polylines] == [3, 3]
+    assert [(p.layer, p.closed) for p in part.polylines] == [("P", True), ("Q", False)]
+    assert part.polylines[1].points[0] == Point(x=7, y=7)
+    assert [(t.text, t.layer) for t in part.texts] == [("b", "Q")]
+    assert len(part.circles) == 1
+
+
+def test_appends_succeed_while_a_view_is_alive():
+    bundle = ColumnarBundle()
+    bundle.add_circle(0, 0, 1)
+    bundle.add_polyline([(0, 0), (1, 1)])
+    rows = bundle.columns.circles.rows
+    layers = bundle.columns.circles.layers
+    vertices = bundle.columns.polylines.vertex_array
+    offsets = bundle.columns.polylines.offsets_array
+
+    bundle.add_circle(1, 1, 1)
+    bundle.add_circles([(2, 2)] * 100, 3)
+    bundle.add_polyline([(5, 5), (6, 6), (7, 7)])
+
+    assert rows.tolist() == [[0.0, 0.0, 1.0]]
+    assert layers.tolist() == [0]
+    assert vertices.tolist() == [[0.0, 0.0], [1.0, 1.0]]
+    assert offsets.tolist() == [0, 2]
+    assert len(bundle.columns.circles.rows) == 102
+    assert bundle.polylines[1].as_dxf()[0] == [(5.0, 5.0), (6.0, 6.0), (7.0, 7.0)]
+
+
+def test_bundle_can_extend_itself():
+    bundle = ColumnarBundle()
+    bundle.add_circle(0, 0, 1, layer="holes")
+    bundle.add_polyline([(0, 0), (10, 0), (10, 10)], closed=True)
+    bundle.add_text("A", 1, 2, 3)
+
+    bundle.extend(bundle)
+
+    assert len(bundle) == 6
+    assert bundle.circles[1] == bundle.circles[0]
+    assert bundle.polylines[1] == bundle.polylines[0]
+    assert [t.text for t in bundle.texts] == ["A", "A"]
+
+
+def test_model_views_behave_like_sequences():
+    columnar = ColumnarBundle()
+    columnar.add_model(Circle(center=Point(x=1, y=2), radius=3))
+    view = columnar.circles
+    assert len(view) == 1
+    assert view[-1] == view[0] == Circle(center=Point(x=1, y=2), radius=3)
+    assert view[:5] == [view[0]]
+
+
+def test_writer_output_matches_model_bundle(tmp_path: Path):
+    bundle = program_to_bundle(parse(UTTERANCE))
+    paths = []
+    for name, staged in (("models", bundle), ("columns", ColumnarBundle.from_bundle(bundle))):
+        writer = DxfWriter()
+        writer.add_bundle(staged)
+        paths.append(writer.save(tmp_path / f"{name}.dxf"))
+
+    def summary(path: Path) -> list[tuple[str, str]]:
+        msp = ezdxf.readfile(path).modelspace()
+        return [(e.dxftype(), e.dxf.layer) for e in msp]
+
+    assert summary(paths[0]) == summary(paths[1])
+    assert len(summary(paths[1])) == 7
+
+
+def test_bulk_appends_broadcast_scalars_and_intern_layers():
+    columnar = ColumnarBundle()
+    columnar.add_circles(np.array([[0, 0], [1, 1]]), 2.0, layer=["walls", "doors"])
+    columnar.add_texts(["a"], [(3, 4)], [1.5])
+    columnar.add_polylines([0, 2, 5], [(0, 0), (1, 1), (2, 2), (3, 3), (4, 4)], [False, True])
+
+    assert [c.layer for c in columnar.circles] == ["walls", "doors"]
+    np.testing.assert_array_equal(columnar.columns.circles.rows[:, 2], [2.0, 2.0])
+    assert columnar.texts[0].text == "a"
+    assert [len(p.points) for p in columnar.polylines] == [2, 3]
+    assert [p.closed for p in columnar.polylines] == [False, True]
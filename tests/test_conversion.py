@@ -0,0 +1,128 @@
+import random
+
+import ezdxf
+import pytest
+
+from app.cad.layers import LEGACY_LAYERS
+from app.core.conversion import program_to_bundle, program_to_columns
+from app.core.dxf_writer import render
+from app.core.nlp_rules import CircleCmd, parse
+from app.core.units import Unit
+from app.dsl.commands import (
+    Coordinate,
+    DrawArc,
+    DrawCircle,
+    DrawEllipse,
+    DrawLine,
+    DrawPolyline,
+    DrawRect,
+    DrawText,
+)
+from app.dsl.compiler import CommandCompiler
+
+UTTERANCE = (
+    "draw a 2 inch circle at (0,0) and a line from 0,0 to 100,50; "
+    "make a rectangle 40x20 with center at (5,5); draw an arc radius 40 mm at (0,0) from 0 to 90; "
+    "polyline closed points: 0,0 10,0 10,10; ellipse center (0,0) rx 40 mm ry 20 mm rot 15; "
+    'text "Kitchen" at (100,200) height 50 mm'
+)
+
+
+def test_trusted_conversion_matches_validated():
+    program = parse(UTTERANCE)
+    trusted = program_to_bundle(program)
+    validated = program_to_bundle(program, trusted=False)
+    assert trusted.model_dump() == validated.model_dump()
+    assert sum(1 for _ in trusted.iter_all()) == 7
+
+
+def test_trusted_conversion_still_rejects_non_positive_radius():
+    program = parse("draw a line from 0,0 to 1,1")
+    program.circles.append(CircleCmd(0.0, 0.0, 0.0))
+    with pytest.raises(ValueError):
+        program_to_bundle(program)
+
+
+def test_trusted_compiler_matches_validated():
+    commands = [
+        DrawCircle(radius=5, center=Coordinate(x=1, y=2)),
+        DrawLine(start=Coordinate(x=0, y=0), end=Coordinate(x=1, y=1, system="relative")),
+        DrawRect(width=2, height=1, anchor="center", position=Coordinate(x=1, y=1, unit="in")),
+    ]
+    trusted = CommandCompiler().compile(commands)
+    validated = CommandCompiler(trusted=False).compile(commands)
+    assert trusted.model_dump() == validated.model_dump()
+
+
+def _mixed_commands(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+
+    def coord() -> Coordinate:
+        return Coordinate(
+            x=round(rng.uniform(-50, 50), 3),
+            y=round(rng.uniform(-50, 50), 3),
+            system=rng.choice(["absolute", "relative", "relative"]),
+            unit=rng.choice([None, "mm", "in"]),
+        )
+
+    def size() -> float | None:
+        return rng.choice([None, round(rng.uniform(0.5, 20), 3)])
+
+    factories = [
+        lambda: DrawCircle(radius=size(), radius_unit=rng.choice([None, "in"]), center=coord()),
+        lambda: DrawLine(start=coord(), end=coord()),
+        lambda: DrawRect(
+            width=size(), height=size(), anchor=rng.choice(["corner", "center"]), position=coord()
+        ),
+        lambda: DrawPolyline(points=[coord() for _ in range(rng.randint(0, 4))], closed=True),
+        lambda: DrawArc(radius=size(), center=coord(), start_angle=rng.choice([None, 45.0])),
+        lambda: DrawEllipse(rx=size(), ry=size(), center=coord(), rotation=15),
+        lambda: DrawText(text="label", position=coord(), height=size()),
+    ]
+    return [rng.choice(factories)() for _ in range(count)]
+
+
+@pytest.mark.parametrize("default_unit", [Unit.MILLIMETER, Unit.INCH])
+def test_compile_batch_matches_sequential_compile(default_unit: Unit):
+    commands = _mixed_commands(400)
+    sequential = CommandCompiler(default_unit=default_unit)
+    batch = CommandCompiler(default_unit=default_unit)
+    for chunk in (commands[:150], commands[150:]):
+        expected = sequential.compile(chunk)
+        assert batch.compile_batch(chunk).to_bundle().model_dump() == expected.model_dump()
+        # The cursor carries over between calls exactly as in the sequential walk.
+        assert batch._cursor == sequential._cursor
+
+
+def test_compile_batch_follows_the_numeric_backend():
+    tie = [DrawCircle(radius=0.0000025)]
+    (expected,) = CommandCompiler().compile(tie).circles
+    decimal = CommandCompiler(backend="decimal").compile_batch(tie)
+    assert decimal.columns.circles.rows[0, 2] == float(expected.radius) == 0.000003
+    fixed = CommandCompiler(backend="fixed").compile_batch(tie)
+    assert fixed.columns.circles.rows[0, 2] == 0.000002
+
+
+def test_compile_batch_rejects_zero_dimensions():
+    with pytest.raises(ValueError, match="circle.radius"):
+        CommandCompiler().compile_batch([DrawCircle(radius=0)])
+
+
+def test_program_to_columns_matches_program_to_bundle():
+    program = parse(UTTERANCE)
+    columns = program_to_columns(program)
+    assert columns.to_bundle().model_dump() == program_to_bundle(program).model_dump()
+
+
+def test_program_to_columns_appends_with_layer_mapping():
+    bundle = program_to_columns(parse("draw a line from 0,0 to 1,1"))
+    program_to_columns(parse(UTTERANCE), bundle, layers={"circles": "CIRCLES"})
+    assert len(bundle.lines) == 2
+    assert [c.layer for c in bundle.circles] == ["CIRCLES"]
+
+
+def test_render_uses_shared_legacy_layers(tmp_path):
+    path = render(parse(UTTERANCE), str(tmp_path / "legacy.dxf"))
+    doc = ezdxf.readfile(path)
+    assert doc.layers.get("CIRCLES").color == 1
+    assert {e.dxf.layer for e in doc.modelspace()} == {spec.name for spec in LEGACY_LAYERS.values()}
@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 
 import ezdxf
+import numpy as np
+import pytest
 
 from app.cad.models import Circle, Line, Point, Rect
 from app.cad.writer import DxfWriter
@@ -23,3 +25,44 @@ def test_writer_adds_entities(tmp_path: Path) -> None:
     assert len(msp.query("LINE")) == 1
     assert len(msp.query("CIRCLE")) == 1
     assert len(msp.query("LWPOLYLINE")) == 1
+
+
+def test_bulk_methods_match_single_entities(tmp_path: Path) -> None:
+    single = DxfWriter()
+    for x in range(3):
+        single.add_circle(Circle(center=Point(x=x, y=1), radius=x + 1))
+        single.add_line(Line(start=Point(x=x, y=0), end=Point(x=x + 1, y=2)))
+
+    bulk = DxfWriter()
+    bulk.add_circles(np.array([[0, 1], [1, 1], [2, 1]]), [1, 2, 3])
+    assert bulk.add_lines([(0, 0), (1, 0), (2, 0)], [(1, 2), (2, 2), (3, 2)]) == 3
+    bulk.add_polylines([0, 3, 3, 5], [(0, 0), (5, 0), (5, 5), (1, 1), (2, 2)], [True, False, False])
+    bulk.add_texts(["a", "b"], [(0, 0), (1, 1)], 2.5, layer=["A-GEOM", "NOTES"])
+    bulk.add_ellipses([(0, 0)], 2, 4, 30)
+
+    def geometry(writer: DxfWriter, kind: str, names: tuple[str, ...]) -> list[tuple]:
+        return [tuple(entity.dxf.get(name) for name in names) for entity in writer.msp.query(kind)]
+
+    for kind, names in (("CIRCLE", ("center", "radius", "layer")), ("LINE", ("start", "end"))):
+        assert geometry(bulk, kind, names) == geometry(single, kind, names)
+
+    polylines = bulk.msp.query("LWPOLYLINE")
+    assert [len(p) for p in polylines] == [3, 2]  # the empty polyline is skipped
+    assert [p.closed for p in polylines] == [True, False]
+    assert [t.dxf.layer for t in bulk.msp.query("TEXT")] == ["A-GEOM", "NOTES"]
+    assert bulk.msp.query("ELLIPSE")[0].dxf.ratio == 0.5
+
+    doc = ezdxf.readfile(bulk.save(tmp_path / "bulk.dxf"))
+    auditor = doc.audit()
+    assert not auditor.has_errors and not auditor.has_fixes
+    assert len(doc.modelspace()) == 11
+
+
+def test_bulk_methods_validate_lengths() -> None:
+    writer = DxfWriter()
+    with pytest.raises(ValueError):
+        writer.add_circles([(0, 0), (1, 1)], [1, 2, 3])
+    with pytest.raises(ValueError):
+        writer.add_lines([(0, 0)], [(1, 1)], layer=["A", "B"])
+    with pytest.raises(TypeError):
+        writer.add_many([Point(x=0, y=0)])
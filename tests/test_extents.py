@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import ezdxf
+import numpy as np
+import pytest
+from ezdxf.math import BoundingBox
+from ezdxf.path import make_path
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.dxf_encode import arc_bounds, arc_box, columns_extents
+from app.cad.models import Arc, Point
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.writer import DxfWriter
+from app.cli.executor import execute_commands
+
+
+def _geometry() -> ColumnarBundle:
+    bundle = ColumnarBundle()
+    bundle.add_line(0, 0, 40, -5)
+    bundle.add_circle(10, 10, 3)
+    bundle.add_rect(-20, 0, 5, 5)
+    bundle.add_polyline([(0, 0), (15, 25), (30, 0)])
+    bundle.add_arc(60, 0, 10, 45, 135)  # top only: the sides stop short of the circle
+    bundle.add_arc(0, 50, 10, 300, 30)  # wraps through 0 degrees
+    bundle.add_ellipse(80, 30, 20, 5, 30)
+    return bundle
+
+
+def _header(path: Path) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    doc = ezdxf.readfile(path)
+    return tuple(doc.header["$EXTMIN"]), tuple(doc.header["$EXTMAX"])
+
+
+def _reference(path: Path) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    # Curves are sampled on the curve itself; Bezier paths and ``ezdxf.bbox`` overshoot.
+    points = []
+    for entity in ezdxf.readfile(path).modelspace():
+        if entity.dxftype() in ("ARC", "CIRCLE", "ELLIPSE"):
+            points.extend(entity.flattening(1e-7))
+        else:
+            points.extend(make_path(entity).flattening(1e-7))
+    box = BoundingBox(points)
+    return tuple(box.extmin), tuple(box.extmax)
+
+
+@pytest.mark.parametrize(
+    ("start", "end", "expected"),
+    [
+        (0, 90, (0, 0, 1, 1)),
+        (45, 135, (-(0.5**0.5), 0.5**0.5, 0.5**0.5, 1)),
+        (300, 30, (0.5, -(0.75**0.5), 1, 0.5)),
+        (0, 360, (-1, -1, 1, 1)),
+        (90, 90, (-1, -1, 1, 1)),
+    ],
+)
+def test_arc_bounds_follow_the_sweep(start: float, end: float, expected: tuple) -> None:
+    vectorised = arc_bounds(*(np.array([v], dtype=float) for v in (0, 0, 1, start, end)))
+    assert [float(v[0]) for v in vectorised] == pytest.approx(expected)
+    assert arc_box(0, 0, 1, start, end) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("writer", ["document", "streaming"])
+def test_writers_record_exact_extents(tmp_path: Path, writer: str) -> None:
+    path = tmp_path / f"{writer}.dxf"
+    if writer == "document":
+        document = DxfWriter()
+        document.add_bundle(_geometry())
+        document.add_arc(Arc(center=Point(x=0, y=-30), radius=5, start_angle=180, end_angle=270))
+        document.save(path)
+    else:
+        with StreamingDxfWriter(path) as streaming:
+            streaming.add_bundle(_geometry())
+            streaming.add_arc(
+                Arc(center=Point(x=0, y=-30), radius=5, start_angle=180, end_angle=270)
+            )
+    low, high = _header(path)
+    ref_low, ref_high = _reference(path)
+    assert low == pytest.approx(ref_low, abs=1e-6)
+    assert high == pytest.approx(ref_high, abs=1e-6)
+
+
+def test_instanced_drawing_keeps_exact_extents(tmp_path: Path) -> None:
+    bundle = ColumnarBundle()
+    for index in range(12):
+        ox = index * 50.0
+        if index % 2:
+            bundle.add_polyline([(ox + 30, 0), (ox + 30, 20), (ox, 20), (ox, 0)], True)
+        else:
+            bundle.add_rect(ox, 0, 20, 30)
+    writer = DxfWriter()
+    plan = writer.add_instanced(bundle, rotation=True)
+    assert plan.insert_count
+    expected = columns_extents(bundle.columns)
+    assert writer.extents == expected
+    low, high = _header(writer.save(tmp_path / "instanced.dxf"))
+    assert low == (expected.xmin, expected.ymin, 0.0)
+    assert high == (expected.xmax, expected.ymax, 0.0)
+
+
+def test_empty_drawing_keeps_default_extents(tmp_path: Path) -> None:
+    low, high = _header(DxfWriter().save(tmp_path / "empty.dxf"))
+    assert low == (1e20, 1e20, 1e20)
+    assert high == (-1e20, -1e20, -1e20)
+
+
+def test_execute_commands_reports_extents(tmp_path: Path) -> None:
+    summary = execute_commands(
+        ["draw a line from 0,0 to 100,50", "draw a line from -10,5 to 20,80"],
+        output=tmp_path / "lines.dxf",
+        enable_ai=False,
+        interactive=False,
+    )
+    assert summary.path == (tmp_path / "lines.dxf").resolve()
+    assert summary.entities == 2
+    extents = summary.extents
+    assert (extents.xmin, extents.ymin, extents.xmax, extents.ymax) == (-10, 0, 100, 80)
+    assert str(summary) == "2 entities, extents (-10, 0) to (100, 80)"
+    assert _header(summary.path) == ((-10, 0, 0), (100, 80, 0))
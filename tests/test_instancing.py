@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import io
+import math
+
+import ezdxf
+import numpy as np
+import pytest
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.instancing import plan_instances
+from app.cad.writer import DxfWriter
+from app.cli.executor import execute_commands
+
+HOLES = ((10, 10), (90, 10), (10, 70), (90, 70))
+
+
+def _panels(columns: int = 5, rows: int = 4) -> ColumnarBundle:
+    bundle = ColumnarBundle()
+    bundle.add_rect(-10, -10, 1000, 1000, layer="BORDER")
+    for i in range(columns):
+        for j in range(rows):
+            ox, oy = i * 150.3, j * 120.7
+            bundle.add_rect(ox, oy, 100, 80)
+            for hx, hy in HOLES:
+                bundle.add_circle(ox + hx, oy + hy, 3, layer="HOLES")
+            bundle.add_text("P", ox + 50, oy + 40, 5)
+    bundle.add_circle(5000, 5000, 2)
+    return bundle
+
+
+def _exploded(writer: DxfWriter) -> list[ezdxf.entities.DXFGraphic]:
+    entities = []
+    for entity in writer.doc.modelspace():
+        if entity.dxftype() == "INSERT":
+            entities.extend(entity.virtual_entities())
+        else:
+            entities.append(entity)
+    return entities
+
+
+def _size(writer: DxfWriter) -> int:
+    stream = io.StringIO()
+    writer.doc.write(stream)
+    return len(stream.getvalue())
+
+
+def test_repeated_panels_become_one_block() -> None:
+    bundle = _panels()
+    writer = DxfWriter()
+    plan = writer.add_instanced(bundle)
+
+    assert len(plan.blocks) == 1
+    assert plan.insert_count == 20
+    assert plan.replaced == 120
+    # The sheet border is dissolved; the lone circle is too small to instance.
+    assert len(plan.remainder.rects) == 1 and len(plan.remainder.circles) == 1
+    assert not writer.doc.audit().has_errors
+
+    exploded = _exploded(writer)
+    assert len(exploded) == len(bundle)
+    centres = sorted(
+        (round(e.dxf.center.x, 9), round(e.dxf.center.y, 9), e.dxf.layer)
+        for e in exploded
+        if e.dxftype() == "CIRCLE"
+    )
+    names = list(bundle.layers)
+    expected = sorted(
+        (round(cx, 9), round(cy, 9), names[lid])
+        for (cx, cy, _), lid in bundle.columns.circles.iter_rows()
+    )
+    assert centres == expected
+
+    plain = DxfWriter()
+    plain.add_bundle(bundle)
+    assert _size(writer) < 0.7 * _size(plain)
+
+
+def _rotated_outlines(count: int = 12) -> tuple[ColumnarBundle, list[np.ndarray]]:
+    shape = np.array([(0, 0), (40, 0), (40, 10), (20, 25), (0, 10)], dtype=float)
+    bundle = ColumnarBundle()
+    placed = []
+    for k in range(count):
+        angle = math.radians(k * 30)
+        turn = np.array([[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]])
+        points = shape @ turn.T + (k * 100, k * 7)
+        bundle.add_polyline([tuple(p) for p in points.tolist()], True)
+        bundle.add_circle(*(np.array([20.0, 8.0]) @ turn.T + (k * 100, k * 7)).tolist(), 2)
+        placed.append(points)
+    return bundle, placed
+
+
+def test_rotation_matches_turned_copies() -> None:
+    bundle, placed = _rotated_outlines()
+    assert plan_instances(bundle).insert_count == 0
+
+    writer = DxfWriter()
+    plan = writer.add_instanced(bundle, rotation=True)
+    assert len(plan.blocks) == 1 and plan.insert_count == 12
+    outlines = [
+        np.array(e.get_points("xy")) for e in _exploded(writer) if e.dxftype() == "LWPOLYLINE"
+    ]
+    for got, expected in zip(outlines, placed, strict=True):
+        assert np.abs(got - expected).max() < 1e-9
+    assert not writer.doc.audit().has_errors
+
+
+def test_groups_with_text_match_by_translation_only() -> None:
+    bundle, _ = _rotated_outlines(6)
+    bundle.add_text("T", 10, 5, 2)
+    plan = plan_instances(bundle, rotation=True)
+    # The first outline now holds a label, so it no longer matches the others.
+    assert plan.insert_count == 5 and plan.replaced == 10
+
+
+def test_plan_rejects_bad_settings() -> None:
+    with pytest.raises(ValueError):
+        plan_instances(ColumnarBundle(), min_count=1)
+    with pytest.raises(ValueError):
+        plan_instances(ColumnarBundle(), tolerance=0)
+
+
+def test_execute_commands_instancing(tmp_path) -> None:
+    commands = [f"draw a rectangle 40x20 with center at ({i * 100},0)" for i in range(12)]
+    path = execute_commands(
+        commands, output=tmp_path / "panels.dxf", enable_ai=False, interactive=False, instances=True
+    ).path
+    doc = ezdxf.readfile(path)
+    assert [e.dxftype() for e in doc.modelspace()] == ["INSERT"] * 12
+    with pytest.raises(ValueError):
+        execute_commands(
+            commands,
+            output=tmp_path / "streamed.dxf",
+            enable_ai=False,
+            interactive=False,
+            instances=True,
+            stream=True,
+        )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import ezdxf
+import pytest
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.joining import join_lines
+from app.cli.executor import execute_commands
+
+
+def _points(bundle: ColumnarBundle) -> list[tuple[bool, list[tuple[float, float]]]]:
+    return [
+        (polyline.closed, [(float(p.x), float(p.y)) for p in polyline.points])
+        for polyline in bundle.polylines
+    ]
+
+
+def test_square_of_lines_becomes_a_closed_polyline() -> None:
+    bundle = ColumnarBundle()
+    bundle.add_line(0, 0, 10, 0)
+    bundle.add_line(10, 10, 10, 0)  # drawn backwards
+    bundle.add_line(10, 10, 0, 10)
+    bundle.add_line(0, 10, 0, 0)
+    bundle.add_circle(5, 5, 1)
+
+    joined = join_lines(bundle)
+    assert len(joined.lines) == 0
+    assert _points(joined) == [(True, [(0, 0), (10, 0), (10, 10), (0, 10)])]
+    assert len(joined.circles) == 1
+
+
+def test_open_chain_extends_both_ways_and_stops_at_junctions() -> None:
+    bundle = ColumnarBundle()
+    bundle.add_line(110, 0, 120, 5)
+    bundle.add_line(100, 0, 110, 0)
+    bundle.add_line(120, 5, 130, 0)
+    # Three lines meet at (210, 0), so none of them is joined.
+    bundle.add_line(200, 0, 210, 0)
+    bundle.add_line(210, 0, 220, 0)
+    bundle.add_line(210, 0, 210, 10)
+
+    joined = join_lines(bundle)
+    assert _points(joined) == [(False, [(100, 0), (110, 0), (120, 5), (130, 0)])]
+    assert len(joined.lines) == 3
+
+
+def test_lines_join_within_tolerance_but_not_across_layers() -> None:
+    bundle = ColumnarBundle()
+    bundle.add_line(0, 0, 10, 0)
+    bundle.add_line(10.0000001, 0, 20, 0)
+    bundle.add_line(20, 0, 30, 0, layer="OTHER")
+    bundle.add_line(40, 0, 40, 0)
+
+    joined = join_lines(bundle)
+    assert _points(joined) == [(False, [(0, 0), (10, 0), (20, 0)])]
+    assert [line.layer for line in joined.lines] == ["OTHER", bundle.lines[3].layer]
+
+    untouched = ColumnarBundle()
+    untouched.add_line(0, 0, 1, 1)
+    assert join_lines(untouched) is untouched
+    with pytest.raises(ValueError):
+        join_lines(untouched, tolerance=0)
+
+
+def test_execute_commands_merges_lines(tmp_path) -> None:
+    commands = [
+        "draw a line from 0,0 to 100,0",
+        "draw a line from 100,0 to 100,50",
+        "draw a line from 100,50 to 0,0",
+    ]
+    path = execute_commands(
+        commands,
+        output=tmp_path / "merged.dxf",
+        enable_ai=False,
+        interactive=False,
+        merge_lines=True,
+    ).path
+    (polyline,) = ezdxf.readfile(path).modelspace()
+    assert polyline.dxftype() == "LWPOLYLINE" and polyline.closed
+    assert [tuple(p) for p in polyline.get_points("xy")] == [(0, 0), (100, 0), (100, 50)]
@@ -1,9 +1,12 @@
+import time
+
 import pytest
 
+from app.core.deadline import Deadline
 from app.dsl.commands import DrawCircle
-from app.dsl.errors import E_SCHEMA_VALIDATION, ParseError
+from app.dsl.errors import E_DEADLINE_EXCEEDED, E_SCHEMA_VALIDATION, ParseError
 from app.dsl.llm_parser import LLMParser
-from app.dsl.llm_provider import BaseLLMProvider
+from app.dsl.llm_provider import REGISTRY, BaseLLMProvider, MockProvider, ProviderRegistry
 
 
 class DummyProvider(BaseLLMProvider):
@@ -74,3 +77,63 @@ def test_llm_parser_exhausts_retries():
     with pytest.raises(ParseError) as exc:
         parser.parse("draw something")
     assert exc.value.code == E_SCHEMA_VALIDATION[0]
+
+
+def test_llm_parser_deadline_falls_back_to_rules():
+    def slow_response(text, schema, context=None):
+        time.sleep(0.5)
+        return {"commands": []}
+
+    provider = DummyProvider([slow_response])
+    parser = LLMParser(provider=provider)
+    started = time.monotonic()
+    commands = parser.parse("draw circle r=5 at (1,2)", deadline=Deadline.after(0.05))
+    assert time.monotonic() - started < 0.4
+    assert isinstance(commands[0], DrawCircle)
+    assert commands[0].radius == 5.0
+
+
+def test_llm_parser_deadline_exceeded_without_rule_match():
+    provider = DummyProvider([{"commands": []}])
+    parser = LLMParser(provider=provider)
+    with pytest.raises(ParseError) as exc:
+        parser.parse("sketch something nice", deadline=Deadline.after(0))
+    assert exc.value.code == E_DEADLINE_EXCEEDED[0]
+    assert provider.contexts == []
+
+
+def test_llm_parser_passes_remaining_budget_to_provider():
+    provider = DummyProvider([{"commands": []}])
+    parser = LLMParser(provider=provider)
+    parser.parse("anything", deadline=Deadline.after(5))
+    assert 0 < provider.contexts[0]["timeout"] <= 5
+
+
+def test_llm_parser_validates_raw_json_strings():
+    provider = DummyProvider(
+        [
+            '{"commands": [{"type": "draw_line", "start": {"x": "1", "y": 2}, "end": {}}]}',
+        ]
+    )
+    commands = LLMParser(provider=provider).parse("a line")
+    assert commands[0].start.x == 1.0
+
+
+def test_llm_parser_reports_json_errors_in_retry_context():
+    provider = DummyProvider(["{broken", {"commands": []}])
+    LLMParser(provider=provider, max_retries=2).parse("anything")
+    assert provider.contexts[1]["errors"][0]["type"] == "json_parse_error"
+
+
+def test_registry_loads_optional_providers_on_first_lookup():
+    assert {"openai", "replay", "record"} <= set(REGISTRY.available())
+
+
+def test_registry_surfaces_provider_import_errors():
+    def broken() -> None:
+        raise ImportError("cassette module is broken")
+
+    registry = ProviderRegistry(loader=broken)
+    registry.register("mock", lambda cfg: MockProvider(**cfg))
+    with pytest.raises(ImportError, match="broken"):
+        registry.get("mock", {})
@@ -0,0 +1,132 @@
+import json
+import sqlite3
+
+import pytest
+
+from app.dsl.clarify import clarify_pass
+from app.dsl.commands import DrawCircle
+from app.memory import ProjectMemoryStore, SessionMemory, SQLiteMemoryStore, open_store
+
+
+@pytest.fixture(params=["memory.json", "memory.db"])
+def store(request, tmp_path):
+    opened = open_store(tmp_path / request.param)
+    yield opened
+    opened.close()
+
+
+def test_open_store_selects_backend(tmp_path):
+    assert isinstance(open_store(tmp_path / "a.json"), ProjectMemoryStore)
+    sqlite_store = open_store(tmp_path / "a.sqlite")
+    assert isinstance(sqlite_store, SQLiteMemoryStore)
+    sqlite_store.close()
+
+
+def test_store_roundtrip(store):
+    store.set_value("demo", "circle.radius", 15.0)
+    store.set_values("demo", {"text.text": "Kitchen", "rect.width": 40})
+    store.set_value("other", "circle.radius", 2.0)
+    store.delete_value("demo", "rect.width")
+    assert store.load_project("demo") == {"circle.radius": 15.0, "text.text": "Kitchen"}
+    assert store.projects() == ["demo", "other"]
+
+
+def test_batch_reads_its_own_writes(store):
+    with store.batch():
+        store.set_value("demo", "a", 1)
+        store.delete_value("demo", "a")
+        store.set_value("demo", "b", 2)
+        assert store.load_project("demo") == {"b": 2}
+    assert store.load_project("demo") == {"b": 2}
+
+
+def test_json_batch_writes_file_once(tmp_path, monkeypatch):
+    path = tmp_path / "memory.json"
+    store = ProjectMemoryStore(path)
+    writes = []
+    original = ProjectMemoryStore._write
+
+    def counting_write(self, data):
+        if self._batch_data is None:
+            writes.append(dict(data))
+        original(self, data)
+
+    monkeypatch.setattr(ProjectMemoryStore, "_write", counting_write)
+    with store.batch():
+        for i in range(50):
+            store.set_value("demo", f"k{i}", i)
+    assert len(writes) == 1
+    store.set_value("demo", "k1", 1)  # unchanged value: no write
+    assert len(writes) == 1
+    assert json.loads(path.read_text())["demo"]["k49"] == 49
+
+
+def test_sqlite_uses_wal_and_one_transaction_per_batch(tmp_path):
+    path = tmp_path / "memory.db"
+    store = SQLiteMemoryStore(path)
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    with store.batch():
+        for i in range(20):
+            store.set_value("demo", f"k{i}", i)
+    assert statements.count("BEGIN IMMEDIATE") == 1
+    reader = sqlite3.connect(path)
+    assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert reader.execute("SELECT COUNT(*) FROM project_memory").fetchone()[0] == 20
+    reader.close()
+    store.close()
+
+
+def test_sqlite_keeps_buffered_writes_when_the_database_is_locked(tmp_path):
+    path = tmp_path / "memory.db"
+    store = SQLiteMemoryStore(path, timeout=0.05)
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    with pytest.raises(sqlite3.OperationalError), store.batch():
+        store.set_value("demo", "circle.radius", 12.5)
+    assert store.load_project("demo") == {"circle.radius": 12.5}
+    blocker.execute("ROLLBACK")
+    blocker.close()
+    store.set_value("demo", "line.end.x", 50)
+    reader = SQLiteMemoryStore(path)
+    assert reader.load_project("demo") == {"circle.radius": 12.5, "line.end.x": 50}
+    reader.close()
+    store.close()
+
+
+def test_sqlite_is_shared_between_connections(tmp_path):
+    path = tmp_path / "memory.db"
+    first, second = SQLiteMemoryStore(path), SQLiteMemoryStore(path)
+    first.set_value("demo", "circle.radius", 12.5)
+    assert second.load_project("demo") == {"circle.radius": 12.5}
+    first.close()
+    second.close()
+
+
+def test_json_export_import_between_backends(tmp_path):
+    legacy = ProjectMemoryStore(tmp_path / "legacy.json")
+    legacy.set_values("demo", {"circle.radius": 15.0, "text.text": "Door"})
+    target = SQLiteMemoryStore(tmp_path / "memory.db")
+    assert target.import_json(legacy.path) == 2
+    exported = target.export_json(tmp_path / "export.json")
+    assert json.loads(exported.read_text()) == json.loads(legacy.path.read_text())
+    target.close()
+
+
+def test_clarify_pass_persists_defaults_in_one_batch(tmp_path):
+    store = SQLiteMemoryStore(tmp_path / "memory.db")
+    statements = []
+    store._conn.set_trace_callback(statements.append)
+    session = SessionMemory(store=store, project_id="demo")
+    commands = [
+        DrawCircle.model_validate({"radius": 5, "center": {"x": i, "y": 1}}) for i in range(10)
+    ]
+    result = clarify_pass(commands, session)
+    assert not result.followups
+    assert statements.count("BEGIN IMMEDIATE") == 1
+    assert store.load_project("demo") == {
+        "circle.radius": 5.0,
+        "circle.center.x": 9.0,
+        "circle.center.y": 1.0,
+    }
+    store.close()
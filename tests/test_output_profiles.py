@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import ezdxf
+import pytest
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.profiles import get_profile
+from app.cad.r12 import ELLIPSE_SEGMENTS, R12Writer
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.writer import DxfWriter
+from app.cli.executor import execute_commands
+
+
+def _bundle() -> ColumnarBundle:
+    bundle = ColumnarBundle()
+    bundle.add_line(0, 0, 100 / 3, 0)
+    bundle.add_circle(1 / 3, 2 / 3, 25 / 7, layer="HOLES")
+    bundle.add_rect(-10, -20, 30, 40)
+    bundle.add_polyline([(0, 0), (10, 5), (20, 0)])
+    bundle.add_arc(0, 0, 10, 0, 90)
+    bundle.add_ellipse(5, 5, 4, 8, 30)
+    bundle.add_text("Kitchen", 100, 200, 50)
+    return bundle
+
+
+def _longest_fraction(path: Path) -> int:
+    text = path.read_text(encoding="utf-8", errors="replace")
+    return max(len(digits) for digits in re.findall(r"^-?\d+\.(\d+)$", text, re.MULTILINE))
+
+
+def test_binary_profile_round_trips(tmp_path: Path) -> None:
+    ascii_writer = DxfWriter()
+    ascii_writer.add_bundle(_bundle())
+    ascii_path = ascii_writer.save(tmp_path / "ascii.dxf")
+    binary_writer = DxfWriter()
+    binary_writer.add_bundle(_bundle())
+    binary_path = binary_writer.save(tmp_path / "binary.dxf", fmt="bin")
+
+    assert binary_path.read_bytes().startswith(b"AutoCAD Binary DXF")
+    expected = [(e.dxftype(), e.dxf.layer) for e in ezdxf.readfile(ascii_path).modelspace()]
+    assert [(e.dxftype(), e.dxf.layer) for e in ezdxf.readfile(binary_path).modelspace()] == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_precision_limits_ascii_decimals(tmp_path: Path, streaming: bool) -> None:
+    path = tmp_path / "rounded.dxf"
+    if streaming:
+        with StreamingDxfWriter(path, precision=3) as writer:
+            writer.add_bundle(_bundle())
+    else:
+        writer = DxfWriter(precision=3)
+        writer.add_bundle(_bundle())
+        writer.save(path)
+
+    doc = ezdxf.readfile(path)
+    (circle,) = doc.modelspace().query("CIRCLE")
+    assert circle.dxf.radius == 3.571
+    assert tuple(circle.dxf.center) == (0.333, 0.667, 0.0)
+    # Header variables keep ezdxf's own formatting; the entities section is rounded
+    # except the ellipse end parameter (group 42), which must stay exactly 2 * pi.
+    entities = path.read_text(encoding="utf-8").split("ENTITIES", 1)[1].split("ENDSEC", 1)[0]
+    lines = entities.split("\n")[1:]
+    values = [value for code, value in zip(lines[::2], lines[1::2], strict=False) if code != " 42"]
+    fractions = [value.split(".")[1] for value in values if re.fullmatch(r"-?\d+\.\d+", value)]
+    assert fractions and max(len(digits) for digits in fractions) <= 3
+
+
+def test_r12_profile_writes_minimal_entities(tmp_path: Path) -> None:
+    with R12Writer(tmp_path / "minimal.dxf", precision=2) as writer:
+        writer.add_bundle(_bundle())
+    assert writer.entity_count == 7
+
+    doc = ezdxf.readfile(writer.path)
+    assert doc.dxfversion == "AC1009"
+    assert not doc.audit().has_errors
+    kinds = [e.dxftype() for e in doc.modelspace()]
+    assert kinds == ["LINE", "CIRCLE", "POLYLINE", "POLYLINE", "ARC", "POLYLINE", "TEXT"]
+    ellipse = doc.modelspace()[5]
+    assert ellipse.is_closed and len(ellipse) == ELLIPSE_SEGMENTS
+    assert _longest_fraction(writer.path) <= 2
+    assert "HEADER" not in writer.path.read_text(encoding="cp1252")
+
+
+def test_execute_commands_output_formats(tmp_path: Path) -> None:
+    command = ["draw a circle radius 5 at 1,2"]
+    for name, dxfversion in (("binary", "AC1032"), ("r12", "AC1009")):
+        path = execute_commands(
+            command,
+            output=tmp_path / f"{name}.dxf",
+            enable_ai=False,
+            interactive=False,
+            output_format=name,
+        ).path
+        doc = ezdxf.readfile(path)
+        assert doc.dxfversion == dxfversion
+        assert [e.dxftype() for e in doc.modelspace()] == ["CIRCLE"]
+
+    with pytest.raises(ValueError):
+        execute_commands(
+            command, output=tmp_path / "x.dxf", enable_ai=False, output_format="binary", stream=True
+        )
+    with pytest.raises(ValueError):
+        get_profile("svg")
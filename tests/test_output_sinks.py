@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import gzip
+import io
+import tracemalloc
+from pathlib import Path
+
+import ezdxf
+import pytest
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.models import Circle, Line, Point
+from app.cad.r12 import R12Writer
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.writer import DxfWriter
+from app.cli.executor import execute_commands
+from app.main import main
+
+
+def _bundle() -> ColumnarBundle:
+    bundle = ColumnarBundle()
+    bundle.add_line(-50, 0, 100, 0)
+    bundle.add_circle(10, 20, 5, layer="HOLES")
+    bundle.add_polyline([(0, 0), (10, 5), (20, 0)])
+    bundle.add_ellipse(5, 5, 4, 8, 30)
+    bundle.add_text("Kitchen", 100, 200, 50)
+    return bundle
+
+
+def _read(data: bytes) -> ezdxf.document.Drawing:
+    return ezdxf.read(io.StringIO(data.decode("utf-8")))
+
+
+def _kinds(doc: ezdxf.document.Drawing) -> list[str]:
+    return [entity.dxftype() for entity in doc.modelspace()]
+
+
+def test_streaming_writer_defers_output_for_a_stream() -> None:
+    sink = io.BytesIO()
+    writer = StreamingDxfWriter(sink, layers=["0", "HOLES"])
+    writer.add_line(Line(start=Point(x=0, y=0), end=Point(x=10, y=0)))
+    writer.add_bundle(_bundle())
+    writer.add_circle(Circle(center=Point(x=300, y=400), radius=1))
+    assert sink.getvalue() == b""
+    assert writer.close() is None
+    assert not sink.closed
+
+    doc = _read(sink.getvalue())
+    assert _kinds(doc) == ["LINE", "LINE", "CIRCLE", "LWPOLYLINE", "ELLIPSE", "TEXT", "CIRCLE"]
+    assert writer.entity_count == 7
+    assert doc.header["$EXTMIN"][0] == pytest.approx(-50)
+    assert doc.header["$EXTMAX"][:2] == pytest.approx((301, 401))
+    assert int(doc.header["$HANDSEED"], 16) > max(int(e.dxf.handle, 16) for e in doc.modelspace())
+    assert not doc.audit().has_errors
+
+
+def test_stream_output_matches_file_output(tmp_path: Path) -> None:
+    with StreamingDxfWriter(tmp_path / "file.dxf", workers=2, chunk_size=2) as writer:
+        writer.add_bundle(_bundle())
+    sink = io.BytesIO()
+    with StreamingDxfWriter(sink, workers=2, chunk_size=2) as streamed:
+        streamed.add_bundle(_bundle())
+
+    from_file = ezdxf.readfile(tmp_path / "file.dxf")
+    from_stream = _read(sink.getvalue())
+    assert [e.dxf.handle for e in from_stream.modelspace()] == [
+        e.dxf.handle for e in from_file.modelspace()
+    ]
+    for name in ("$HANDSEED", "$EXTMIN", "$EXTMAX"):
+        assert from_stream.header[name] == from_file.header[name]
+
+
+def test_a_single_bundle_streams_without_a_temporary_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def no_spool(*args: object, **kwargs: object) -> None:
+        raise AssertionError("a temporary file was staged")
+
+    monkeypatch.setattr("app.cad.streaming.tempfile.TemporaryFile", no_spool)
+    sink = io.BytesIO()
+    with StreamingDxfWriter(sink, layers=["0", "HOLES"]) as streamed:
+        streamed.add_bundle(_bundle())
+    with StreamingDxfWriter(tmp_path / "bundle.dxf.gz") as compressed:
+        compressed.add_bundle(_bundle())
+
+    doc = _read(sink.getvalue())
+    assert _kinds(doc) == ["LINE", "CIRCLE", "LWPOLYLINE", "ELLIPSE", "TEXT"]
+    assert streamed.entity_count == 5
+    assert doc.header["$EXTMIN"][0] == pytest.approx(-50)
+    assert int(doc.header["$HANDSEED"], 16) > max(int(e.dxf.handle, 16) for e in doc.modelspace())
+    data = gzip.decompress((tmp_path / "bundle.dxf.gz").read_bytes())
+    assert _read(data).header["$EXTMAX"][:2] == doc.header["$EXTMAX"][:2]
+
+
+def test_entities_added_after_a_held_bundle_keep_their_order() -> None:
+    sink = io.BytesIO()
+    with StreamingDxfWriter(sink, layers=["0", "HOLES"]) as writer:
+        writer.add_bundle(_bundle())
+        writer.add_circle(Circle(center=Point(x=300, y=400), radius=1))
+        writer.add_bundle(_bundle())
+
+    doc = _read(sink.getvalue())
+    bundle_kinds = ["LINE", "CIRCLE", "LWPOLYLINE", "ELLIPSE", "TEXT"]
+    assert _kinds(doc) == [*bundle_kinds, "CIRCLE", *bundle_kinds]
+    assert doc.header["$EXTMAX"][:2] == pytest.approx((301, 401))
+    assert not doc.audit().has_errors
+
+
+@pytest.mark.parametrize("fmt", ["asc", "bin"])
+def test_document_writer_writes_to_a_stream(fmt: str) -> None:
+    writer = DxfWriter()
+    writer.add_bundle(_bundle())
+    sink = io.BytesIO()
+    writer.write(sink, fmt=fmt)
+    assert not sink.closed
+    if fmt == "bin":
+        assert sink.getvalue().startswith(b"AutoCAD Binary DXF")
+        return
+    assert _kinds(_read(sink.getvalue())) == ["LINE", "CIRCLE", "LWPOLYLINE", "ELLIPSE", "TEXT"]
+
+
+def test_every_writer_compresses_gz_paths(tmp_path: Path) -> None:
+    document = DxfWriter()
+    document.add_bundle(_bundle())
+    document.save(tmp_path / "document.dxf.gz")
+    with StreamingDxfWriter(tmp_path / "streaming.dxf.gz") as streaming:
+        streaming.add_bundle(_bundle())
+    with R12Writer(tmp_path / "minimal.dxf.gz") as minimal:
+        minimal.add_bundle(_bundle())
+
+    for name in ("document", "streaming"):
+        data = gzip.decompress((tmp_path / f"{name}.dxf.gz").read_bytes())
+        assert _kinds(_read(data)) == ["LINE", "CIRCLE", "LWPOLYLINE", "ELLIPSE", "TEXT"]
+    data = gzip.decompress((tmp_path / "minimal.dxf.gz").read_bytes())
+    kinds = _kinds(ezdxf.read(io.StringIO(data.decode("cp1252"))))
+    assert kinds == ["LINE", "CIRCLE", "POLYLINE", "POLYLINE", "TEXT"]
+
+
+def test_gz_output_spools_entities_instead_of_holding_them(tmp_path: Path) -> None:
+    line = Line(start=Point(x=0, y=0), end=Point(x=10, y=0))
+    writer = StreamingDxfWriter(tmp_path / "spooled.dxf.gz", buffer_size=1 << 16)
+    tracemalloc.start()
+    try:
+        for _ in range(50_000):
+            writer.add_line(line)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    writer.close()
+
+    assert peak < 256 * 1024
+    data = gzip.decompress((tmp_path / "spooled.dxf.gz").read_bytes())
+    assert len(_kinds(_read(data))) == 50_000
+
+
+def test_aborted_gz_output_is_removed(tmp_path: Path) -> None:
+    path = tmp_path / "partial.dxf.gz"
+    with pytest.raises(KeyError), StreamingDxfWriter(path) as writer:
+        writer.add_bundle(_bundle())
+        raise KeyError("boom")
+    assert not path.exists()
+
+
+def test_r12_writer_writes_to_a_stream() -> None:
+    sink = io.BytesIO()
+    with R12Writer(sink) as writer:
+        writer.add_bundle(_bundle())
+    assert writer.close() is None
+    assert sink.getvalue().endswith(b"EOF\n")
+
+
+@pytest.mark.parametrize("extra", [[], ["--stream"], ["--format", "binary"], ["--format", "r12"]])
+def test_cli_writes_dxf_to_stdout(
+    extra: list[str], capsysbinary: pytest.CaptureFixture[bytes]
+) -> None:
+    main(
+        [
+            "--cmd",
+            "draw a line from 0,0 to 100,0",
+            "--no-ai",
+            "--non-interactive",
+            "--out",
+            "-",
+            *extra,
+        ]
+    )
+    captured = capsysbinary.readouterr()
+    assert b"DXF saved to: stdout" in captured.err
+    if "binary" in extra:
+        assert captured.out.startswith(b"AutoCAD Binary DXF")
+    else:
+        tags = captured.out.split()
+        assert tags[:2] == [b"0", b"SECTION"]
+        assert tags[-2:] == [b"0", b"EOF"]
+
+
+def test_execute_commands_writes_gzip(tmp_path: Path) -> None:
+    path = execute_commands(
+        ["draw a line from 0,0 to 100,0"],
+        output=tmp_path / "drawing.dxf.gz",
+        enable_ai=False,
+        interactive=False,
+    ).path
+    assert path == (tmp_path / "drawing.dxf.gz").resolve()
+    assert "LINE" in _kinds(_read(gzip.decompress(path.read_bytes())))
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+
+from app.ai.providers import LangChainProvider  # noqa: E402
+from app.cli.executor import execute_commands  # noqa: E402
+from app.dsl.llm_parser import LLMParser  # noqa: E402
+
+
+def _provider(prompts, **kwargs):
+    def respond(prompt_value):
+        prompts.append(prompt_value.to_messages()[-1].content)
+        return json.dumps(
+            {
+                "commands": [
+                    {"type": "draw_circle", "center": {"x": 0, "y": 0}, "radius": len(prompts)}
+                ]
+            }
+        )
+
+    return LangChainProvider(RunnableLambda(respond), provider_name="openai", **kwargs)
+
+
+def test_history_is_compacted_and_never_repeats_schema():
+    prompts: list[str] = []
+    provider = _provider(prompts)
+    parser = LLMParser(provider=provider)
+
+    for utterance in ("first circle", "second circle", "third circle"):
+        parser.parse(utterance)
+
+    last = prompts[-1]
+    assert last.count("Return **only** JSON") == 1
+    assert "User: first circle" in last and "User: second circle" in last
+    assert '"radius":1.0' in last
+    assert provider.last_usage is not None
+    assert provider.last_usage.history_turns == 2
+    assert provider.last_usage.chars == len(last)
+
+
+def test_history_respects_token_budget():
+    prompts: list[str] = []
+    provider = _provider(prompts, history_tokens=40)
+    parser = LLMParser(provider=provider)
+
+    for index in range(5):
+        parser.parse(f"circle number {index}")
+
+    assert provider.last_usage is not None
+    assert provider.last_usage.history_turns == 1
+    assert "circle number 3" in prompts[-1]
+    assert "circle number 2" not in prompts[-1]
+
+
+def test_run_summary_reports_the_largest_prompt(tmp_path):
+    prompts: list[str] = []
+    provider = _provider(prompts)
+    summary = execute_commands(
+        ["a small circle please", "another small circle"],
+        output=tmp_path / "circles.dxf",
+        interactive=False,
+        parser=LLMParser(provider=provider),
+    )
+
+    assert summary.entities == 2
+    assert summary.prompt is not None
+    assert summary.prompt.chars == max(len(prompt) for prompt in prompts)
+    assert summary.prompt.history_turns == 1
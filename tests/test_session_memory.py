@@ -0,0 +1,139 @@
+import pytest
+
+from app.dsl.errors import E_MEMORY_EXPIRED, ParseError
+from app.memory import SessionManager, SessionMemory
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sweep_drops_only_expired_entries():
+    clock = FakeClock()
+    session = SessionMemory(ttl=10, clock=clock)
+    session.set("short", 1, ttl=1)
+    session.set("long", 2)
+    session.set("forever", 3, ttl=0)
+    session.set("short", 4, ttl=5)  # overwrite leaves a stale heap entry behind
+    clock.now += 2
+    assert session.sweep() == 0
+    clock.now += 4
+    assert session.sweep() == 1
+    assert session.get("short") is None
+    assert session.get("long") == 2
+    clock.now += 100
+    assert session.sweep() == 1
+    assert session.get("forever") == 3
+    assert session.stats().expired == 2
+
+
+def test_strict_expiry_still_raises_on_read():
+    clock = FakeClock()
+    session = SessionMemory(ttl=1, clock=clock)
+    session.set("transient", 42)
+    clock.now += 2
+    with pytest.raises(ParseError) as exc:
+        session.get("transient")
+    assert exc.value.code == E_MEMORY_EXPIRED[0]
+
+
+def test_lenient_expiry_falls_back_to_defaults():
+    clock = FakeClock()
+    session = SessionMemory(ttl=1, strict_expiry=False, clock=clock)
+    session.remember_default("circle.radius", 5.0)
+    session.set("circle.radius", 9.0)
+    clock.now += 2
+    assert session.get("circle.radius") == 5.0
+    session.set("answer", "x")
+    clock.now += 2
+    assert session.pop("answer") is None
+
+
+def test_max_entries_evicts_least_recently_used():
+    session = SessionMemory(max_entries=2)
+    session.set("a", 1)
+    session.set("b", 2)
+    assert session.get("a") == 1  # refresh "a"
+    session.set("c", 3)
+    assert session.get("b") is None
+    assert session.get("a") == 1 and session.get("c") == 3
+    assert len(session) == 2
+    assert session.stats().evicted == 1
+
+
+def test_heap_stays_bounded_under_overwrites():
+    session = SessionMemory(ttl=60)
+    for i in range(10_000):
+        session.set("key", i)
+    assert session.stats().heap_size < 100
+
+
+def test_manager_expires_idle_sessions():
+    clock = FakeClock()
+    manager = SessionManager(session_ttl=10, clock=clock)
+    manager.get("a").set("x", 1)
+    manager.get("b")
+    clock.now += 6
+    manager.get("a")  # touch keeps "a" alive
+    clock.now += 6
+    assert manager.sweep() == 1
+    assert "a" in manager and "b" not in manager
+    stats = manager.stats()
+    assert stats.sessions == 1 and stats.entries == 1 and stats.heap_size == 1
+
+
+def test_manager_bounds_sessions_and_entries():
+    manager = SessionManager(max_sessions=2, max_entries_per_session=3, max_total_entries=4)
+    first = manager.get("first")
+    for key in "abcd":
+        first.set(key, key)
+    assert len(first) == 3
+    manager.get("second").set("k", 1)
+    second = manager.get("second")
+    second.set("l", 2)
+    assert "first" not in manager  # total limit evicts the least recently used session
+    manager.get("third")
+    manager.get("fourth")
+    assert len(manager) == 2 and "second" not in manager
+    stats = manager.stats()
+    assert stats.entries == sum(len(manager.get(sid)) for sid in ("third", "fourth"))
+    assert stats.evicted_sessions == 2
+
+
+def test_manager_memory_is_flat_for_short_sessions():
+    clock = FakeClock()
+    manager = SessionManager(session_ttl=1, entry_ttl=1, max_sessions=1_000, clock=clock)
+    for i in range(20_000):
+        manager.get(f"s{i}").set("circle.radius", i)
+        clock.now += 0.01
+    stats = manager.stats()
+    assert stats.sessions <= 101
+    assert stats.heap_size <= 2 * stats.sessions + 64
+    assert stats.entries == stats.sessions
+
+
+def test_manager_shares_project_defaults(tmp_path):
+    from app.memory import ProjectMemoryStore
+
+    store = ProjectMemoryStore(tmp_path / "memory.json")
+    manager = SessionManager(store=store)
+    manager.get("a", project_id="demo").remember_default("rect.width", 40.0)
+    assert manager.get("b", project_id="demo").get_default("rect.width") == 40.0
+    assert manager.get("c", project_id="other").get_default("rect.width") is None
+
+
+def test_manager_releases_project_defaults_with_the_last_session():
+    manager = SessionManager(max_sessions=2)
+    manager.get("a", project_id="demo")
+    manager.get("b", project_id="demo")
+    manager.drop("a")
+    assert manager.stats().projects == 1
+    manager.drop("b")
+    assert manager.stats().projects == 0
+    for index in range(100):
+        manager.get(f"s{index}", project_id=f"p{index}")
+    assert manager.stats().projects == 2
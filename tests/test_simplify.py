@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import sys
+
+import ezdxf
+import numpy as np
+import pytest
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.simplify import douglas_peucker, simplify_polylines
+from app.cli.executor import execute_commands
+from app.core.config import reload_settings
+
+
+def _noisy_line(count: int, noise: float, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    xs = np.linspace(0, 1000, count)
+    return np.column_stack([xs, rng.uniform(-noise, noise, count)])
+
+
+def test_collinear_noise_collapses_to_the_end_points() -> None:
+    points = _noisy_line(10_000, 0.001)
+    keep = douglas_peucker(points, 0.01)
+    assert keep.tolist().count(True) == 2 and keep[0] and keep[-1]
+
+
+def test_corners_beyond_tolerance_are_kept() -> None:
+    points = np.array([(0, 0), (5, 0.001), (10, 0), (10, 5), (10, 10), (5, 10.5)], dtype=float)
+    keep = douglas_peucker(points, 0.01)
+    assert np.flatnonzero(keep).tolist() == [0, 2, 4, 5]
+
+
+def test_huge_input_runs_without_recursion() -> None:
+    # A zig-zag keeps every vertex, which would recurse once per vertex.
+    count = sys.getrecursionlimit() * 4
+    points = np.column_stack([np.arange(count, dtype=float), np.arange(count) % 2 * 10.0])
+    assert douglas_peucker(points, 0.1).all()
+
+
+def test_bundle_simplification_reports_the_reduction() -> None:
+    bundle = ColumnarBundle()
+    bundle.add_polyline([tuple(p) for p in _noisy_line(500, 0.001).tolist()], layer="P")
+    ring = [(0, 0), (5, 0.001), (10, 0), (10, 10), (5, 10), (0, 10), (0, 0)]
+    bundle.add_polyline(ring, closed=True)
+    bundle.add_polyline([(0, 0), (1, 1)])
+    bundle.add_line(0, 0, 1, 1)
+
+    simplified, report = simplify_polylines(bundle, 0.01)
+    assert (report.polylines, report.vertices_before, report.vertices_after) == (3, 509, 8)
+    assert report.reduction == pytest.approx(501 / 509)
+    assert "509 -> 8 vertices" in str(report)
+    first, second, third = simplified.polylines
+    assert len(first.points) == 2 and first.layer == "P"
+    assert second.closed
+    assert [(float(p.x), float(p.y)) for p in second.points] == [(0, 0), (10, 0), (10, 10), (0, 10)]
+    assert len(third.points) == 2
+    assert len(simplified.lines) == 1
+
+    unchanged, report = simplify_polylines(simplified, 0.01)
+    assert unchanged is simplified and report.removed == 0
+    with pytest.raises(ValueError):
+        simplify_polylines(bundle, 0)
+
+
+def test_setting_enables_simplification(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    command = "polyline points: " + " ".join(f"{x},{x % 2 * 0.001}" for x in range(50))
+    monkeypatch.setenv("SIMPLIFY_TOLERANCE_MM", "0.01")
+    reload_settings()
+    try:
+        summary = execute_commands(
+            [command], output=tmp_path / "simple.dxf", enable_ai=False, interactive=False
+        )
+    finally:
+        monkeypatch.delenv("SIMPLIFY_TOLERANCE_MM", raising=False)
+        reload_settings()
+    (polyline,) = ezdxf.readfile(summary.path).modelspace()
+    assert len(polyline) == 2
+    assert summary.simplify is not None
+    assert (summary.simplify.vertices_before, summary.simplify.vertices_after) == (50, 2)
+
+
+def test_summary_has_no_report_without_simplification(tmp_path) -> None:
+    summary = execute_commands(
+        ["draw a line from 0,0 to 10,0"],
+        output=tmp_path / "plain.dxf",
+        enable_ai=False,
+        interactive=False,
+    )
+    assert summary.simplify is None
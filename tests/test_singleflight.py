@@ -0,0 +1,53 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.dsl.commands import DrawCircle
+from app.dsl.llm_provider import BaseLLMProvider
+from app.dsl.singleflight import SingleFlight, SingleFlightParser, normalise_prompt
+
+CIRCLE = {
+    "commands": [
+        {"type": "draw_circle", "center": {"x": 1, "y": 2, "system": "absolute"}, "radius": 3}
+    ]
+}
+
+
+class GatedProvider(BaseLLMProvider):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.calls = 0
+
+    def parse(self, text, schema, *, context=None):
+        self.calls += 1
+        self.release.wait(5)
+        return CIRCLE
+
+
+def test_identical_requests_share_one_provider_call():
+    provider = GatedProvider()
+    group = SingleFlight()
+    parser = SingleFlightParser(provider=provider, group=group)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [
+            pool.submit(parser.parse, text, {"units": "mm"})
+            for text in ("draw a circle", "draw  a circle", " draw a circle ", "draw a\tcircle")
+        ]
+        while group.coalesced < 3:
+            threading.Event().wait(0.01)
+        provider.release.set()
+        results = [future.result(timeout=5) for future in futures]
+
+    assert provider.calls == 1
+    assert group.stats() == {"calls": 1, "coalesced": 3, "in_flight": 0}
+    assert all(isinstance(result[0], DrawCircle) for result in results)
+    assert len({id(result) for result in results}) == 4
+
+
+def test_distinct_context_is_not_coalesced():
+    assert normalise_prompt("circle", {"units": "mm"}) != normalise_prompt(
+        "circle", {"units": "in"}
+    )
+    assert normalise_prompt("  draw   circle ") == normalise_prompt("draw circle")
+    assert normalise_prompt('write "ABC"') != normalise_prompt('write "abc"')
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import ezdxf
+import pytest
+
+from app.cad.columnar import ColumnarBundle
+from app.cad.layers import LayerSpec
+from app.cad.models import Circle, Point
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.writer import DxfWriter
+
+
+def _sample_bundle() -> ColumnarBundle:
+    bundle = ColumnarBundle()
+    bundle.add_line(0, 0, 100, 0)
+    bundle.add_circle(50, 50, 25, layer="HOLES")
+    bundle.add_rect(-10, -20, 30, 40)
+    bundle.add_polyline([(0, 0), (10, 5), (20, 0)], closed=False)
+    bundle.add_arc(0, 0, 10, 0, 90)
+    bundle.add_ellipse(5, 5, 4, 8, 30)  # ry > rx: the major axis turns by 90 degrees
+    bundle.add_text("Kitchen", 100, 200, 50)
+    return bundle
+
+
+def _signature(path: Path) -> list[tuple]:
+    doc = ezdxf.readfile(path)
+    rows = []
+    for entity in doc.modelspace():
+        dxf = entity.dxf
+        if entity.dxftype() == "LWPOLYLINE":
+            geometry = tuple(entity.get_points("xy")) + (entity.closed,)
+        elif entity.dxftype() == "ELLIPSE":
+            geometry = (tuple(dxf.center), tuple(dxf.major_axis), dxf.ratio)
+        elif entity.dxftype() == "TEXT":
+            geometry = (dxf.text, tuple(dxf.insert), dxf.height)
+        elif entity.dxftype() == "LINE":
+            geometry = (tuple(dxf.start), tuple(dxf.end))
+        else:
+            geometry = (tuple(dxf.center), dxf.radius)
+        rows.append((entity.dxftype(), dxf.layer, geometry))
+    return rows
+
+
+def test_streaming_matches_document_writer(tmp_path: Path) -> None:
+    bundle = _sample_bundle()
+    reference = DxfWriter(layers=list(bundle.layers))
+    reference.add_bundle(bundle)
+    expected = _signature(reference.save(tmp_path / "reference.dxf"))
+
+    with StreamingDxfWriter(tmp_path / "columns.dxf", layers=list(bundle.layers)) as writer:
+        writer.add_bundle(bundle)
+    assert _signature(writer.path) == expected
+
+    with StreamingDxfWriter(tmp_path / "models.dxf", layers=list(bundle.layers)) as writer:
+        writer.add_bundle(bundle.to_bundle())
+    assert _signature(writer.path) == expected
+
+
+def test_streaming_header_and_audit(tmp_path: Path) -> None:
+    path = tmp_path / "stream.dxf"
+    with StreamingDxfWriter(path, layers=[LayerSpec("HOLES", 1), "A-GEOM"]) as writer:
+        writer.add_bundle(_sample_bundle())
+        writer.add_circle(Circle(center=Point(x=500, y=-300), radius=5))
+    assert writer.entity_count == 8
+
+    doc = ezdxf.readfile(path)
+    assert doc.layers.get("HOLES").color == 1
+    handles = [int(entity.dxf.handle, 16) for entity in doc.modelspace()]
+    assert len(set(handles)) == len(handles)
+    assert int(doc.header["$HANDSEED"], 16) > max(handles)
+    assert doc.header["$EXTMIN"][:2] == pytest.approx((-10, -305))
+    assert doc.header["$EXTMAX"][:2] == pytest.approx((505, 250))
+    auditor = doc.audit()
+    assert not auditor.has_errors
+
+
+def test_empty_streaming_drawing_is_readable(tmp_path: Path) -> None:
+    path = StreamingDxfWriter(tmp_path / "empty.dxf").close()
+    doc = ezdxf.readfile(path)
+    assert len(doc.modelspace()) == 0
+    assert doc.header["$EXTMIN"][0] == pytest.approx(1e20)
+
+
+def test_streaming_writer_rejects_use_after_close_and_r12(tmp_path: Path) -> None:
+    writer = StreamingDxfWriter(tmp_path / "closed.dxf")
+    writer.save(tmp_path / "closed.dxf")
+    with pytest.raises(RuntimeError):
+        writer.add_circle(Circle(center=Point(x=0, y=0), radius=1))
+    with pytest.raises(ValueError):
+        StreamingDxfWriter(tmp_path / "r12.dxf", version="R12")
+
+
+def test_streaming_writer_removes_partial_file_on_error(tmp_path: Path) -> None:
+    path = tmp_path / "partial.dxf"
+    with pytest.raises(KeyError), StreamingDxfWriter(path) as writer:
+        writer.add_bundle(_sample_bundle())
+        raise KeyError("boom")
+    assert not path.exists()
+
+
+def _entities_section(path: Path) -> str:
+    text = path.read_text(encoding="utf8")
+    start = text.index("ENTITIES\n")
+    return text[start : text.index("  0\nENDSEC\n", start)]
+
+
+def test_parallel_encoding_matches_serial_output(tmp_path: Path) -> None:
+    bundle = ColumnarBundle()
+    for i in range(40):
+        bundle.add_line(i, 0, i, 10)
+        bundle.add_circle(i, i, 1 + i, layer="HOLES")
+        bundle.add_ellipse(i, 0, 0 if i % 7 == 0 else 3, 2, i)
+        bundle.add_polyline([] if i % 5 == 0 else [(0, i), (i, 0)], closed=False)
+        bundle.add_text(f"T{i}", i, i, 2)
+
+    paths = []
+    for workers in (1, 2):
+        path = tmp_path / f"workers{workers}.dxf"
+        with StreamingDxfWriter(path, workers=workers, chunk_size=16) as writer:
+            writer.add_bundle(bundle)
+            writer.add_circle(Circle(center=Point(x=0, y=0), radius=1))
+        paths.append(path)
+        assert writer.entity_count == 40 * 5 - 6 - 8 + 1
+
+    assert _entities_section(paths[0]) == _entities_section(paths[1])
+    doc = ezdxf.readfile(paths[1])
+    handles = [int(entity.dxf.handle, 16) for entity in doc.modelspace()]
+    assert handles == sorted(handles) and len(set(handles)) == len(handles)
+    assert not doc.audit().has_errors
+
+
+def test_streaming_bulk_methods_match_document_writer(tmp_path: Path) -> None:
+    def fill(writer: DxfWriter | StreamingDxfWriter) -> None:
+        writer.add_circles([(0, 0), (5, 5)], [1, 2], layer="HOLES")
+        writer.add_rects([(0, 0)], [(10, 4)])
+        writer.add_arcs([(1, 1)], 3, 0, 90)
+        writer.add_texts(["note"], [(2, 2)], 1.5)
+
+    reference = DxfWriter(layers=["A-GEOM", "HOLES"])
+    fill(reference)
+    expected = _signature(reference.save(tmp_path / "reference.dxf"))
+
+    with StreamingDxfWriter(tmp_path / "bulk.dxf", layers=["A-GEOM", "HOLES"]) as writer:
+        fill(writer)
+    assert writer.entity_count == 5
+    assert _signature(writer.path) == expected
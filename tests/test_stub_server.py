@@ -0,0 +1,48 @@
+import json
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from app.ai.stub_server import StubConfig, parse_latency, start_server
+
+
+def _post(url, prompt):
+    body = json.dumps({"model": "stub", "messages": [{"role": "user", "content": prompt}]}).encode()
+    request = urllib.request.Request(
+        f"{url}/chat/completions", data=body, headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return json.loads(response.read())
+
+
+def test_stub_derives_commands_from_utterance():
+    server = start_server()
+    try:
+        payload = _post(server.base_url, "Schema...\nUser utterance: draw circle r=5 at (1,2)")
+    finally:
+        server.shutdown()
+    content = json.loads(payload["choices"][0]["message"]["content"])
+    assert payload["object"] == "chat.completion"
+    assert content["commands"][0]["type"] == "draw_circle"
+    assert content["commands"][0]["radius"] == 5.0
+
+
+def test_stub_injects_errors():
+    server = start_server(StubConfig(error_rate=1.0, error_status=429))
+    try:
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server.base_url, "User utterance: anything")
+    finally:
+        server.shutdown()
+    assert exc.value.code == 429
+    assert server.state.failures == 1
+
+
+def test_latency_specs():
+    rng = random.Random(0)
+    assert parse_latency("fixed:0.25")(rng) == 0.25
+    assert 0.1 <= parse_latency("uniform:0.1,0.2")(rng) <= 0.2
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import ezdxf
+
+from app.cad.layers import LEGACY_LAYERS, LayerSpec
+from app.cad.models import Circle, Point
+from app.cad.streaming import StreamingDxfWriter
+from app.cad.template import clear_template_cache, new_document
+from app.cad.writer import DxfWriter
+
+
+def test_documents_are_independent_copies() -> None:
+    first = new_document("R2018", [LayerSpec("WALLS", 3)])
+    first.layers.add("EXTRA")
+    first.modelspace().add_circle((0, 0), 1)
+
+    second = new_document("R2018", [LayerSpec("WALLS", 3)])
+    assert "EXTRA" not in second.layers
+    assert second.layers.get("WALLS").dxf.color == 3
+    assert len(second.modelspace()) == 0
+    assert second.header["$FINGERPRINTGUID"] != first.header["$FINGERPRINTGUID"]
+
+
+def test_cached_writer_output_is_valid(tmp_path: Path) -> None:
+    clear_template_cache()
+    paths = []
+    for index in range(2):
+        writer = DxfWriter(version="R2010", layers=LEGACY_LAYERS.values())
+        writer.add_circle(Circle(center=Point(x=index, y=0), radius=1, layer="CIRCLES"))
+        paths.append(writer.save(tmp_path / f"drawing_{index}.dxf"))
+
+    docs = [ezdxf.readfile(path) for path in paths]
+    for doc in docs:
+        auditor = doc.audit()
+        assert not auditor.has_errors and not auditor.has_fixes
+        assert doc.dxfversion == "AC1024"
+        assert doc.layers.get("CIRCLES").dxf.color == 1
+    assert docs[0].header["$FINGERPRINTGUID"] != docs[1].header["$FINGERPRINTGUID"]
+
+
+def test_streaming_files_from_one_template_get_fresh_guids(tmp_path: Path) -> None:
+    guids = []
+    for index in range(2):
+        with StreamingDxfWriter(tmp_path / f"stream_{index}.dxf") as writer:
+            writer.add_circles([(index, 0)], 1)
+        doc = ezdxf.readfile(writer.path)
+        assert not doc.audit().has_errors
+        guids.append((doc.header["$FINGERPRINTGUID"], doc.header["$VERSIONGUID"]))
+    assert guids[0][0] != guids[1][0] and guids[0][1] != guids[1][1]
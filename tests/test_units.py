@@ -2,10 +2,24 @@ from __future__ import annotations
 
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from app.core.config import Settings, reload_settings
-from app.core.units import Unit, convert_length, from_mm, parse_length, to_mm
+from app.core.units import (
+    NumericBackend,
+    Unit,
+    convert_length,
+    from_mm,
+    from_mm_array,
+    mm_value,
+    numeric_backend,
+    parse_length,
+    to_mm,
+    to_mm_array,
+    to_nm,
+    to_nm_array,
+)
 
 
 @pytest.mark.parametrize(
@@ -72,3 +86,53 @@ def test_parse_length_respects_env_default(monkeypatch: pytest.MonkeyPatch) -> N
     finally:
         monkeypatch.delenv("DEFAULT_UNITS", raising=False)
         reload_settings()
+
+
+def test_unit_aliases_resolve_through_lookup() -> None:
+    assert Unit.from_string(" Inches ") is Unit.INCH
+    assert Unit.from_string('"') is Unit.INCH
+    assert Unit.from_string("", default=Unit.INCH) is Unit.INCH
+    with pytest.raises(ValueError):
+        Unit.from_string("furlong")
+
+
+@pytest.mark.parametrize("backend", list(NumericBackend))
+def test_mm_value_backends_agree(backend: NumericBackend) -> None:
+    assert mm_value(2, Unit.INCH, backend=backend) == 50.8
+    assert mm_value(0.1234567, "mm", backend=backend) == 0.123457
+    assert mm_value(Decimal("-3"), "in", backend=backend) == -76.2
+
+
+def test_fixed_point_nanometres() -> None:
+    assert to_nm(1, Unit.INCH) == 25_400_000
+    assert to_nm(Decimal("0.0000005"), Unit.MILLIMETER) == 1
+    np.testing.assert_array_equal(to_nm_array([1, -0.5], "in"), [25_400_000, -12_700_000])
+
+
+def test_array_conversions_match_scalar() -> None:
+    values = [0.0, 1.0, 2.5, -3.3333333]
+    for backend in NumericBackend:
+        converted = to_mm_array(values, Unit.INCH, backend=backend)
+        assert converted.tolist() == [mm_value(v, Unit.INCH, backend=backend) for v in values]
+    np.testing.assert_allclose(from_mm_array([25.4, 50.8], "in"), [1.0, 2.0])
+
+
+def test_backends_round_nanometre_ties_like_their_scalars() -> None:
+    ties = [0.0000025, -0.0000025]
+    for backend in NumericBackend:
+        converted = to_mm_array(ties, "mm", backend=backend)
+        assert converted.tolist() == [mm_value(v, "mm", backend=backend) for v in ties]
+    assert to_mm_array(ties, "mm", backend="decimal").tolist() == [0.000003, -0.000003]
+    assert to_mm_array(ties, "mm", backend="fixed").tolist() == [0.000002, -0.000002]
+    assert from_mm_array(ties, "mm", backend="decimal").tolist() == [0.000003, -0.000003]
+
+
+def test_backend_setting_follows_reload(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NUMERIC_BACKEND", "fixed")
+    reload_settings()
+    try:
+        assert numeric_backend() is NumericBackend.FIXED
+    finally:
+        monkeypatch.delenv("NUMERIC_BACKEND", raising=False)
+        reload_settings()
+    assert numeric_backend() is NumericBackend.DECIMAL